@@ -4,14 +4,33 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
-from prophet import Prophet
 import warnings
 import os
+import shutil
+import tempfile
+from camml.ingest import read_campaign_file
+from camml.quality import column_table
+from camml.dedup import DEDUP_KEY, KEY_OPTIONS
+from camml.filters import apply_filters, filter_fingerprint, INVALID_TOKENS
+from camml.charts import FigureCache, use_theme, top_n_with_others, ranked_groups, MAX_CHART_GROUPS
+from camml.geo import GeoCube, DETAIL_LEVELS, bin_points
+from camml.sketches import DistinctSketches, relative_error
+from camml.rollups import DailyRollup, GRANULARITIES, MEASURES, trend, open_series
+from camml.leads import LeadProfiles
+from camml.accounts import AccountRollup, SCORE_WEIGHTS, PRIOR_SENDS
+from camml.funnel import campaign_funnels, funnel_stages
+from camml.sendtime import send_time_grid, heatmap, recommended_windows, HEATMAP_METRICS, WINDOW_HOURS, MIN_WINDOW_SENDS
+from camml.cohorts import cohort_counts, cohort_rates, decay_curve, AXES, RATES, MAX_SEQUENCE, MAX_WEEKS, MIN_CELL_SENDS
+from camml.significance import rate_counts, rate_intervals, pairwise_tests, RATES as TEST_RATES, CORRECTIONS, ALPHA, MIN_SENDS
+from camml.scoring import score_chunks, rank_leads, rank_leads_to_csv, DEFAULT_CHUNK_SIZE
+from camml.training import LEARNERS, DEFAULT_ROW_BUDGET
+from camml.jobs import JobRunner, frame_fingerprint
+from camml import models
+from camml.profiling import Profiler, TRACE_FILE
+from camml.forecasting import (ForecastCache, series_fingerprint, series_set_fingerprint,
+                               holt_winters_forecast, backtest_forecasters)
 warnings.filterwarnings('ignore')
+use_theme()  # dark dashboard template for every Plotly figure
 
 # Page config for wide layout and custom title
 st.set_page_config(
@@ -21,6 +40,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Opt-in hot-path profiler; its toggle and breakdown live at the bottom of the sidebar
+if 'profiler' in st.session_state:
+    st.session_state.profiler.finish()  # previous run cut short by st.rerun or st.stop
+profiler = Profiler(enabled=st.session_state.get('profile_hot_path', False))
+st.session_state.profiler = profiler
+
 # Backup solution: Add sidebar toggle in main content if needed
 col_toggle, col_spacer = st.columns([1, 10])
 with col_toggle:
@@ -453,53 +478,61 @@ st.markdown("""
 
 # Function to load data (CSV or Excel)
 @st.cache_data(max_entries=1)
-def load_data(file, file_type):
+def load_data(file, file_type, dedup_key):
     try:
-        if file_type == "csv":
-            chunk_size = 100000
-            chunks = pd.read_csv(file, chunksize=chunk_size, low_memory=False)
-            df = pd.concat(chunks, ignore_index=True)
-        else:
-            df = pd.read_excel(file, engine='openpyxl')
-        
-        df = df.dropna(how='all')  # Remove completely empty rows
-        
-        # Check if 'Status' column exists; if not, skip bounce/failure filtering
-        if 'Status' in df.columns:
-            df = df[~df['Status'].str.contains('bounced|failed', case=False, na=False)]  # Remove bounced/failed emails
-        
-        # Data cleaning
-        df['Sent_Date'] = pd.to_datetime(df['Sent_Date'], errors='coerce')
-        df['Opened Time'] = pd.to_datetime(df['Opened Time'], errors='coerce')
-        df['Sent_Year'] = df['Sent_Date'].dt.year
-        df['Sent_Month'] = df['Sent_Date'].dt.month
-        df['Quarter'] = df['Sent_Date'].dt.quarter
-        df['Sent_DayOfWeek'] = df['Sent_Date'].dt.dayofweek
-        df['Response_Time'] = (df['Opened Time'] - df['Sent_Date']).dt.total_seconds().fillna(0)
-        df['Is_Unsubscribed'] = df['Is Unsubscribed'].astype(bool) if 'Is Unsubscribed' in df.columns else False
-        
-        # Clean Reply Message and Positive Reply columns
-        if 'Reply Message' in df.columns:
-            df['Reply Message'] = df['Reply Message'].fillna('').astype(str)
-            df['Has_Reply'] = df['Reply Message'].str.strip().ne('')  # Boolean for non-empty replies
-        else:
-            df['Reply Message'] = ''
-            df['Has_Reply'] = False
-        
-        if 'Positive Reply(Yes/No)' in df.columns:
-            df['Positive_Reply'] = df['Positive Reply(Yes/No)'].str.lower().eq('yes')
-        else:
-            df['Positive_Reply'] = False
-        
-        # Debug Engagement column
-        st.write("Engagement unique values in raw data:", df['Engagement'].unique())
-        st.write("Engagement value counts in raw data:", df['Engagement'].value_counts(dropna=False))
-        
+        df = read_campaign_file(file, file_type, dedup_key=list(dedup_key))
+        df.attrs['fingerprint'] = frame_fingerprint(df)  # hashed once per file, keys the chart cache
         return df
     except Exception as e:
         st.error(f"❌ Error loading file: {e}")
         return None
 
+# Background job runner shared across reruns and sessions for model fits
+@st.cache_resource
+def get_job_runner():
+    return JobRunner()
+
+# Forecasts cached by daily-series fingerprint, with the last fit per series kept for warm starts
+@st.cache_resource
+def get_forecast_cache():
+    return ForecastCache()
+
+# Built chart figures shared across reruns and sessions
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+# Map markers come from a grid cube built once per dataset
+@st.cache_resource(max_entries=4)
+def get_geo_cube(fingerprint, _data):
+    return GeoCube(_data)
+
+# Daily sends/opens/clicks/replies/unsubscribes, rolled up once per dataset for the time-based views
+@st.cache_resource(max_entries=4)
+def get_daily_rollup(fingerprint, _data):
+    return DailyRollup.build(_data)
+
+# Lead profiles with an email index for the Lead Lookup page, built once per dataset
+@st.cache_resource(max_entries=4)
+def get_lead_profiles(fingerprint, _data):
+    return LeadProfiles(_data)
+
+# Per-website measures by filter cell for the account view, built once per dataset
+@st.cache_resource(max_entries=4)
+def get_account_rollup(fingerprint, _data):
+    return AccountRollup(_data)
+
+# Distinct-count sketches for Unique Prospects and Total Brands, built once per dataset
+@st.cache_resource(max_entries=4)
+def get_distinct_sketches(fingerprint, _data):
+    return DistinctSketches(_data)
+
+# Content hash of the loaded data, computed once and carried in attrs
+def dataset_fingerprint(data):
+    if 'fingerprint' not in data.attrs:
+        data.attrs['fingerprint'] = frame_fingerprint(data)
+    return data.attrs['fingerprint']
+
 # Enhanced insights function with more professional language
 def generate_insights(df, section_name):
     try:
@@ -520,7 +553,11 @@ def generate_insights(df, section_name):
             "Predicted Opens (Prophet)": "📈 **Forecasting Intelligence**: Time series forecasting predicts future performance trends. Plan capacity and content strategy based on predicted demand.",
             "Enhanced Bot Probability (Random Forest)": f"🛡️ **Quality Assurance**: Advanced ML bot detection improves data quality. Clean datasets lead to better strategic decisions and accurate performance metrics.",
             "Top Companies by HE": "🏢 **High Engagement Focus**: Top companies with high engagement are prime targets for follow-ups. Analyze their interaction patterns to replicate success.",
-            "Top Cities by Opens and Clicks": "📍 **City Engagement Insights**: Top cities by opens and clicks indicate high-potential markets. Prioritize these locations for targeted campaigns."
+            "Top Cities by Opens and Clicks": "📍 **City Engagement Insights**: Top cities by opens and clicks indicate high-potential markets. Prioritize these locations for targeted campaigns.",
+            "Conversion Funnel": "🔻 **Funnel Intelligence**: Comparing stage-to-stage drop-off across campaigns shows where each one loses prospects. Fix the weakest stage first and watch campaigns whose unsubscribe leak outpaces their replies.",
+            "Send-Time Heatmap": "🕒 **Send-Time Intelligence**: Open and click rates by the weekday and hour an email went out show when each audience responds. Schedule each campaign inside its recommended window and re-check as the data grows.",
+            "Engagement Decay": "📉 **Cohort Intelligence**: Rates by send number and by weeks since a lead's first send show how quickly each monthly cohort tires of outreach. Cap sequences where the rate flattens out and compare newer cohorts against older ones.",
+            "Activity Trend": "📈 **Trend Intelligence**: Sends, opens and replies over time show whether engagement keeps pace with volume. Investigate periods where opens drop while sends hold steady."
         }
         return insights.get(section_name, "📊 **Analytics Insight**: This visualization reveals important patterns in your email performance. Use these insights to optimize your campaign strategy.")
     except Exception as e:
@@ -535,6 +572,8 @@ st.sidebar.markdown("""
 """, unsafe_allow_html=True)
 
 uploaded_file = st.sidebar.file_uploader("", type=["csv", "xlsx", "xls"], accept_multiple_files=False, key="main_file")
+dedup_key = st.sidebar.multiselect("🧹 Duplicate Key", options=KEY_OPTIONS, default=DEDUP_KEY,
+                                   help="Rows matching on all of these columns are merged, keeping the most complete one; clear it to keep every row")
 if uploaded_file is not None:
     file_size = uploaded_file.size
     max_size = 500 * 1024 * 1024
@@ -544,7 +583,8 @@ if uploaded_file is not None:
     
     with st.spinner("🔄 Processing your main data..."):
         file_type = uploaded_file.name.split('.')[-1].lower()
-        df = load_data(uploaded_file, file_type)
+        with profiler.section("ingest"):
+            df = load_data(uploaded_file, file_type, tuple(dedup_key))
         if df is None:
             st.stop()
         st.session_state.df = df  # Persist df in session state
@@ -586,7 +626,7 @@ st.sidebar.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-page = st.sidebar.selectbox("", ["🏠 Dashboard Home", "📊 Compare Quarters", "🤖 AI Predictions", "👑 Boss Dashboard"], label_visibility="collapsed")
+page = st.sidebar.selectbox("", ["🏠 Dashboard Home", "📊 Compare Quarters", "🤖 AI Predictions", "👑 Boss Dashboard", "🔎 Lead Lookup", "🏢 Accounts"], label_visibility="collapsed")
 
 # Enhanced filters section
 st.sidebar.markdown("""
@@ -598,6 +638,15 @@ st.sidebar.markdown("""
 # Checkbox for excluding invalid entries
 exclude_invalid = st.sidebar.checkbox("Exclude Invalid Entries (blanks, --, 0, etc.)", value=True)
 
+# Rows holding a real value in column, from the Valid_ flags set at ingest; every row when the box is unchecked
+def valid_rows(frame, column):
+    if exclude_invalid:
+        return frame[f'Valid_{column}']
+    return pd.Series(True, index=frame.index)
+
+exact_counts = st.sidebar.toggle("🔢 Exact Distinct Counts", value=False,
+                                 help="Count unique prospects and brands exactly instead of estimating them from sketches")
+
 # Initialize session state for show_full_numbers
 if 'show_full_numbers' not in st.session_state:
     st.session_state.show_full_numbers = False
@@ -632,31 +681,29 @@ bot_filter = st.sidebar.multiselect("🤖 Bot/Human Filter", options=df['Bot Che
 time_range_filter = st.sidebar.multiselect("⏰ Time Range Filter", options=df['Opend Time Range'].unique(), default=df['Opend Time Range'].unique())
 
 # Apply filters to main df
-filtered_df = df[
-    (df['Sent_Year'].isin(selected_year)) &
-    (df['Quarter'].isin(selected_quarter_num)) &
-    (df['Campaign Name'].isin(selected_campaign)) &
-    (df['Bot Check'].isin(bot_filter)) &
-    (df['Opend Time Range'].isin(time_range_filter))
-].copy()
-
-# Debug Engagement in filtered_df
-st.write("Engagement value counts in filtered_df:", filtered_df['Engagement'].value_counts(dropna=False))
+with profiler.section("filter"):
+    filtered_df = apply_filters(df, selected_year, selected_quarter_num, selected_campaign, bot_filter, time_range_filter)
 
 # Warning if no HE in filtered data
 if 'HE' not in filtered_df['Engagement'].values:
     st.warning("⚠️ No 'HE' engagements found in filtered data. Try adjusting filters.")
 
-# Ensure 'Website' column is handled correctly for unique brands
-if 'Website' in filtered_df.columns:
-    filtered_df['Website'] = filtered_df['Website'].fillna('Unknown')
-    if exclude_invalid:
-        valid_brands = filtered_df[filtered_df['Website'].notna() & (filtered_df['Website'] != 'Unknown') & (filtered_df['Website'] != '--') & (filtered_df['Website'] != '')]
-        total_brands = len(valid_brands['Website'].unique())
+# Unique prospects and brands: exact, or merged HyperLogLog sketches of the selected filter cells
+if exact_counts:
+    if 'Website' in filtered_df.columns:
+        total_brands = filtered_df.loc[valid_rows(filtered_df, 'Website'), 'Website'].nunique()
     else:
-        total_brands = len(filtered_df['Website'].dropna().unique())
+        total_brands = 0
+    unique_prospects = filtered_df['Lead Email'].nunique()
+    approx = ""
 else:
-    total_brands = 0
+    sketches = get_distinct_sketches(dataset_fingerprint(df), df)
+    selections = (selected_year, selected_quarter_num, selected_campaign, bot_filter, time_range_filter)
+    total_brands = sketches.estimate('Website', *selections, exclude_invalid=exclude_invalid)
+    unique_prospects = sketches.estimate('Lead Email', *selections)
+    approx = "~"
+distinct_note = (f"~ Total Brands and Unique Prospects are HyperLogLog estimates "
+                 f"(±{relative_error():.1%} standard error); turn on Exact Distinct Counts in the sidebar for exact values.")
 
 # Enhanced color schemes for charts
 st.sidebar.markdown("""
@@ -666,10 +713,32 @@ st.sidebar.markdown("""
 """, unsafe_allow_html=True)
 
 top_n = st.sidebar.selectbox("📊 Top N for Charts", options=[5, 10, 20, 'All'], index=0)
+map_detail = st.sidebar.select_slider("🗺️ Map Detail", options=list(DETAIL_LEVELS), value='Auto',
+                                      help="Grid cell size for the maps; Auto picks the finest grid that stays within the marker budget")
 if top_n == 'All':
-    top_n_val = len(filtered_df)
+    top_n_val = MAX_CHART_GROUPS
 else:
     top_n_val = top_n
+# The maps have their own marker budget, so 'All' means no Top N limit there
+map_top_n = None if top_n == 'All' else top_n_val
+
+# Charts are rebuilt only when the data, a sidebar selection or Top N changes
+figure_cache = get_figure_cache()
+if 'latitude' in df.columns and 'longitude' in df.columns:
+    geo_cube = get_geo_cube(dataset_fingerprint(df), df)
+chart_key = filter_fingerprint(dataset_fingerprint(df), selected_year, selected_quarter_num, selected_campaign,
+                               bot_filter, time_range_filter, exclude_invalid, top_n_val)
+# Time-based views read the daily rollup rows for the current selection, not the raw rows
+daily_rollup = get_daily_rollup(dataset_fingerprint(df), df)
+rollup_rows = daily_rollup.select(selected_year, selected_quarter_num, selected_campaign, bot_filter, time_range_filter)
+
+# Account (website) measures and scores for the current selection, from the account rollup
+def selected_accounts():
+    if 'Website' not in df.columns:
+        return None
+    account_rollup = get_account_rollup(dataset_fingerprint(df), df)
+    return figure_cache.get(("Accounts", chart_key), lambda: account_rollup.query(
+        selected_year, selected_quarter_num, selected_campaign, bot_filter, time_range_filter, exclude_invalid))
 
 color_schemes = {
     'primary': ['#667eea', '#764ba2', '#4facfe', '#00f2fe'],
@@ -678,7 +747,47 @@ color_schemes = {
     'neon': ['#00f2fe', '#4facfe', '#667eea', '#764ba2']
 }
 
+TABLE_PAGE_SIZE = 25
+
+# A table one page at a time, for data too long to render in full
+def paginated_table(table, key, page_size=TABLE_PAGE_SIZE):
+    pages = max(-(-len(table) // page_size), 1)
+    if pages > 1:
+        page_num = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=key)
+    else:
+        page_num = 1
+    st.dataframe(table.iloc[(page_num - 1) * page_size:page_num * page_size], hide_index=True, use_container_width=True)
+
+# Every group behind a top-N chart, when the chart had to fold some into Others
+def show_all_groups(totals, noun, key):
+    if len(totals) > top_n_val:
+        with st.expander(f"📋 All {len(totals):,} {noun}"):
+            paginated_table(ranked_groups(totals), key)
+
+# Data quality profile recorded while the upload was read
+quality = df.attrs.get('quality')
+if quality is not None:
+    issue_rows = sum(quality['issues'].values())
+    with st.expander(f"🩺 Data Quality Report ({format_number(issue_rows, True)} flagged rows)"):
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Rows Read", format_number(quality['rows_read'], show_full_numbers))
+        col2.metric("Rows Kept", format_number(quality['rows_kept'], show_full_numbers))
+        col3.metric("Duplicate Rows", format_number(quality.get('duplicate_rows', 0), show_full_numbers),
+                    help="Rows repeating another row's Duplicate Key (the default key when it is cleared); "
+                         "removed unless the key is cleared")
+        col4.metric("Bounced/Failed Removed", format_number(quality['issues'].get('Bounced/failed rows removed', 0), show_full_numbers))
+        st.dataframe(pd.DataFrame(list(quality['issues'].items()), columns=['Check', 'Rows']), use_container_width=True, hide_index=True)
+        st.markdown("**Missing and placeholder values per column** (placeholders: "
+                    f"{', '.join(repr(token) for token in INVALID_TOKENS)})")
+        paginated_table(column_table(quality), key="quality_page")
+        for col, (fmt, examples) in quality.get('dates', {}).items():
+            note = f" — unparseable, e.g. {', '.join(repr(value) for value in examples)}" if examples else ""
+            st.markdown(f"**{col} format:** {fmt or 'not detected'}{note}")
+        for col, values in quality['values'].items():
+            st.markdown(f"**Raw {col} values:** " + ", ".join(f"{value} ({format_number(n, True)})" for value, n in values.items()))
+
 if page == "🏠 Dashboard Home":
+    profiler.mark("KPI cards")
     # Enhanced Key Metrics with modern cards
     st.markdown('<div class="section-header slide-up">📈 Performance Dashboard</div>', unsafe_allow_html=True)
 
@@ -686,7 +795,6 @@ if page == "🏠 Dashboard Home":
     filtered_df['Engagement'] = filtered_df['Engagement'].astype(str).str.strip().str.upper()
     total_campaigns = filtered_df['Campaign Name'].nunique()
     total_sent = len(filtered_df)
-    unique_prospects = filtered_df['Lead Email'].nunique()
     total_opens = len(filtered_df[filtered_df['Open Count'] > 0])
     total_clicks = len(filtered_df[filtered_df['Click Count'] > 0])
     he_count = len(filtered_df[filtered_df['Engagement'] == 'HE'])
@@ -698,9 +806,6 @@ if page == "🏠 Dashboard Home":
     human_count = len(filtered_df[filtered_df['Bot Check'] == 'Human'])
     reply_percentage = (total_replies / total_brands * 100) if total_brands > 0 else 0
 
-    # Debug raw counts
-    st.write("Raw counts - HE:", he_count, "LE:", le_count, "NO:", no_count)
-
     # Key metrics layout (adjusted to accommodate Reply Percentage)
     col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
@@ -720,14 +825,14 @@ if page == "🏠 Dashboard Home":
     with col3:
         st.markdown(f"""
         <div class="metric-container fade-in">
-            <div class="metric-value">{format_number(total_brands, show_full_numbers)}</div>
+            <div class="metric-value">{approx}{format_number(total_brands, show_full_numbers)}</div>
             <div class="metric-label">🏢 Total Brands</div>
         </div>
         """, unsafe_allow_html=True)
     with col4:
         st.markdown(f"""
         <div class="metric-container fade-in">
-            <div class="metric-value">{format_number(unique_prospects, show_full_numbers)}</div>
+            <div class="metric-value">{approx}{format_number(unique_prospects, show_full_numbers)}</div>
             <div class="metric-label">👥 Unique Prospects</div>
         </div>
         """, unsafe_allow_html=True)
@@ -738,6 +843,8 @@ if page == "🏠 Dashboard Home":
             <div class="metric-label">👀 Total Opens</div>
         </div>
         """, unsafe_allow_html=True)
+    if approx:
+        st.caption(distinct_note)
 
     col6, col7, col8, col9, col10 = st.columns(5)
     with col6:
@@ -824,74 +931,199 @@ if page == "🏠 Dashboard Home":
     with col18:
         st.markdown("")  # Empty column for spacing
 
+    profiler.mark("chart: Activity Trend")
+    # Activity over time from the daily rollup
+    st.markdown('<div class="section-header slide-up">📈 Activity Trend</div>', unsafe_allow_html=True)
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        granularity = st.radio("Granularity", list(GRANULARITIES), index=1, horizontal=True, key="trend_granularity")
+        trend_measures = st.multiselect("Measures", MEASURES, default=['Sends', 'Opens', 'Clicks', 'Replies'], key="trend_measures")
+        if trend_measures:
+            def build_trend_chart():
+                trend_data = trend(rollup_rows, granularity, trend_measures)
+                fig_trend = px.line(
+                    trend_data,
+                    x='Day',
+                    y=trend_measures,
+                    title=f"<b>Activity by {granularity}</b>",
+                    color_discrete_sequence=color_schemes['gradient'] + color_schemes['neon'],
+                    markers=granularity != 'Day'
+                )
+                fig_trend.update_layout(
+                    xaxis_title=granularity,
+                    yaxis_title="Count",
+                    legend_title_text=""
+                )
+                return fig_trend
+            fig_trend = figure_cache.get(("Activity Trend", chart_key, granularity, tuple(trend_measures)), build_trend_chart)
+            st.plotly_chart(fig_trend, use_container_width=True)
+    with col2:
+        st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
+        if st.button("💡 AI Insights", key="trend_insight", help="Get trend insights"):
+            st.info(generate_insights(filtered_df, "Activity Trend"))
+        st.markdown('</div>', unsafe_allow_html=True)
+
     # Enhanced Charts Section
     st.markdown('<div class="section-header slide-up">📊 Performance Visualizations</div>', unsafe_allow_html=True)
 
+    profiler.mark("chart: Opens by Time Range")
     # Opens by Sent Time Range with modern styling
     col1, col2 = st.columns([4, 1])
     with col1:
-        time_range_data = filtered_df[filtered_df['Open Count'] > 0]['Opend Time Range'].value_counts().head(top_n_val)
-        fig_time = px.bar(
-            x=time_range_data.index, 
-            y=time_range_data.values, 
-            title="<b>Peak Performance by Time Range</b>",
-            color_discrete_sequence=color_schemes['primary']
-        )
-        fig_time.update_layout(
-            font=dict(color='white'),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            title_font_size=18,
-            title_x=0.5,
-            xaxis_title="Time Range",
-            yaxis_title="Opens"
-        )
-        fig_time.update_traces(marker_line_width=0, marker_cornerradius="15%")
+        time_range_totals = figure_cache.get(("Opens by Time Range totals", chart_key), lambda: (
+            filtered_df[filtered_df['Open Count'] > 0].groupby('Opend Time Range').size().rename('Opens')))
+        def build_time_chart():
+            time_range_data = top_n_with_others(time_range_totals, top_n_val)
+            fig_time = px.bar(
+                time_range_data,
+                x='Opend Time Range',
+                y='Opens',
+                hover_data=['Share (%)'],
+                title="<b>Peak Performance by Time Range</b>",
+                color_discrete_sequence=color_schemes['primary']
+            )
+            fig_time.update_layout(
+                xaxis_title="Time Range",
+                yaxis_title="Opens"
+            )
+            fig_time.update_traces(marker_line_width=0, marker_cornerradius="15%")
+            return fig_time
+        fig_time = figure_cache.get(("Opens by Time Range", chart_key), build_time_chart)
         st.plotly_chart(fig_time, use_container_width=True)
+        show_all_groups(time_range_totals, "time ranges", key="time_range_page")
     with col2:
         st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
         if st.button("💡 AI Insights", key="time_insight", help="Get timing insights"):
             st.info(generate_insights(filtered_df, "Top Opens by Time Range"))
         st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("chart: Send-Time Heatmap")
+    # Day-of-week x hour heatmap and the best send window per campaign or segment
+    st.markdown("### 🕒 Send-Time Optimization")
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        segment_options = [col for col in ['Campaign Name', 'Bot Check', 'Engagement', 'ESP Type', 'Traffic'] if col in filtered_df.columns]
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            send_time_by = st.selectbox("Break down by", segment_options, key="send_time_by")
+        send_time_groups, send_time_counts = figure_cache.get(("Send-Time grid", chart_key, send_time_by),
+                                                              lambda: send_time_grid(filtered_df, by=send_time_by))
+        with col_b:
+            send_time_group = st.selectbox("Show", ['All'] + list(send_time_groups), key="send_time_group")
+        with col_c:
+            send_time_metric = st.selectbox("Metric", list(HEATMAP_METRICS), key="send_time_metric")
+        if filtered_df.empty:
+            st.info("No sends available for the selected filters.")
+        else:
+            def build_send_time_chart():
+                if send_time_group == 'All':
+                    counts = send_time_counts.sum(axis=0)
+                else:
+                    counts = send_time_counts[send_time_groups.get_loc(send_time_group)]
+                fig_send_time = px.imshow(
+                    heatmap(counts, send_time_metric),
+                    aspect='auto',
+                    color_continuous_scale='Viridis',
+                    title=f"<b>{send_time_metric} by Weekday and Hour</b>"
+                )
+                fig_send_time.update_layout(
+                    xaxis_title="Hour",
+                    yaxis_title="Weekday"
+                )
+                return fig_send_time
+            fig_send_time = figure_cache.get(("Send-Time Heatmap", chart_key, send_time_by, send_time_group, send_time_metric),
+                                             build_send_time_chart)
+            st.plotly_chart(fig_send_time, use_container_width=True)
+            send_windows = recommended_windows(send_time_groups, send_time_counts)
+            st.caption(f"Recommended send window: the {WINDOW_HOURS}-hour run of send hours with the highest open rate "
+                       f"(at least {MIN_WINDOW_SENDS} sends), by the hour of Sent_Date.")
+            paginated_table(send_windows, key="send_window_page")
+    with col2:
+        st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
+        if st.button("💡 AI Insights", key="send_time_insight", help="Get send-time insights"):
+            st.info(generate_insights(filtered_df, "Send-Time Heatmap"))
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    profiler.mark("chart: Engagement Decay")
+    # Leads grouped by the month of their first send, with rates by send number or weeks since that send
+    st.markdown("### 📉 Cohorts & Engagement Decay")
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        col_a, col_b = st.columns(2)
+        with col_a:
+            cohort_axis = st.selectbox("Across", list(AXES), key="cohort_axis")
+        with col_b:
+            cohort_rate = st.selectbox("Metric", list(RATES), key="cohort_rate")
+        cohorts, cohort_sizes, cohort_grid = figure_cache.get(("Cohort counts", chart_key, cohort_axis),
+                                                              lambda: cohort_counts(filtered_df, cohort_axis))
+        if len(cohorts) == 0:
+            st.info("No dated sends available for the selected filters.")
+        else:
+            def build_cohort_chart():
+                rates = cohort_rates(cohorts, cohort_grid, cohort_rate, cohort_axis)
+                rates.index = [f"{cohort} ({format_number(size, True)} leads)" for cohort, size in zip(cohorts, cohort_sizes)]
+                fig_cohort = px.imshow(
+                    rates,
+                    aspect='auto',
+                    color_continuous_scale='Viridis',
+                    title=f"<b>{cohort_rate} by First-Send Cohort and {cohort_axis}</b>"
+                )
+                fig_cohort.update_layout(
+                    xaxis_title=cohort_axis,
+                    yaxis_title="First-Send Month"
+                )
+                return fig_cohort
+            fig_cohort = figure_cache.get(("Cohort Heatmap", chart_key, cohort_axis, cohort_rate), build_cohort_chart)
+            st.plotly_chart(fig_cohort, use_container_width=True)
+            def build_decay_chart():
+                fig_decay = px.line(
+                    decay_curve(cohort_grid, cohort_rate, cohort_axis),
+                    x=cohort_axis,
+                    y=cohort_rate,
+                    markers=True,
+                    hover_data=['Sends'],
+                    title=f"<b>{cohort_rate} by {cohort_axis}, All Cohorts</b>"
+                )
+                return fig_decay
+            fig_decay = figure_cache.get(("Engagement Decay", chart_key, cohort_axis, cohort_rate), build_decay_chart)
+            st.plotly_chart(fig_decay, use_container_width=True)
+            last_step = f"{MAX_SEQUENCE}+" if AXES[cohort_axis] == 'sequence' else f"{MAX_WEEKS}+"
+            st.caption(f"A lead's cohort is the month of its first send in the selection. Cells with fewer than "
+                       f"{MIN_CELL_SENDS} sends are left blank; the last column pools everything from {last_step}.")
+    with col2:
+        st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
+        if st.button("💡 AI Insights", key="cohort_insight", help="Get cohort insights"):
+            st.info(generate_insights(filtered_df, "Engagement Decay"))
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    profiler.mark("chart: City Map")
     # Top Cities by Opens and Clicks (Map-Based)
     if 'latitude' in filtered_df.columns and 'longitude' in filtered_df.columns:
         col3, col4 = st.columns([4, 1])
         with col3:
-            city_data = filtered_df[filtered_df['Open Count'] > 0].groupby(['City', 'latitude', 'longitude']).agg({
-                'Open Count': 'sum',
-                'Click Count': 'sum'
-            }).reset_index()
-            if exclude_invalid:
-                city_data = city_data[
-                    (city_data['City'].notna()) &
-                    (city_data['City'] != '') &
-                    (city_data['City'] != '0') &
-                    (city_data['City'] != '--') &
-                    (city_data['City'] != 'Unknown')
-                ]
-            city_data = city_data.nlargest(top_n_val, 'Open Count')
-            city_data['Size'] = city_data['Open Count'] + city_data['Click Count'] * 2  # Weighted size for visualization
-            fig_city_map = px.scatter_mapbox(
-                city_data,
-                lat='latitude',
-                lon='longitude',
-                size='Size',
-                color='Open Count',
-                hover_name='City',
-                hover_data={'Open Count': True, 'Click Count': True, 'latitude': False, 'longitude': False},
-                title="<b>Top Cities by Opens and Clicks</b>",
-                color_continuous_scale='Viridis',
-                size_max=20,
-                zoom=3
-            )
-            fig_city_map.update_layout(
-                mapbox_style="carto-darkmatter",
-                font=dict(color='white'),
-                paper_bgcolor='rgba(0,0,0,0)',
-                title_font_size=18,
-                title_x=0.5
-            )
+            def build_city_map_chart():
+                # One marker per grid cell, named after its busiest city
+                city_data, _ = geo_cube.query(selected_year, selected_quarter_num, selected_campaign, bot_filter,
+                                              time_range_filter, exclude_invalid, map_top_n, DETAIL_LEVELS[map_detail])
+                city_data['Size'] = city_data['Open Count'] + city_data['Click Count'] * 2  # Weighted size for visualization
+                fig_city_map = px.scatter_mapbox(
+                    city_data,
+                    lat='latitude',
+                    lon='longitude',
+                    size='Size',
+                    color='Open Count',
+                    hover_name='City',
+                    hover_data={'Open Count': True, 'Click Count': True, 'Cities': True, 'latitude': False, 'longitude': False},
+                    title="<b>Top Cities by Opens and Clicks</b>",
+                    color_continuous_scale='Viridis',
+                    size_max=20,
+                    zoom=3
+                )
+                fig_city_map.update_layout(
+                    mapbox_style="carto-darkmatter"
+                )
+                return fig_city_map
+            fig_city_map = figure_cache.get(("City Map", chart_key, map_detail), build_city_map_chart)
             st.plotly_chart(fig_city_map, use_container_width=True)
         with col4:
             st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
@@ -899,97 +1131,97 @@ if page == "🏠 Dashboard Home":
                 st.info(generate_insights(filtered_df, "Top Cities by Opens and Clicks"))
             st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("chart: Opens by City")
     # Opens by City (Bar Chart)
     col3, col4 = st.columns([4, 1])
     with col3:
-        city_data = filtered_df[filtered_df['Open Count'] > 0].groupby('City').size().reset_index(name='Opens')
-        if exclude_invalid:
-            city_data = city_data[
-                (city_data['City'].notna()) &
-                (city_data['City'] != '') &
-                (city_data['City'] != '0') &
-                (city_data['City'] != '--') &
-                (city_data['City'] != 'Unknown')
-            ]
-        city_data = city_data.nlargest(top_n_val, 'Opens')
-        fig_city = px.bar(
-            city_data, 
-            x='City', 
-            y='Opens', 
-            title="<b>Top Opens by Cities</b>", 
-            color='Opens',
-            color_continuous_scale='Viridis'
-        )
-        fig_city.update_layout(
-            font=dict(color='white'),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            title_font_size=18,
-            title_x=0.5,
-            xaxis_title="City",
-            yaxis_title="Opens"
-        )
-        fig_city.update_traces(marker_line_width=0, marker_cornerradius="15%")
+        city_totals = figure_cache.get(("Opens by City totals", chart_key), lambda: (
+            filtered_df[(filtered_df['Open Count'] > 0) & valid_rows(filtered_df, 'City')].groupby('City').size().rename('Opens')))
+        def build_city_chart():
+            city_data = top_n_with_others(city_totals, top_n_val)
+            fig_city = px.bar(
+                city_data, 
+                x='City', 
+                y='Opens', 
+                hover_data=['Share (%)'],
+                title="<b>Top Opens by Cities</b>", 
+                color='Opens',
+                color_continuous_scale='Viridis'
+            )
+            fig_city.update_layout(
+                xaxis_title="City",
+                yaxis_title="Opens"
+            )
+            fig_city.update_traces(marker_line_width=0, marker_cornerradius="15%")
+            return fig_city
+        fig_city = figure_cache.get(("Opens by City", chart_key), build_city_chart)
         st.plotly_chart(fig_city, use_container_width=True)
+        show_all_groups(city_totals, "cities", key="city_page")
     with col4:
         st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
         if st.button("💡 AI Insights", key="city_insight", help="Get geographic insights"):
             st.info(generate_insights(filtered_df, "Top Opens by City"))
         st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("chart: Opens by Campaign")
     # Opens by Campaign with gradient colors
     row1_col1, row1_col2 = st.columns([4, 1])
     with row1_col1:
-        campaign_data = filtered_df[filtered_df['Open Count'] > 0].groupby('Campaign Name').size().nlargest(top_n_val).reset_index(name='Opens')
-        fig_campaign = px.bar(
-            campaign_data, 
-            x='Campaign Name', 
-            y='Opens', 
-            title="<b>Top Performing Campaigns</b>",
-            color='Opens',
-            color_continuous_scale='Plasma'
-        )
-        fig_campaign.update_layout(
-            font=dict(color='white'),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            title_font_size=18,
-            title_x=0.5,
-            xaxis_title="Campaign Name",
-            yaxis_title="Opens"
-        )
-        fig_campaign.update_traces(marker_line_width=0, marker_cornerradius="15%")
-        fig_campaign.update_xaxes(tickangle=45)
+        campaign_totals = figure_cache.get(("Opens by Campaign totals", chart_key), lambda: (
+            filtered_df[filtered_df['Open Count'] > 0].groupby('Campaign Name').size().rename('Opens')))
+        def build_campaign_chart():
+            campaign_data = top_n_with_others(campaign_totals, top_n_val)
+            fig_campaign = px.bar(
+                campaign_data, 
+                x='Campaign Name', 
+                y='Opens', 
+                hover_data=['Share (%)'],
+                title="<b>Top Performing Campaigns</b>",
+                color='Opens',
+                color_continuous_scale='Plasma'
+            )
+            fig_campaign.update_layout(
+                xaxis_title="Campaign Name",
+                yaxis_title="Opens"
+            )
+            fig_campaign.update_traces(marker_line_width=0, marker_cornerradius="15%")
+            fig_campaign.update_xaxes(tickangle=45)
+            return fig_campaign
+        fig_campaign = figure_cache.get(("Opens by Campaign", chart_key), build_campaign_chart)
         st.plotly_chart(fig_campaign, use_container_width=True)
+        show_all_groups(campaign_totals, "campaigns", key="campaign_page")
     with row1_col2:
         st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
         if st.button("💡 AI Insights", key="campaign_insight", help="Get campaign insights"):
             st.info(generate_insights(filtered_df, "Top Opens by Campaign"))
         st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("chart: Opens by ESP")
     # Opens by ESP with modern styling
     row2_col1, row2_col2 = st.columns([4, 1])
     with row2_col1:
-        esp_data = filtered_df[filtered_df['Open Count'] > 0].groupby('ESP Type').size().nlargest(top_n_val).reset_index(name='Opens')
-        fig_esp = px.bar(
-            esp_data, 
-            x='ESP Type', 
-            y='Opens', 
-            title="<b>Email Service Provider Performance</b>", 
-            color='Opens',
-            color_continuous_scale='Turbo'
-        )
-        fig_esp.update_layout(
-            font=dict(color='white'),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            title_font_size=18,
-            title_x=0.5,
-            xaxis_title="ESP Type",
-            yaxis_title="Opens"
-        )
-        fig_esp.update_traces(marker_line_width=0, marker_cornerradius="15%")
+        esp_totals = figure_cache.get(("Opens by ESP totals", chart_key), lambda: (
+            filtered_df[filtered_df['Open Count'] > 0].groupby('ESP Type').size().rename('Opens')))
+        def build_esp_chart():
+            esp_data = top_n_with_others(esp_totals, top_n_val)
+            fig_esp = px.bar(
+                esp_data, 
+                x='ESP Type', 
+                y='Opens', 
+                hover_data=['Share (%)'],
+                title="<b>Email Service Provider Performance</b>", 
+                color='Opens',
+                color_continuous_scale='Turbo'
+            )
+            fig_esp.update_layout(
+                xaxis_title="ESP Type",
+                yaxis_title="Opens"
+            )
+            fig_esp.update_traces(marker_line_width=0, marker_cornerradius="15%")
+            return fig_esp
+        fig_esp = figure_cache.get(("Opens by ESP", chart_key), build_esp_chart)
         st.plotly_chart(fig_esp, use_container_width=True)
+        show_all_groups(esp_totals, "ESPs", key="esp_page")
     with row2_col2:
         st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
         if st.button("💡 AI Insights", key="esp_insight", help="Get ESP insights"):
@@ -999,80 +1231,78 @@ if page == "🏠 Dashboard Home":
     # Additional Enhanced Insights
     st.markdown('<div class="section-header slide-up">🔍 Advanced Analytics</div>', unsafe_allow_html=True)
 
+    profiler.mark("chart: Opens by State")
     # Top Opens by State if no lat/long
     if 'latitude' not in filtered_df.columns or 'longitude' not in filtered_df.columns:
         st.markdown("### 🗺️ Top Opens by State")
         col1, col2 = st.columns([4, 1])
         with col1:
-            state_data = filtered_df[filtered_df['Open Count'] > 0].groupby('State').size().nlargest(top_n_val).reset_index(name='Opens')
-            if exclude_invalid:
-                state_data = state_data[
-                    (state_data['State'].notna()) &
-                    (state_data['State'] != '') &
-                    (state_data['State'] != '--') &
-                    (state_data['State'] != 'Unknown')
-                ]
-            fig_state = px.bar(
-                state_data, 
-                x='State', 
-                y='Opens', 
-                title="<b>Top Performing States</b>", 
-                color='Opens',
-                color_continuous_scale='Viridis'
-            )
-            fig_state.update_layout(
-                font=dict(color='white'),
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                title_font_size=18,
-                title_x=0.5
-            )
-            fig_state.update_traces(marker_cornerradius="15%")
+            state_totals = figure_cache.get(("Opens by State totals", chart_key), lambda: (
+                filtered_df[(filtered_df['Open Count'] > 0) & valid_rows(filtered_df, 'State')].groupby('State').size().rename('Opens')))
+            def build_state_chart():
+                state_data = top_n_with_others(state_totals, top_n_val)
+                fig_state = px.bar(
+                    state_data, 
+                    x='State', 
+                    y='Opens', 
+                    hover_data=['Share (%)'],
+                    title="<b>Top Performing States</b>", 
+                    color='Opens',
+                    color_continuous_scale='Viridis'
+                )
+                fig_state.update_traces(marker_cornerradius="15%")
+                return fig_state
+            fig_state = figure_cache.get(("Opens by State", chart_key), build_state_chart)
             st.plotly_chart(fig_state, use_container_width=True)
+            show_all_groups(state_totals, "states", key="state_page")
         with col2:
             st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
             if st.button("💡 AI Insights", key="state_insight", help="Get state insights"):
                 st.info(generate_insights(filtered_df, "Top Opens by State"))
             st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("chart: Clicks by Campaign")
     # Clicks by Campaign with enhanced styling
     col3, col4 = st.columns([4, 1])
     with col3:
-        clicks_campaign = filtered_df[filtered_df['Click Count'] > 0].groupby('Campaign Name').size().nlargest(top_n_val).reset_index(name='Clicks')
-        fig_clicks = px.bar(
-            clicks_campaign, 
-            x='Campaign Name', 
-            y='Clicks', 
-            title="<b>Click Performance by Campaign</b>",
-            color='Clicks',
-            color_continuous_scale='Cividis'
-        )
-        fig_clicks.update_layout(
-            font=dict(color='white'),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            title_font_size=18,
-            title_x=0.5
-        )
-        fig_clicks.update_traces(marker_cornerradius="15%")
-        fig_clicks.update_xaxes(tickangle=45)
+        clicks_totals = figure_cache.get(("Clicks by Campaign totals", chart_key), lambda: (
+            filtered_df[filtered_df['Click Count'] > 0].groupby('Campaign Name').size().rename('Clicks')))
+        def build_clicks_chart():
+            clicks_campaign = top_n_with_others(clicks_totals, top_n_val)
+            fig_clicks = px.bar(
+                clicks_campaign, 
+                x='Campaign Name', 
+                y='Clicks', 
+                hover_data=['Share (%)'],
+                title="<b>Click Performance by Campaign</b>",
+                color='Clicks',
+                color_continuous_scale='Cividis'
+            )
+            fig_clicks.update_traces(marker_cornerradius="15%")
+            fig_clicks.update_xaxes(tickangle=45)
+            return fig_clicks
+        fig_clicks = figure_cache.get(("Clicks by Campaign", chart_key), build_clicks_chart)
         st.plotly_chart(fig_clicks, use_container_width=True)
+        show_all_groups(clicks_totals, "campaigns", key="clicks_page")
     with col4:
         st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
         if st.button("💡 AI Insights", key="clicks_insight", help="Get click insights"):
             st.info(generate_insights(filtered_df, "Top Clicks by Campaign"))
         st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("table: Unsubscribes")
     # Enhanced Unsubscribes Table
     st.markdown("### 🚪 Unsubscribe Analysis")
     col1, col2 = st.columns([4, 1])
     with col1:
-        unsub_data = filtered_df[filtered_df['Is_Unsubscribed'] == True].groupby('Campaign Name').size().nlargest(top_n_val).reset_index(name='Unsubscribes')
-        if not unsub_data.empty:
+        unsub_totals = filtered_df[filtered_df['Is_Unsubscribed'] == True].groupby('Campaign Name').size().rename('Unsubscribes')
+        if not unsub_totals.empty:
+            unsub_data = top_n_with_others(unsub_totals, top_n_val)
             st.dataframe(
                 unsub_data.style.background_gradient(subset=['Unsubscribes'], cmap='Reds'),
                 use_container_width=True
             )
+            show_all_groups(unsub_totals, "campaigns with unsubscribes", key="unsub_page")
         else:
             st.success("🎉 Great news! No unsubscribes found in the selected data.")
     with col2:
@@ -1081,6 +1311,37 @@ if page == "🏠 Dashboard Home":
             st.info(generate_insights(filtered_df, "Unsubscribes by Campaign"))
         st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("chart: Conversion Funnel")
+    # Conversion funnel per campaign, all campaigns counted in one pass
+    st.markdown("### 🔻 Conversion Funnel")
+    funnels = figure_cache.get(("Conversion Funnel data", chart_key), lambda: campaign_funnels(filtered_df))
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        funnel_campaigns = st.multiselect("Campaigns to compare", funnels['Campaign Name'],
+                                          default=funnels.nlargest(min(top_n_val, 5), 'Sent')['Campaign Name'].tolist(),
+                                          key="funnel_campaigns")
+        if funnel_campaigns:
+            def build_funnel_chart():
+                fig_funnel = px.funnel(
+                    funnel_stages(funnels[funnels['Campaign Name'].isin(funnel_campaigns)]),
+                    x='Count',
+                    y='Stage',
+                    color='Campaign Name',
+                    title="<b>Sent → Opened → Clicked → Replied → Positive Reply</b>",
+                    color_discrete_sequence=color_schemes['neon'] + color_schemes['gradient']
+                )
+                return fig_funnel
+            fig_funnel = figure_cache.get(("Conversion Funnel", chart_key, tuple(funnel_campaigns)), build_funnel_chart)
+            st.plotly_chart(fig_funnel, use_container_width=True)
+        with st.expander(f"📋 Funnels of all {len(funnels):,} campaigns (% of sent; Unsubscribed is the leak)"):
+            paginated_table(funnels.sort_values('Sent', ascending=False), key="funnel_page")
+    with col2:
+        st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
+        if st.button("💡 AI Insights", key="funnel_insight", help="Get funnel insights"):
+            st.info(generate_insights(filtered_df, "Conversion Funnel"))
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    profiler.mark("chart: Reply vs Positive Reply")
     # Reply Analysis with modern charts using main df
     st.markdown("### 💬 Reply Intelligence")
     col1, col2 = st.columns([4, 1])
@@ -1091,23 +1352,19 @@ if page == "🏠 Dashboard Home":
             'Sent_Date': 'min'
         }).reset_index()
         reply_data = reply_data.rename(columns={'Has_Reply': 'Replied Count', 'Positive_Reply': 'Positive Reply Count'})
-        fig_reply = px.bar(
-            reply_data, 
-            x='Campaign Name', 
-            y=['Replied Count', 'Positive Reply Count'], 
-            title="<b>Reply Performance Analysis</b>",
-            barmode='group', 
-            color_discrete_sequence=color_schemes['gradient']
-        )
-        fig_reply.update_layout(
-            font=dict(color='white'),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            title_font_size=18,
-            title_x=0.5
-        )
-        fig_reply.update_traces(marker_cornerradius="15%")
-        fig_reply.update_xaxes(tickangle=45)
+        def build_reply_chart():
+            fig_reply = px.bar(
+                reply_data, 
+                x='Campaign Name', 
+                y=['Replied Count', 'Positive Reply Count'], 
+                title="<b>Reply Performance Analysis</b>",
+                barmode='group', 
+                color_discrete_sequence=color_schemes['gradient']
+            )
+            fig_reply.update_traces(marker_cornerradius="15%")
+            fig_reply.update_xaxes(tickangle=45)
+            return fig_reply
+        fig_reply = figure_cache.get(("Reply vs Positive Reply", chart_key), build_reply_chart)
         st.plotly_chart(fig_reply, use_container_width=True)
         
         st.dataframe(
@@ -1122,6 +1379,7 @@ if page == "🏠 Dashboard Home":
             st.info(generate_insights(filtered_df, "Reply vs Positive Reply"))
         st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("table: Reply Rate")
     # Reply Rate Table
     col3, col4 = st.columns([4, 1])
     with col3:
@@ -1144,72 +1402,59 @@ if page == "🏠 Dashboard Home":
             st.info(generate_insights(filtered_df, "Reply Rate"))
         st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("chart: Traffic Sources")
     # Traffic Sources with enhanced pie chart
     if 'Traffic' in filtered_df.columns and filtered_df['Traffic'].dtype == 'object':
         col1, col2 = st.columns([4, 1])
         with col1:
-            traffic_data = filtered_df.groupby('Traffic').size().nlargest(top_n_val).reset_index(name='Count')
-            if exclude_invalid:
-                traffic_data = traffic_data[
-                    (traffic_data['Traffic'].notna()) &
-                    (traffic_data['Traffic'] != '') &
-                    (traffic_data['Traffic'] != '--') &
-                    (traffic_data['Traffic'] != 'Unknown')
-                ]
-            fig_traffic = px.pie(
-                traffic_data, 
-                values='Count', 
-                names='Traffic', 
-                title="<b>Traffic Source Distribution</b>",
-                color_discrete_sequence=color_schemes['neon'],
-                hole=0.4
-            )
-            fig_traffic.update_layout(
-                font=dict(color='white'),
-                paper_bgcolor='rgba(0,0,0,0)',
-                title_font_size=18,
-                title_x=0.5
-            )
-            fig_traffic.update_traces(textposition='inside', textinfo='percent+label')
+            traffic_totals = figure_cache.get(("Traffic Sources totals", chart_key), lambda: (
+                filtered_df[valid_rows(filtered_df, 'Traffic')].groupby('Traffic').size().rename('Count')))
+            def build_traffic_chart():
+                traffic_data = top_n_with_others(traffic_totals, top_n_val)
+                fig_traffic = px.pie(
+                    traffic_data, 
+                    values='Count', 
+                    names='Traffic', 
+                    title="<b>Traffic Source Distribution</b>",
+                    color_discrete_sequence=color_schemes['neon'],
+                    hole=0.4
+                )
+                fig_traffic.update_traces(textposition='inside', textinfo='percent+label')
+                return fig_traffic
+            fig_traffic = figure_cache.get(("Traffic Sources", chart_key), build_traffic_chart)
             st.plotly_chart(fig_traffic, use_container_width=True)
+            show_all_groups(traffic_totals, "traffic sources", key="traffic_page")
         with col2:
             st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
             if st.button("💡 AI Insights", key="traffic_insight", help="Get traffic insights"):
                 st.info(generate_insights(filtered_df, "Traffic Sources"))
             st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("chart: Top Companies by HE")
     # New chart: Unique companies with most HE
     if 'Website' in filtered_df.columns and 'Engagement' in filtered_df.columns:
         st.markdown("### 🏢 Top Companies by High Engagement (HE)")
         col1, col2 = st.columns([4, 1])
         with col1:
-            he_company_data = filtered_df[filtered_df['Engagement'] == 'HE'].groupby('Website').size().reset_index(name='HE Count')
-            if exclude_invalid:
-                he_company_data = he_company_data[
-                    (he_company_data['Website'].notna()) &
-                    (he_company_data['Website'] != '--') &
-                    (he_company_data['Website'] != '') &
-                    (he_company_data['Website'] != 'Unknown')
-                ]
-            he_company_data = he_company_data.nlargest(top_n_val, 'HE Count')
-            fig_he_company = px.bar(
-                he_company_data, 
-                x='Website', 
-                y='HE Count', 
-                title="<b>Top Unique Companies with High Engagement</b>",
-                color='HE Count',
-                color_continuous_scale='Viridis'
-            )
-            fig_he_company.update_layout(
-                font=dict(color='white'),
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                title_font_size=18,
-                title_x=0.5
-            )
-            fig_he_company.update_traces(marker_cornerradius="15%")
-            fig_he_company.update_xaxes(tickangle=45)
+            accounts = selected_accounts()
+            he_company_totals = accounts.loc[accounts['HE'] > 0].set_index('Website')['HE'].rename('HE Count')
+            def build_he_company_chart():
+                he_company_data = top_n_with_others(he_company_totals, top_n_val)
+                fig_he_company = px.bar(
+                    he_company_data, 
+                    x='Website', 
+                    y='HE Count', 
+                    hover_data=['Share (%)'],
+                    title="<b>Top Unique Companies with High Engagement</b>",
+                    color='HE Count',
+                    color_continuous_scale='Viridis'
+                )
+                fig_he_company.update_traces(marker_cornerradius="15%")
+                fig_he_company.update_xaxes(tickangle=45)
+                return fig_he_company
+            fig_he_company = figure_cache.get(("Top Companies by HE", chart_key), build_he_company_chart)
             st.plotly_chart(fig_he_company, use_container_width=True)
+            show_all_groups(he_company_totals, "companies", key="he_company_page")
         with col2:
             st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
             if st.button("💡 AI Insights", key="he_company_insight", help="Get insights"):
@@ -1231,9 +1476,11 @@ elif page == "📊 Compare Quarters":
         st.warning("⚠️ Please select at least two quarters for meaningful comparison.")
     else:
         selected_quarter_nums = [int(q[1:]) for q in selected_quarters]
+        compare_key = filter_fingerprint(dataset_fingerprint(df), selected_quarter_nums, top_n_val)
         df_list = [df[df['Quarter'] == q_num].copy() for q_num in selected_quarter_nums]
         
         # Enhanced comparison metrics
+        profiler.mark("table: Quarter Metrics")
         st.markdown("### 📈 Key Performance Metrics")
         metrics = [
             "Total Campaigns", "Total Emails Sent", "Total Brands", "Unique Prospects", 
@@ -1250,18 +1497,15 @@ elif page == "📊 Compare Quarters":
                     val = df_q['Campaign Name'].nunique()
                 elif metric == "Total Emails Sent":
                     val = len(df_q)
+                elif metric == "Total Brands" and not exact_counts:
+                    val = sketches.estimate('Website', None, [q_num], exclude_invalid=exclude_invalid)
                 elif metric == "Total Brands":
                     if 'Website' in df_q.columns:
-                        df_q['Website'] = df_q['Website'].fillna('Unknown')
-                        if exclude_invalid:
-                            valid_brands = df_q[df_q['Website'].notna() & (df_q['Website'] != 'Unknown') & (df_q['Website'] != '--') & (df_q['Website'] != '')]
-                            val = len(valid_brands['Website'].unique())
-                        else:
-                            val = len(df_q['Website'].dropna().unique())
+                        val = df_q.loc[valid_rows(df_q, 'Website'), 'Website'].nunique()
                     else:
                         val = 0
                 elif metric == "Unique Prospects":
-                    val = df_q['Lead Email'].nunique()
+                    val = df_q['Lead Email'].nunique() if exact_counts else sketches.estimate('Lead Email', None, [q_num])
                 elif metric == "Total Opens":
                     val = len(df_q[df_q['Open Count'] > 0])
                 elif metric == "Total Clicks":
@@ -1284,19 +1528,18 @@ elif page == "📊 Compare Quarters":
                 elif metric == "Total Positive Replies":
                     val = df_q['Positive_Reply'].sum()
                 elif metric == "Reply Rate":
-                    if 'Website' in df_q.columns:
-                        df_q['Website'] = df_q['Website'].fillna('Unknown')
-                        if exclude_invalid:
-                            valid_brands = df_q[df_q['Website'].notna() & (df_q['Website'] != 'Unknown') & (df_q['Website'] != '--') & (df_q['Website'] != '')]
-                            total_brands_q = len(valid_brands['Website'].unique())
-                        else:
-                            total_brands_q = len(df_q['Website'].dropna().unique())
+                    if not exact_counts:
+                        total_brands_q = sketches.estimate('Website', None, [q_num], exclude_invalid=exclude_invalid)
+                    elif 'Website' in df_q.columns:
+                        total_brands_q = df_q.loc[valid_rows(df_q, 'Website'), 'Website'].nunique()
                     else:
                         total_brands_q = 0
                     val = f"{(df_q['Has_Reply'].sum() / total_brands_q * 100):.1f}%" if total_brands_q > 0 else "0.0%"
                 
                 if "Rate" not in metric and "Percentage" not in metric:
                     val = format_number(val, show_full_numbers)
+                    if metric in ("Total Brands", "Unique Prospects"):
+                        val = approx + val
                 row.append(val)
             data.append(row)
         
@@ -1309,86 +1552,204 @@ elif page == "📊 Compare Quarters":
             }),
             use_container_width=True
         )
+        if approx:
+            st.caption(distinct_note)
         
         # Enhanced comparison visualization
+        profiler.mark("chart: Quarterly Campaign Comparison")
         st.markdown("### 🎯 Campaign Performance Comparison")
-        combined_campaign = pd.DataFrame()
-        for i, df_q in enumerate(df_list):
-            campaign_data = df_q[df_q['Open Count'] > 0].groupby('Campaign Name').size().nlargest(top_n_val).reset_index(name=f'Opens {selected_quarters[i]}')
-            if combined_campaign.empty:
-                combined_campaign = campaign_data
-            else:
-                combined_campaign = combined_campaign.merge(campaign_data, on='Campaign Name', how='outer')
+        def build_compare_chart():
+            combined_campaign = pd.DataFrame()
+            for i, df_q in enumerate(df_list):
+                campaign_data = df_q[df_q['Open Count'] > 0].groupby('Campaign Name').size().nlargest(top_n_val).reset_index(name=f'Opens {selected_quarters[i]}')
+                if combined_campaign.empty:
+                    combined_campaign = campaign_data
+                else:
+                    combined_campaign = combined_campaign.merge(campaign_data, on='Campaign Name', how='outer')
         
-        combined_campaign = combined_campaign.fillna(0)
-        fig_compare = px.bar(
-            combined_campaign, 
-            x='Campaign Name', 
-            y=[f'Opens {q}' for q in selected_quarters], 
-            title="<b>Opens by Campaign - Quarterly Comparison</b>",
-            barmode='group',
-            color_discrete_sequence=color_schemes['gradient']
-        )
-        fig_compare.update_layout(
-            font=dict(color='white'),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            title_font_size=18,
-            title_x=0.5
-        )
-        fig_compare.update_traces(marker_cornerradius="15%")
-        fig_compare.update_xaxes(tickangle=45)
+            combined_campaign = combined_campaign.fillna(0)
+            fig_compare = px.bar(
+                combined_campaign, 
+                x='Campaign Name', 
+                y=[f'Opens {q}' for q in selected_quarters], 
+                title="<b>Opens by Campaign - Quarterly Comparison</b>",
+                barmode='group',
+                color_discrete_sequence=color_schemes['gradient']
+            )
+            fig_compare.update_traces(marker_cornerradius="15%")
+            fig_compare.update_xaxes(tickangle=45)
+            return fig_compare
+        fig_compare = figure_cache.get(("Quarterly Campaign Comparison", compare_key), build_compare_chart)
         st.plotly_chart(fig_compare, use_container_width=True)
 
+        # Confidence intervals and all-pairs significance tests from the per-group counts
+        profiler.mark("table: Significance Tests")
+        st.markdown("### 🧪 Statistical Significance")
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            test_by = st.selectbox("Compare", ["Quarters", "Campaigns"], key="test_by")
+        with col_b:
+            test_rate = st.selectbox("Metric", list(TEST_RATES), key="test_rate")
+        with col_c:
+            test_correction = st.selectbox("Multiple-comparison correction", CORRECTIONS, key="test_correction")
+        def build_test_counts():
+            rows = df[df['Quarter'].isin(selected_quarter_nums)]
+            if test_by == "Quarters":
+                counts = rate_counts(rows, 'Quarter')
+                counts.index = pd.Index([f"Q{q}" for q in counts.index], name='Quarter')
+                return counts
+            return rate_counts(rows, 'Campaign Name')
+        test_counts = figure_cache.get(("Significance counts", compare_key, test_by), build_test_counts)
+        intervals = rate_intervals(test_counts, test_rate)
+        if test_by == "Campaigns":
+            intervals = intervals.nlargest(top_n_val, 'Sends')
+        def build_interval_chart():
+            chart_data = intervals.sort_values(test_rate)
+            chart_data['Error Above'] = chart_data['CI High (%)'] - chart_data[test_rate]
+            chart_data['Error Below'] = chart_data[test_rate] - chart_data['CI Low (%)']
+            fig_interval = px.scatter(
+                chart_data,
+                x=test_rate,
+                y=chart_data.columns[0],
+                error_x='Error Above',
+                error_x_minus='Error Below',
+                hover_data=['Sends', 'CI Low (%)', 'CI High (%)'],
+                title=f"<b>{test_rate} with {100 * (1 - ALPHA):.0f}% Confidence Intervals</b>"
+            )
+            return fig_interval
+        fig_interval = figure_cache.get(("Rate Confidence Intervals", compare_key, test_by, test_rate), build_interval_chart)
+        st.plotly_chart(fig_interval, use_container_width=True)
+        pairs = figure_cache.get(("Pairwise Tests", compare_key, test_by, test_rate, test_correction),
+                                 lambda: pairwise_tests(test_counts, test_rate, test_correction))
+        significant_only = st.toggle("Significant pairs only", value=True, key="test_significant_only")
+        st.caption(f"{format_number(int(pairs['Significant'].sum()), True)} of {format_number(len(pairs), True)} pairs differ "
+                   f"at α = {ALPHA} (two-proportion z-test, {test_correction} correction). Rates are per send; "
+                   f"groups with fewer than {MIN_SENDS} sends are not tested.")
+        paginated_table(pairs[pairs['Significant']] if significant_only else pairs, key="test_page")
+
 elif page == "🤖 AI Predictions":
     st.markdown('<div class="section-header slide-up">🧠 AI-Powered Predictive Analytics</div>', unsafe_allow_html=True)
-    
+
+    # Training mode for the classifiers: learner choice and a stratified row budget
+    if 'training_reports' not in st.session_state:
+        st.session_state.training_reports = {}
+    with st.expander("⚙️ Model Training Settings"):
+        train_col1, train_col2 = st.columns(2)
+        with train_col1:
+            learner = st.selectbox("Learner", options=LEARNERS, index=0, help="Histogram gradient boosting trains much faster on large data")
+        with train_col2:
+            row_budget = st.number_input("Training row budget (0 = all rows)", min_value=0, value=DEFAULT_ROW_BUDGET, step=50000,
+                                         help="Rows are sampled per class so the open/bot balance is preserved")
+        training_report_slot = st.container()
+    with st.expander("📈 Forecast Settings"):
+        forecast_mode = st.radio("Forecast", ["All campaigns combined", "Per campaign"], horizontal=True)
+        opens_by_campaign = rollup_rows.groupby('Campaign Name')['Opens'].sum()
+        campaigns_by_opens = opens_by_campaign[opens_by_campaign > 0].sort_values(ascending=False).index.tolist()
+        if forecast_mode == "Per campaign":
+            forecast_campaigns = st.multiselect("Campaigns to forecast", options=campaigns_by_opens, default=campaigns_by_opens[:10],
+                                                help="Prophet fits campaigns in parallel processes; unchanged campaigns come from cache")
+        refine_with_prophet = st.toggle("Refine with Prophet (runs in the background)", value=False,
+                                        help="The fast Holt-Winters forecast shows immediately; Prophet replaces it when ready")
+
+    profiler.mark("models: submit jobs")
+    # Submit every model fit as a background job keyed by a fingerprint of the
+    # filtered data; the page renders immediately and each section fills in
+    # when its job finishes, and reruns pick up the same jobs instead of refitting
+    job_runner = get_job_runner()
+    ai_fingerprint = frame_fingerprint(filtered_df, [
+        'latitude', 'longitude', 'Open Count', 'Click Count', 'Response_Time', 'Sent_Date', 'Sent_Year',
+        'Sent_Month', 'Sent_DayOfWeek', 'Quarter', 'ESP Type', 'Traffic', 'City', 'Bot Check'
+    ])
+    training_key = f"{ai_fingerprint}:{learner}:{row_budget}"
+    ai_jobs = {}
+    if 'latitude' in filtered_df.columns and 'longitude' in filtered_df.columns:
+        geo_df = filtered_df[['latitude', 'longitude', 'Open Count']].dropna()
+        if len(geo_df) > 0:
+            ai_jobs['geo'] = job_runner.submit("Geographic Clustering", ai_fingerprint, models.geo_clusters, geo_df)
+    behavior_features = filtered_df[['Open Count', 'Click Count', 'Response_Time']].fillna(0)
+    if len(behavior_features) > 0:
+        ai_jobs['behavior'] = job_runner.submit("Behavior Segmentation", ai_fingerprint, models.behavior_segments, behavior_features)
+    model_input = filtered_df[[col for col in [
+        'Sent_Date', 'Sent_Year', 'Sent_Month', 'Sent_DayOfWeek', 'Quarter', 'ESP Type', 'Traffic', 'City',
+        'Open Count', 'Click Count', 'Response_Time', 'Bot Check'
+    ] if col in filtered_df.columns]]
+    ai_jobs['open'] = job_runner.submit("Open Probability Model", training_key, models.open_probabilities, model_input, learner, row_budget)
+    forecast_cache = get_forecast_cache()
+    if forecast_mode == "Per campaign":
+        campaign_series = open_series(rollup_rows[rollup_rows['Campaign Name'].isin(forecast_campaigns)], by='Campaign Name')
+        if refine_with_prophet:
+            ai_jobs['forecast'] = job_runner.submit("Campaign Forecasts", series_set_fingerprint(campaign_series),
+                                                    forecast_cache.forecast_many, campaign_series)
+    else:
+        daily_opens = open_series(rollup_rows)
+        if refine_with_prophet:
+            ai_jobs['forecast'] = job_runner.submit("Opens Forecast", series_fingerprint(daily_opens), forecast_cache.forecast, daily_opens)
+            ai_jobs['backtest'] = job_runner.submit("Forecast Backtest", series_fingerprint(daily_opens), backtest_forecasters, daily_opens)
+    ai_jobs['bot'] = job_runner.submit("Bot Detection Model", training_key, models.bot_probabilities, model_input, learner, row_budget)
+
+    def show_job_status(job):
+        # Placeholder for a section whose job has not finished (or failed)
+        if job.status == 'failed':
+            st.error(f"❌ {job.name} {job.message}")
+        else:
+            st.progress(job.progress, text=f"⏳ {job.name}: {job.message} ({job.elapsed:.0f}s)")
+
+    pending_jobs = [job for job in ai_jobs.values() if not job.finished]
+    if pending_jobs:
+        # Poll once a second and rerun the page as soon as any model finishes
+        @st.fragment(run_every=1.0)
+        def watch_ai_jobs():
+            finished = sum(job.finished for job in ai_jobs.values())
+            st.progress(finished / len(ai_jobs), text=f"🤖 {finished} of {len(ai_jobs)} models ready")
+            if any(job.finished for job in pending_jobs):
+                st.rerun()
+
+        watch_ai_jobs()
+
+    profiler.mark("model: Geographic Clustering")
     # Geographic Clustering with enhanced visualization
     if 'latitude' in filtered_df.columns and 'longitude' in filtered_df.columns:
         st.markdown("### 🗺️ Geographic Clustering Intelligence")
         col1, col2 = st.columns([4, 1])
         with col1:
-            geo_df = filtered_df[['latitude', 'longitude', 'Open Count']].dropna()
-            if len(geo_df) > 0:
-                n_clusters_geo = min(3, len(geo_df))
-                kmeans = KMeans(n_clusters=n_clusters_geo, random_state=42, n_init=10)
-                geo_df['Cluster'] = kmeans.fit_predict(geo_df[['latitude', 'longitude']])
-                fig_cluster = px.scatter_mapbox(
-                    geo_df,
-                    lat='latitude',
-                    lon='longitude',
-                    size='Open Count',
-                    color='Cluster',
-                    title="<b>AI Geographic Clusters (K-Means)</b>",
-                    color_discrete_sequence=color_schemes['neon'],
-                    size_max=20,
-                    zoom=3,
-                    mapbox_style="carto-darkmatter"
-                )
-                fig_cluster.update_layout(
-                    font=dict(color='white'),
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    title_font_size=18,
-                    title_x=0.5
-                )
-                st.plotly_chart(fig_cluster, use_container_width=True)
-            else:
+            if 'geo' not in ai_jobs:
                 st.warning("⚠️ No valid geographic data available for clustering analysis.")
+            elif ai_jobs['geo'].status != 'done':
+                show_job_status(ai_jobs['geo'])
+            else:
+                def build_cluster_chart():
+                    # Clustered points binned per grid cell and cluster
+                    cluster_cells, _ = bin_points(ai_jobs['geo'].result, DETAIL_LEVELS[map_detail], by='Cluster')
+                    return px.scatter_mapbox(
+                        cluster_cells,
+                        lat='latitude',
+                        lon='longitude',
+                        size='Open Count',
+                        color='Cluster',
+                        hover_data={'Open Count': True, 'Points': True, 'latitude': False, 'longitude': False},
+                        title="<b>AI Geographic Clusters (K-Means)</b>",
+                        color_discrete_sequence=color_schemes['neon'],
+                        size_max=20,
+                        zoom=3,
+                        mapbox_style="carto-darkmatter"
+                    )
+                fig_cluster = figure_cache.get(("Geographic Clusters", ai_jobs['geo'].key, map_detail), build_cluster_chart)
+                st.plotly_chart(fig_cluster, use_container_width=True)
         with col2:
             st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
             if st.button("💡 AI Insights", key="geo_cluster_insight", help="Get clustering insights"):
                 st.info(generate_insights(filtered_df, "Geographic Clustering (KMeans)"))
             st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("model: Behavior Segmentation")
     # Lead Behavior Segmentation with enhanced styling
     st.markdown("### 🧠 Behavioral Segmentation Intelligence")
     col1, col2 = st.columns([4, 1])
     with col1:
-        behavior_features = filtered_df[['Open Count', 'Click Count', 'Response_Time']].fillna(0)
-        if len(behavior_features) > 0:
-            n_clusters_behavior = min(4, len(behavior_features))
-            kmeans_behavior = KMeans(n_clusters=n_clusters_behavior, random_state=42, n_init=10)
-            filtered_df['Behavior_Cluster'] = kmeans_behavior.fit_predict(behavior_features)
+        if 'behavior' in ai_jobs and ai_jobs['behavior'].status != 'done':
+            show_job_status(ai_jobs['behavior'])
+        elif 'behavior' in ai_jobs:
+            filtered_df['Behavior_Cluster'] = ai_jobs['behavior'].result
             fig_segment = px.scatter(
                 filtered_df, 
                 x='Open Count', 
@@ -1399,13 +1760,6 @@ elif page == "🤖 AI Predictions":
                 color_discrete_sequence=color_schemes['gradient'],
                 size_max=20
             )
-            fig_segment.update_layout(
-                font=dict(color='white'),
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                title_font_size=18,
-                title_x=0.5
-            )
             st.plotly_chart(fig_segment, use_container_width=True)
         else:
             st.warning("⚠️ No behavior data available for segmentation analysis.")
@@ -1415,157 +1769,207 @@ elif page == "🤖 AI Predictions":
             st.info(generate_insights(filtered_df, "Lead Behavior Segmentation (KMeans)"))
         st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("model: Open Prediction")
     # Enhanced Open Prediction Model
     st.markdown("### 🎯 Email Open Probability Prediction")
     col1, col2 = st.columns([4, 1])
     with col1:
-        @st.cache_resource
-        def train_open_model(_df):
-            features = ['Sent_Year', 'Sent_Month', 'Sent_DayOfWeek', 'Quarter']
-            categorical_cols = []
-            if 'ESP Type' in _df.columns:
-                features.append('ESP Type')
-                categorical_cols.append('ESP Type')
-            if 'Traffic' in _df.columns:
-                features.append('Traffic')
-                categorical_cols.append('Traffic')
-            
-            X = _df[features].copy()
-            if 'City' in _df.columns and len(_df['City'].unique()) <= 50:
-                features.append('City')
-                categorical_cols.append('City')
-            
-            le_dict = {}
-            for col in categorical_cols:
-                le = LabelEncoder()
-                X[col] = le.fit_transform(X[col].astype(str))
-                le_dict[col] = le
-            y = (_df['Open Count'] > 0).astype(int)
-            
-            if len(X) > 100:
-                X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-                model = RandomForestClassifier(n_estimators=50, random_state=42, n_jobs=-1)
-                model.fit(X_train, y_train)
-                accuracy = model.score(X_test, y_test)
-                
-                # Display enhanced accuracy metric
-                st.markdown(f"""
-                <div class="metric-container fade-in">
-                    <div class="metric-value">{accuracy:.2f}</div>
-                    <div class="metric-label">🎯 Model Accuracy</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                _df['Open_Probability'] = model.predict_proba(X)[:, 1]
-                return model, _df
-            return None, _df
-
-        model, filtered_df_with_pred = train_open_model(filtered_df)
-        if model is not None:
-            pred_data = filtered_df_with_pred[['Lead Email', 'Open_Probability', 'Campaign Name']].head(top_n_val).sort_values('Open_Probability', ascending=False)
+        if ai_jobs['open'].status != 'done':
+            show_job_status(ai_jobs['open'])
+            open_model = None
+        else:
+            open_model, open_probabilities = ai_jobs['open'].result
+            if open_model is None:
+                st.warning("⚠️ Insufficient data for training prediction model (minimum 100 rows required).")
+        if open_model is not None:
+            st.session_state.training_reports[('Open Probability', learner, row_budget)] = open_model.report
+            # Display enhanced accuracy metric
+            st.markdown(f"""
+            <div class="metric-container fade-in">
+                <div class="metric-value">{open_model.accuracy:.2f}</div>
+                <div class="metric-label">🎯 Model Accuracy</div>
+            </div>
+            """, unsafe_allow_html=True)
+            st.caption(f"{open_model.report['Learner']} trained on {format_number(open_model.report['Training Rows'])} of "
+                       f"{format_number(open_model.report['Rows Available'])} rows in {open_model.report['Fit Seconds']:.1f}s")
+
+            pred_data = filtered_df[['Lead Email', 'Campaign Name']].assign(Open_Probability=open_probabilities)
+            pred_data = rank_leads([pred_data], top_k=top_n_val)[['Lead Email', 'Open_Probability', 'Campaign Name']]
             st.dataframe(
                 pred_data.style.background_gradient(subset=['Open_Probability'], cmap='Greens'),
                 use_container_width=True
             )
-        else:
-            st.warning("⚠️ Insufficient data for training prediction model (minimum 100 rows required).")
+
+            # Batch scoring of a new lead list against the trained model
+            with st.expander("📤 Batch Lead Scoring"):
+                st.caption("Score a new lead file with the trained model. The file is read and scored in chunks and only the top leads are kept; "
+                           "keeping all leads ranks them on disk instead, and only the finished CSV is loaded for the download.")
+                lead_file = st.file_uploader("Lead file", type=["csv", "xlsx", "xls"], key="lead_file")
+                score_col1, score_col2, score_col3 = st.columns(3)
+                with score_col1:
+                    planned_send_date = st.date_input("Planned send date", help="Used for leads without a Sent_Date")
+                with score_col2:
+                    score_chunk_size = st.number_input("Chunk size", min_value=1000, max_value=1000000, value=DEFAULT_CHUNK_SIZE, step=10000)
+                with score_col3:
+                    score_top_k = st.number_input("Keep top leads (0 = all)", min_value=0, value=50000, step=1000)
+                if lead_file is not None and st.button("🚀 Score Leads", key="score_leads"):
+                    progress = st.progress(0.0, text="Scoring leads...")
+                    lead_file_type = lead_file.name.split('.')[-1].lower()
+                    scoring_stats = {'rows': 0, 'unseen': {}}
+
+                    def scored_stream():
+                        for scored, unseen in score_chunks(lead_file, open_model, file_type=lead_file_type,
+                                                           chunk_size=int(score_chunk_size), send_date=planned_send_date):
+                            scoring_stats['rows'] += len(scored)
+                            for col, count in unseen.items():
+                                scoring_stats['unseen'][col] = scoring_stats['unseen'].get(col, 0) + count
+                            progress.progress(min(lead_file.tell() / max(lead_file.size, 1), 1.0),
+                                              text=f"Scored {scoring_stats['rows']:,} leads...")
+                            yield scored
+
+                    if score_top_k:
+                        ranked_leads = rank_leads(scored_stream(), top_k=int(score_top_k))
+                        ranked_preview = ranked_leads.head(top_n_val)
+                        ranked_csv = ranked_leads.to_csv(index=False).encode('utf-8')
+                    else:
+                        # Rank the full list by external merge on disk
+                        ranked_path = os.path.join(tempfile.mkdtemp(prefix='camml-ranked-'), 'ranked_leads.csv')
+                        try:
+                            rank_leads_to_csv(scored_stream(), ranked_path)
+                            ranked_preview = pd.read_csv(ranked_path, nrows=top_n_val)
+                            with open(ranked_path, 'rb') as ranked_file:
+                                ranked_csv = ranked_file.read()
+                        finally:
+                            shutil.rmtree(os.path.dirname(ranked_path), ignore_errors=True)
+                    progress.progress(1.0, text=f"✅ Scored {scoring_stats['rows']:,} leads")
+                    unseen_msg = ", ".join(f"{col}: {format_number(count)}" for col, count in scoring_stats['unseen'].items() if count)
+                    if unseen_msg:
+                        st.info(f"Rows with categories not seen in training (scored with an 'unknown' code): {unseen_msg}")
+                    st.dataframe(ranked_preview, use_container_width=True)
+                    st.download_button(
+                        "⬇️ Download Ranked Leads",
+                        ranked_csv,
+                        file_name="ranked_leads.csv",
+                        mime="text/csv"
+                    )
     with col2:
         st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
         if st.button("💡 AI Insights", key="open_pred_insight", help="Get prediction insights"):
             st.info(generate_insights(filtered_df, "Open Probability (Random Forest)"))
         st.markdown('</div>', unsafe_allow_html=True)
 
-    # Enhanced Forecasting with Prophet
-    # Enhanced Forecasting with Prophet
+    profiler.mark("model: Forecast")
+    # Forecasting: the fast Holt-Winters forecast renders immediately and the
+    # Prophet refinement replaces it once its background job finishes
     st.markdown("### 📈 Future Opens Forecasting")
     col1, col2 = st.columns([4, 1])
     with col1:
-        @st.cache_resource
-        def forecast_opens(_df):
-            time_data = _df[_df['Open Count'] > 0].groupby('Sent_Date').size().reset_index(name='Opens')
-            if len(time_data) < 10:
-                st.warning("⚠️ Insufficient time-series data for forecasting (minimum 10 data points required).")
-                return None
-            time_data.columns = ['ds', 'y']
-            model_prophet = Prophet(yearly_seasonality=True, weekly_seasonality=True, daily_seasonality=False)
-            model_prophet.fit(time_data)
-            future = model_prophet.make_future_dataframe(periods=30)
-            forecast = model_prophet.predict(future)
-            return forecast
-
-        forecast = forecast_opens(filtered_df)
-        if forecast is not None:
-            fig_forecast = px.line(
-                forecast, 
-                x='ds', 
-                y='yhat', 
-                title="<b>AI-Powered Opens Forecast (Next 30 Days)</b>", 
-                color_discrete_sequence=['#4facfe']
-            )
-            fig_forecast.add_scatter(
-                x=forecast['ds'], 
-                y='yhat_lower', 
-                mode='lines', 
-                line=dict(color='rgba(255,255,255,0)'), 
-                showlegend=False, 
-                fill='tonexty', 
-                fillcolor='rgba(79, 172, 254, 0.2)'
-            )
-            fig_forecast.add_scatter(
-                x=forecast['ds'], 
-                y='yhat_upper', 
-                mode='lines', 
-                line=dict(color='rgba(255,255,255,0)'), 
-                showlegend=False, 
-                fill='tonexty', 
-                fillcolor='rgba(79, 172, 254, 0.2)'
-            )
-            fig_forecast.update_layout(
-                font=dict(color='white'),
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                title_font_size=18,
-                title_x=0.5
-            )
-            st.plotly_chart(fig_forecast, use_container_width=True)
+        prophet_job = ai_jobs.get('forecast')
+        refined = prophet_job.result if prophet_job is not None and prophet_job.status == 'done' else None
+        forecaster_name = "Prophet" if refined is not None else "Holt-Winters"
+        if forecast_mode == "Per campaign":
+            if refined is None:
+                refined = {name: holt_winters_forecast(series) for name, series in campaign_series.items()}
+            campaign_forecast_map = {name: campaign_forecast for name, campaign_forecast in refined.items() if campaign_forecast is not None}
+            if campaign_forecast_map:
+                campaign_forecasts = pd.concat(
+                    [campaign_forecast.assign(**{'Campaign Name': name}) for name, campaign_forecast in campaign_forecast_map.items()],
+                    ignore_index=True
+                )
+                fig_campaign_forecast = px.line(
+                    campaign_forecasts,
+                    x='ds',
+                    y='yhat',
+                    color='Campaign Name',
+                    title=f"<b>Opens Forecast by Campaign (Next 30 Days, {forecaster_name})</b>",
+                    color_discrete_sequence=color_schemes['neon']
+                )
+                st.plotly_chart(fig_campaign_forecast, use_container_width=True)
+                # Each campaign's horizon starts after the last day of its own series
+                series_ends = campaign_forecasts['Campaign Name'].map({name: series['ds'].max() for name, series in campaign_series.items()})
+                horizon = campaign_forecasts[campaign_forecasts['ds'] > series_ends]
+                st.dataframe(
+                    horizon.groupby('Campaign Name')['yhat'].sum().clip(lower=0).round(0)
+                    .sort_values(ascending=False).reset_index(name='Predicted Opens (30 Days)'),
+                    use_container_width=True
+                )
+            else:
+                st.warning("⚠️ None of the selected campaigns has enough history to forecast (minimum 10 days with opens).")
         else:
-            st.warning("⚠️ No forecast generated due to insufficient data.")
+            forecast = holt_winters_forecast(daily_opens)
+            if forecast is not None:
+                fig_forecast = px.line(
+                    forecast, 
+                    x='ds', 
+                    y='yhat', 
+                    title="<b>AI-Powered Opens Forecast (Next 30 Days)</b>", 
+                    color_discrete_sequence=['#4facfe']
+                )
+                fig_forecast.update_traces(name="Holt-Winters", showlegend=True)
+                fig_forecast.add_scatter(
+                    x=forecast['ds'], 
+                    y=forecast['yhat_lower'], 
+                    mode='lines', 
+                    line=dict(color='rgba(255,255,255,0)'), 
+                    showlegend=False, 
+                    fill='tonexty', 
+                    fillcolor='rgba(79, 172, 254, 0.2)'
+                )
+                fig_forecast.add_scatter(
+                    x=forecast['ds'], 
+                    y=forecast['yhat_upper'], 
+                    mode='lines', 
+                    line=dict(color='rgba(255,255,255,0)'), 
+                    showlegend=False, 
+                    fill='tonexty', 
+                    fillcolor='rgba(79, 172, 254, 0.2)'
+                )
+                if refined is not None:
+                    fig_forecast.add_scatter(
+                        x=refined['ds'],
+                        y=refined['yhat'],
+                        mode='lines',
+                        name="Prophet (refined)",
+                        line=dict(color='#f9ca24', dash='dash')
+                    )
+                st.plotly_chart(fig_forecast, use_container_width=True)
+            else:
+                st.warning("⚠️ Insufficient time-series data for forecasting (minimum 10 data points required).")
+        if prophet_job is not None and prophet_job.status != 'done':
+            show_job_status(prophet_job)
+
+        # Holdout comparison of the two forecasters on the last two weeks
+        if 'backtest' in ai_jobs:
+            if ai_jobs['backtest'].status != 'done':
+                show_job_status(ai_jobs['backtest'])
+            elif ai_jobs['backtest'].result is not None:
+                st.markdown("**🧪 Forecast Accuracy (last 14 days held out)**")
+                st.dataframe(ai_jobs['backtest'].result.round(3), use_container_width=True)
     with col2:
         st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
         if st.button("💡 AI Insights", key="forecast_insight", help="Get forecasting insights"):
             st.info(generate_insights(filtered_df, "Predicted Opens (Prophet)"))
         st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("model: Bot Detection")
     # Enhanced Bot Detection
     st.markdown("### 🛡️ Enhanced Bot Detection")
     col1, col2 = st.columns([4, 1])
     with col1:
-        @st.cache_resource
-        def bot_detection_model(_df):
-            features = ['Open Count', 'Click Count', 'Response_Time']
-            X = _df[features].fillna(0)
-            y = _df['Bot Check'].map({'Bot': 1, 'Human': 0}).fillna(0).astype(int)
+        if ai_jobs['bot'].status != 'done':
+            show_job_status(ai_jobs['bot'])
+        elif ai_jobs['bot'].result[0] is not None:
+            bot_model, bot_report, bot_probabilities = ai_jobs['bot'].result
+            st.session_state.training_reports[('Bot Detection', learner, row_budget)] = bot_report
+            st.markdown(f"""
+            <div class="metric-container fade-in">
+                <div class="metric-value">{bot_report['Held-out Accuracy']:.2f}</div>
+                <div class="metric-label">🛡️ Bot Detection Accuracy</div>
+            </div>
+            """, unsafe_allow_html=True)
             
-            if len(X) > 100 and len(y.unique()) > 1:
-                X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-                model = RandomForestClassifier(n_estimators=50, random_state=42, n_jobs=-1)
-                model.fit(X_train, y_train)
-                accuracy = model.score(X_test, y_test)
-                
-                st.markdown(f"""
-                <div class="metric-container fade-in">
-                    <div class="metric-value">{accuracy:.2f}</div>
-                    <div class="metric-label">🛡️ Bot Detection Accuracy</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                _df['Bot_Probability'] = model.predict_proba(X)[:, 1]
-                return model, _df
-            return None, _df
-
-        bot_model, filtered_df_with_bot = bot_detection_model(filtered_df)
-        if bot_model is not None:
-            bot_data = filtered_df_with_bot[['Lead Email', 'Bot_Probability', 'Campaign Name']].head(top_n_val).sort_values('Bot_Probability', ascending=False)
+            bot_data = filtered_df[['Lead Email', 'Campaign Name']].assign(Bot_Probability=bot_probabilities)
+            bot_data = bot_data[['Lead Email', 'Bot_Probability', 'Campaign Name']].nlargest(top_n_val, 'Bot_Probability')
             st.dataframe(
                 bot_data.style.background_gradient(subset=['Bot_Probability'], cmap='Oranges'),
                 use_container_width=True
@@ -1578,15 +1982,41 @@ elif page == "🤖 AI Predictions":
             st.info(generate_insights(filtered_df, "Enhanced Bot Probability (Random Forest)"))
         st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("chart: Training Report")
+    # Training time versus held-out accuracy for every fit in this session
+    with training_report_slot:
+        if st.session_state.training_reports:
+            report_df = pd.DataFrame([
+                {'Model': model_name, 'Row Budget': budget or 'All', **report}
+                for (model_name, _, budget), report in st.session_state.training_reports.items()
+            ])
+            fig_training = px.scatter(
+                report_df,
+                x='Fit Seconds',
+                y='Held-out Accuracy',
+                color='Learner',
+                symbol='Model',
+                hover_data=['Training Rows', 'Row Budget'],
+                title="<b>Training Time vs Held-out Accuracy</b>",
+                color_discrete_sequence=color_schemes['primary']
+            )
+            st.plotly_chart(fig_training, use_container_width=True)
+            st.dataframe(report_df, use_container_width=True)
+
+    # Model fits run outside the script as background jobs; record their run time too
+    for job in ai_jobs.values():
+        if job.finished:
+            profiler.add(f"job: {job.name}", job.elapsed, background=True)
+
 elif page == "👑 Boss Dashboard":
     st.markdown('<div class="section-header slide-up">👑 Executive Insights Dashboard</div>', unsafe_allow_html=True)
     
+    profiler.mark("KPI cards")
     # Enhanced executive summary
     st.markdown("### 📊 Executive Summary")
     filtered_df['Engagement'] = filtered_df['Engagement'].astype(str).str.strip().str.upper()
     total_campaigns = filtered_df['Campaign Name'].nunique()
     total_sent = len(filtered_df)
-    unique_prospects = filtered_df['Lead Email'].nunique()
     total_opens = len(filtered_df[filtered_df['Open Count'] > 0])
     total_clicks = len(filtered_df[filtered_df['Click Count'] > 0])
     he_count = len(filtered_df[filtered_df['Engagement'] == 'HE'])
@@ -1594,20 +2024,7 @@ elif page == "👑 Boss Dashboard":
     no_count = len(filtered_df[filtered_df['Engagement'] == 'NO'])
     total_replies = filtered_df['Has_Reply'].sum()
     total_positive_replies = filtered_df['Positive_Reply'].sum()
-    # Calculate total_brands for Reply Percentage
-    if 'Website' in filtered_df.columns:
-        filtered_df['Website'] = filtered_df['Website'].fillna('Unknown')
-        if exclude_invalid:
-            valid_brands = filtered_df[filtered_df['Website'].notna() & (filtered_df['Website'] != 'Unknown') & (filtered_df['Website'] != '--') & (filtered_df['Website'] != '')]
-            total_brands = len(valid_brands['Website'].unique())
-        else:
-            total_brands = len(filtered_df['Website'].dropna().unique())
-    else:
-        total_brands = 0
     reply_percentage = (total_replies / total_brands * 100) if total_brands > 0 else 0
-    
-    # Debug raw counts for Boss Dashboard
-    st.write("Boss Dashboard - Raw counts - HE:", he_count, "LE:", le_count, "NO:", no_count)
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -1640,7 +2057,10 @@ elif page == "👑 Boss Dashboard":
             <div class="metric-label">💬 Reply Rate</div>
         </div>
         """, unsafe_allow_html=True)
+    if approx:
+        st.caption(f"~ Reply Rate is based on an estimated brand count (±{relative_error():.1%} standard error).")
 
+    profiler.mark("chart: Top Campaigns")
     # Top performing campaigns
     st.markdown("### 🎯 Top Performing Campaigns")
     campaign_summary = filtered_df.groupby('Campaign Name').agg({
@@ -1657,27 +2077,25 @@ elif page == "👑 Boss Dashboard":
     if st.button("💡 AI Insights", key="boss_campaign_insight", help="Get campaign insights"):
         st.info(generate_insights(filtered_df, "Top Opens by Campaign"))
 
+    profiler.mark("chart: Engagement Breakdown")
     # Engagement Breakdown
     st.markdown("### 📊 Engagement Breakdown")
     col1, col2 = st.columns([3, 2])
     with col1:
-        engagement_data = filtered_df['Engagement'].value_counts().reset_index(name='Count')
-        engagement_data.columns = ['Engagement', 'Count']
-        fig_engagement = px.pie(
-            engagement_data, 
-            values='Count', 
-            names='Engagement', 
-            title="<b>Engagement Distribution</b>", 
-            color_discrete_sequence=color_schemes['primary'],
-            hole=0.4
-        )
-        fig_engagement.update_layout(
-            font=dict(color='white'),
-            paper_bgcolor='rgba(0,0,0,0)',
-            title_font_size=18,
-            title_x=0.5
-        )
-        fig_engagement.update_traces(textposition='inside', textinfo='percent+label')
+        def build_engagement_chart():
+            engagement_data = filtered_df['Engagement'].value_counts().reset_index(name='Count')
+            engagement_data.columns = ['Engagement', 'Count']
+            fig_engagement = px.pie(
+                engagement_data, 
+                values='Count', 
+                names='Engagement', 
+                title="<b>Engagement Distribution</b>", 
+                color_discrete_sequence=color_schemes['primary'],
+                hole=0.4
+            )
+            fig_engagement.update_traces(textposition='inside', textinfo='percent+label')
+            return fig_engagement
+        fig_engagement = figure_cache.get(("Engagement Breakdown", chart_key), build_engagement_chart)
         st.plotly_chart(fig_engagement, use_container_width=True)
     with col2:
         st.markdown('<div style="padding: 1rem;">', unsafe_allow_html=True)
@@ -1685,45 +2103,36 @@ elif page == "👑 Boss Dashboard":
             st.info("📊 **Engagement Insight**: The distribution of High (HE), Low (LE), and No (NO) engagement highlights campaign effectiveness. Focus on strategies that boost HE to improve overall ROI.")
         st.markdown('</div>', unsafe_allow_html=True)
 
+    profiler.mark("chart: Geographic Performance")
     # Geographic Performance (if available)
     if 'latitude' in filtered_df.columns and 'longitude' in filtered_df.columns:
         st.markdown("### 🗺️ Geographic Performance")
-        geo_data = filtered_df[filtered_df['Open Count'] > 0].groupby(['City', 'latitude', 'longitude']).agg({
-            'Open Count': 'sum',
-            'Click Count': 'sum'
-        }).reset_index()
-        if exclude_invalid:
-            geo_data = geo_data[
-                (geo_data['City'].notna()) &
-                (geo_data['City'] != '') &
-                (geo_data['City'] != '--') &
-                (geo_data['City'] != 'Unknown')
-            ]
-        geo_data = geo_data.nlargest(5, 'Open Count')
-        fig_geo = px.scatter_mapbox(
-            geo_data,
-            lat='latitude',
-            lon='longitude',
-            size='Open Count',
-            color='Click Count',
-            hover_name='City',
-            hover_data={'Open Count': True, 'Click Count': True},
-            title="<b>Top Cities by Engagement</b>",
-            color_continuous_scale='Viridis',
-            size_max=20,
-            zoom=3
-        )
-        fig_geo.update_layout(
-            mapbox_style="carto-darkmatter",
-            font=dict(color='white'),
-            paper_bgcolor='rgba(0,0,0,0)',
-            title_font_size=18,
-            title_x=0.5
-        )
+        def build_geo_chart():
+            geo_data, _ = geo_cube.query(selected_year, selected_quarter_num, selected_campaign, bot_filter,
+                                         time_range_filter, exclude_invalid, 5, DETAIL_LEVELS[map_detail])
+            fig_geo = px.scatter_mapbox(
+                geo_data,
+                lat='latitude',
+                lon='longitude',
+                size='Open Count',
+                color='Click Count',
+                hover_name='City',
+                hover_data={'Open Count': True, 'Click Count': True, 'Cities': True},
+                title="<b>Top Cities by Engagement</b>",
+                color_continuous_scale='Viridis',
+                size_max=20,
+                zoom=3
+            )
+            fig_geo.update_layout(
+                mapbox_style="carto-darkmatter"
+            )
+            return fig_geo
+        fig_geo = figure_cache.get(("Geographic Performance", chart_key, map_detail), build_geo_chart)
         st.plotly_chart(fig_geo, use_container_width=True)
         if st.button("💡 AI Insights", key="boss_geo_insight", help="Get geographic insights"):
             st.info(generate_insights(filtered_df, "Top Cities by Opens and Clicks"))
 
+    profiler.mark("Key Takeaways")
     # Key Takeaways
     st.markdown("### 🔑 Key Takeaways")
     takeaways = [
@@ -1735,10 +2144,97 @@ elif page == "👑 Boss Dashboard":
     for takeaway in takeaways:
         st.markdown(f"<div style='padding: 0.5rem;'>{takeaway}</div>", unsafe_allow_html=True)
 
+elif page == "🔎 Lead Lookup":
+    st.markdown('<div class="section-header slide-up">🔎 Lead Lookup</div>', unsafe_allow_html=True)
+    profiler.mark("lead profiles")
+    lead_profiles = get_lead_profiles(dataset_fingerprint(df), df)
+    st.caption(f"Profiles of all {format_number(len(lead_profiles), True)} leads in the uploaded data; the sidebar filters do not apply here.")
+
+    profiler.mark("lead search")
+    lead_query = st.text_input("📧 Lead email", placeholder="Type the start of an email address", key="lead_query")
+    if not lead_query.strip():
+        st.info("💡 Type the first few characters of a lead's email to find it.")
+    else:
+        match_codes, match_count = lead_profiles.search(lead_query)
+        if match_count == 0:
+            st.warning(f"⚠️ No lead email starts with '{lead_query.strip()}'.")
+        else:
+            matches = lead_profiles.profiles(match_codes)
+            if match_count > len(matches):
+                st.caption(f"Showing the first {len(matches)} of {format_number(match_count, True)} matches; type more to narrow down.")
+            st.dataframe(matches, hide_index=True, use_container_width=True)
+
+            profiler.mark("lead drill-down")
+            lead_email = st.selectbox("Lead", matches['Lead Email'], key="lead_email")
+            lead_code = lead_profiles.lookup(lead_email)
+            profile = lead_profiles.table.iloc[lead_code]
+            col1, col2, col3, col4 = st.columns(4)
+            for col, label, value in [
+                (col1, "📧 Sends", format_number(int(profile['Sends']), True)),
+                (col2, "👀 Opens", format_number(int(profile['Opens']), True)),
+                (col3, "🖱️ Clicks", format_number(int(profile['Clicks']), True)),
+                (col4, "🎯 Campaigns", format_number(int(profile['Campaigns']), True)),
+            ]:
+                with col:
+                    st.markdown(f"""
+                    <div class="metric-container fade-in">
+                        <div class="metric-value">{value}</div>
+                        <div class="metric-label">{label}</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+            flags = [name for name in ['Replied', 'Positive Reply', 'Bot Flagged'] if profile[name]]
+            st.markdown(f"**First open:** {profile['First Open'] if pd.notna(profile['First Open']) else '–'} · "
+                        f"**Last open:** {profile['Last Open'] if pd.notna(profile['Last Open']) else '–'} · "
+                        f"**Flags:** {', '.join(flags) if flags else 'none'}")
+            st.markdown("### 🧾 Activity")
+            activity_columns = ['Campaign Name', 'Sent_Date', 'Opened Time', 'Open Count', 'Click Count', 'Engagement',
+                                'Bot Check', 'Reply Message', 'Positive Reply(Yes/No)']
+            activity = lead_profiles.activity(df, lead_code)
+            paginated_table(activity[[col for col in activity_columns if col in activity.columns]], key="lead_activity_page")
+
+elif page == "🏢 Accounts":
+    st.markdown('<div class="section-header slide-up">🏢 Account Prioritization</div>', unsafe_allow_html=True)
+    profiler.mark("account rollup")
+    accounts = selected_accounts()
+    if accounts is None or accounts.empty:
+        st.info("No website data available for the selected filters.")
+    else:
+        st.caption(f"{format_number(len(accounts), True)} accounts. Engagement Score (0-100) weighs each account's per-send rates "
+                   f"({', '.join(f'{name} ×{weight:g}' for name, weight in SCORE_WEIGHTS.items())}), "
+                   f"smoothed toward the overall rates as if every account had {PRIOR_SENDS} more average sends.")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            sort_by = st.selectbox("Sort by", list(accounts.columns[1:]), key="account_sort")
+        with col2:
+            descending = st.toggle("Descending", value=True, key="account_descending")
+        profiler.mark("account table")
+        ranked_accounts = accounts.sort_values(sort_by, ascending=not descending, kind='stable')
+        paginated_table(ranked_accounts, key="account_page")
+
+profiler.mark("footer")
 # Enhanced Footer
 st.markdown("""
 <div class="custom-footer fade-in">
     <p>🚀 Powered by CamML Analytics | Designed for Data-Driven Success</p>
     <p>📧 Contact us at support@camml.com | © 2025</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# Hot-path profiler panel: per-section timings and memory for this rerun
+st.sidebar.markdown("""
+<div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 1rem; border-radius: 15px; margin: 1rem 0; text-align: center;">
+    <h3 style="color: white; margin: 0;">⏱️ Profiler</h3>
+</div>
+""", unsafe_allow_html=True)
+st.sidebar.toggle("Profile this page", key="profile_hot_path",
+                  help="Time and memory-profile every section of each rerun and append the spans to a local trace file")
+run_seconds = profiler.finish()
+if profiler.enabled:
+    profiler.write_trace(page=page, rows=len(filtered_df))
+    with st.sidebar.expander(f"Last rerun: {run_seconds:.2f}s", expanded=True):
+        st.dataframe(
+            profiler.summary().style.format({'Seconds': '{:.3f}', 'Peak MiB': '{:.1f}', '% of Run': '{:.0f}%'}, na_rep='–'),
+            hide_index=True,
+            use_container_width=True
+        )
+        st.caption(f"Spans appended to {os.path.abspath(TRACE_FILE)}")
@@ -0,0 +1,332 @@
+"""Concurrent multi-session load test against a local Streamlit server.
+
+    python benchmarks/load_test.py --sessions 8 --rows 100000
+    python benchmarks/load_test.py --sessions 16 --files 4 --iterations 10 --out load.json
+
+Starts ``streamlit run app.py`` (or targets --url), then drives N simulated
+analysts over the same websocket protocol the browser uses: each one opens the
+app, uploads a synthetic export, then switches pages and changes sidebar
+filters. Reports p50/p95 rerun latency per action, the server's resident
+memory per session, and how often load_data's cache had to re-read an upload
+because another session's file evicted it (cache thrash).
+
+Sessions are spread over --files distinct uploads; with more files than
+load_data's cache slots every session's reruns re-ingest. Memory is read from
+/proc, so the RSS figures need Linux and a server started by this script (or
+--pid).
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+from tornado.websocket import websocket_connect
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from camml.synthetic import write_campaign_csv  # noqa: E402
+from camml.ingest import read_campaign_file  # noqa: E402
+
+APP = os.path.join(ROOT, 'app.py')
+PAGES = ["🏠 Dashboard Home", "📊 Compare Quarters", "🤖 AI Predictions", "👑 Boss Dashboard"]
+RERUN_TIMEOUT = 600
+WIDGET_TYPES = ['selectbox', 'multiselect', 'checkbox', 'file_uploader']
+# An ingest span longer than this share of a cold read of the file re-read it
+THRASH_SHARE = 0.3
+
+
+class Session:
+    """One simulated browser tab talking to the server's websocket."""
+
+    def __init__(self, url, name):
+        self.url = url
+        self.name = name
+        self.session_id = None
+        self.widgets = {}  # (type, label or key suffix) -> widget proto
+        self.states = {}  # widget id -> WidgetState sent with every rerun
+        self.latencies = []  # (action, seconds)
+        self.errors = []
+        self.ws = None
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url.replace('http', 'ws', 1) + '/_stcore/stream',
+                                          max_message_size=1 << 30)
+
+    async def _read(self):
+        raw = await asyncio.wait_for(self.ws.read_message(), RERUN_TIMEOUT)
+        if raw is None:
+            raise ConnectionError(f"{self.name}: server closed the connection")
+        msg = ForwardMsg()
+        msg.ParseFromString(raw)
+        if msg.HasField('new_session'):
+            self.session_id = msg.new_session.initialize.session_id
+        elif msg.HasField('delta') and msg.delta.HasField('new_element'):
+            element = msg.delta.new_element
+            kind = element.WhichOneof('type')
+            if kind == 'exception':
+                self.errors.append(element.exception.message)
+            elif kind in WIDGET_TYPES:
+                widget = getattr(element, kind)
+                self.widgets[(kind, widget.label or widget.id.rsplit('-', 1)[-1])] = widget
+        return msg
+
+    async def rerun(self, action):
+        msg = BackMsg()
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            reply = await self._read()
+            # Reruns the app starts itself (st.rerun) finish early; wait for the last one
+            if reply.WhichOneof('type') == 'script_finished' and reply.script_finished in (
+                    ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR):
+                break
+        self.latencies.append((action, time.perf_counter() - start))
+
+    def set_widget(self, kind, label, **value):
+        widget = self.widgets[(kind, label)]
+        state = WidgetState(id=widget.id)
+        for field, v in value.items():
+            if field == 'int_array_value':
+                state.int_array_value.data.extend(v)
+            else:
+                setattr(state, field, v)
+        self.states[widget.id] = state
+
+    def page_selectbox(self):
+        return next(w for (kind, _), w in self.widgets.items() if kind == 'selectbox' and PAGES[0] in w.options)
+
+    async def upload(self, path, http):
+        request_id = uuid.uuid4().hex
+        msg = BackMsg()
+        msg.file_urls_request.request_id = request_id
+        msg.file_urls_request.session_id = self.session_id
+        msg.file_urls_request.file_names.append(os.path.basename(path))
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            reply = await self._read()
+            if reply.HasField('file_urls_response') and reply.file_urls_response.response_id == request_id:
+                urls = reply.file_urls_response.file_urls[0]
+                break
+        with open(path, 'rb') as f:
+            data = f.read()
+        boundary = uuid.uuid4().hex
+        body = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{os.path.basename(path)}"\r\n'
+                f'Content-Type: text/csv\r\n\r\n').encode() + data + f'\r\n--{boundary}--\r\n'.encode()
+        await http.fetch(HTTPRequest(self.url + urls.upload_url, method='PUT', body=body, request_timeout=RERUN_TIMEOUT,
+                                     headers={'Content-Type': f'multipart/form-data; boundary={boundary}'}))
+        uploader = self.widgets[('file_uploader', 'main_file')]
+        state = WidgetState(id=uploader.id)
+        info = state.file_uploader_state_value.uploaded_file_info.add()
+        info.file_id, info.name, info.size = urls.file_id, os.path.basename(path), len(data)
+        info.file_urls.CopyFrom(urls)
+        self.states[uploader.id] = state
+        await self.rerun('upload')
+        # Count the transfer in the upload latency
+        self.latencies[-1] = ('upload', time.perf_counter() - start)
+
+
+async def run_session(url, index, path, iterations, pages, delay, seed):
+    rng = random.Random(seed + index)
+    session = Session(url, f"session-{index}")
+    await asyncio.sleep(delay)
+    try:
+        await session.connect()
+        await session.rerun('open')
+        await session.upload(path, AsyncHTTPClient())
+        # The profiler toggle renders once data is loaded; its ingest spans measure cache thrash
+        session.set_widget('checkbox', "Profile this page", bool_value=True)
+        for _ in range(iterations):
+            page = session.page_selectbox()
+            session.states[page.id] = WidgetState(id=page.id, int_value=list(page.options).index(rng.choice(pages)))
+            await session.rerun('switch page')
+            campaigns = session.widgets[('multiselect', "🎯 Select Campaign")]
+            picked = rng.sample(range(len(campaigns.options)), max(1, len(campaigns.options) // 2))
+            session.set_widget('multiselect', "🎯 Select Campaign", int_array_value=sorted(picked))
+            await session.rerun('filter')
+            top_n = session.widgets[('selectbox', "📊 Top N for Charts")]
+            session.set_widget('selectbox', "📊 Top N for Charts", int_value=rng.randrange(len(top_n.options)))
+            await session.rerun('top N')
+    except Exception as e:
+        session.errors.append(f"{type(e).__name__}: {e}")
+    finally:
+        if session.ws is not None:
+            session.ws.close()
+    return session
+
+
+def rss_mib(pid):
+    """Resident memory of a process and its children (forecast workers), from /proc."""
+    total = 0
+    for task in [pid] + _children(pid):
+        try:
+            with open(f'/proc/{task}/status') as f:
+                total += next(int(line.split()[1]) for line in f if line.startswith('VmRSS:'))
+        except (OSError, StopIteration):
+            pass
+    return total / 1024
+
+
+def _children(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            kids = [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+    return kids + [grandchild for kid in kids for grandchild in _children(kid)]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, trace_file):
+    env = dict(os.environ, CAMML_TRACE_FILE=trace_file, CAMML_PROFILE_MEMORY='0')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', APP, '--server.headless=true', f'--server.port={port}',
+         '--server.enableXsrfProtection=false', '--server.maxUploadSize=500', '--browser.gatherUsageStats=false'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.5)
+    server.kill()
+    raise RuntimeError('Streamlit server did not start')
+
+
+def percentiles(values):
+    values = np.asarray(values)
+    return {'count': len(values), 'p50': round(float(np.percentile(values, 50)), 3),
+            'p95': round(float(np.percentile(values, 95)), 3), 'max': round(float(values.max()), 3)}
+
+
+def cold_ingest_seconds(path):
+    start = time.perf_counter()
+    read_campaign_file(path, 'csv')
+    return time.perf_counter() - start
+
+
+def cache_thrash(trace_file, cold_seconds):
+    """Re-ingests among the profiled reruns: ingest spans too slow to be a cache hit."""
+    if not os.path.exists(trace_file):
+        return None
+    with open(trace_file) as f:
+        ingest = [span['Seconds'] for span in map(json.loads, f) if span['Section'] == 'ingest']
+    if not ingest:
+        return None
+    threshold = THRASH_SHARE * cold_seconds
+    reingests = sum(seconds > threshold for seconds in ingest)
+    return {'profiled reruns': len(ingest), 're-ingests': reingests, 'thrash rate': round(reingests / len(ingest), 3),
+            'ingest seconds (total)': round(sum(ingest), 2)}
+
+
+async def warm_up(url):
+    session = Session(url, 'warm-up')
+    await session.connect()
+    await session.rerun('open')
+    session.ws.close()
+
+
+async def run_load(url, paths, args):
+    pages = [page for page in PAGES if args.ai_page or page != "🤖 AI Predictions"]
+    return await asyncio.gather(*[
+        run_session(url, i, paths[i % len(paths)], args.iterations, pages, i * args.ramp, args.seed)
+        for i in range(args.sessions)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=8)
+    parser.add_argument('--rows', type=int, default=50000, help='rows per uploaded file')
+    parser.add_argument('--files', type=int, default=1, help='distinct uploads shared round-robin by the sessions')
+    parser.add_argument('--iterations', type=int, default=5, help='page switch + filter + top N rounds per session')
+    parser.add_argument('--ramp', type=float, default=0.5, help='seconds between session starts')
+    parser.add_argument('--ai-page', action='store_true', help='include AI Predictions in the page rotation')
+    parser.add_argument('--url', help='target a running server instead of starting one')
+    parser.add_argument('--pid', type=int, help='server process id for RSS when using --url')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='write the report as JSON to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = [write_campaign_csv(os.path.join(workdir, f'campaigns_{i}.csv'), args.rows, seed=args.seed + i)
+                 for i in range(args.files)]
+        trace_file = os.path.join(workdir, 'trace.jsonl')
+        server, pid, url = None, args.pid, args.url
+        if url is None:
+            port = free_port()
+            server = start_server(port, trace_file)
+            pid, url = server.pid, f'http://127.0.0.1:{port}'
+        try:
+            # One data-less visit imports the app's modules so they don't count as session memory
+            asyncio.run(warm_up(url))
+            rss_before = rss_mib(pid) if pid else None
+            peak = [rss_before or 0]
+
+            async def sample_rss(done):
+                while not done.is_set():
+                    peak[0] = max(peak[0], rss_mib(pid))
+                    await asyncio.sleep(0.25)
+
+            async def run():
+                done = asyncio.Event()
+                sampler = asyncio.ensure_future(sample_rss(done)) if pid else None
+                sessions = await run_load(url, paths, args)
+                done.set()
+                if sampler is not None:
+                    await sampler
+                return sessions
+
+            start = time.perf_counter()
+            sessions = asyncio.run(run())
+            wall = time.perf_counter() - start
+            rss_after = rss_mib(pid) if pid else None
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+        latencies = [entry for session in sessions for entry in session.latencies]
+        report = {
+            'sessions': args.sessions, 'rows per file': args.rows, 'files': args.files, 'wall seconds': round(wall, 1),
+            'rerun latency': percentiles([seconds for action, seconds in latencies if action != 'upload']),
+            'by action': {action: percentiles([s for a, s in latencies if a == action])
+                          for action in dict.fromkeys(action for action, _ in latencies)},
+            'errors': {session.name: session.errors for session in sessions if session.errors},
+        }
+        if rss_before is not None:
+            report['server RSS MiB'] = {'before': round(rss_before), 'peak': round(peak[0]), 'after': round(rss_after),
+                                        'per session': round((peak[0] - rss_before) / args.sessions, 1)}
+        if args.url is None:
+            report['load_data cache'] = cache_thrash(trace_file, min(map(cold_ingest_seconds, paths)))
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if report['errors']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""Timing and peak-memory benchmarks for CamML Analytics on synthetic data.
+
+    python benchmarks/run_benchmarks.py                          # 100K rows
+    python benchmarks/run_benchmarks.py --rows 1000000 10000000 --out results.json
+    python benchmarks/run_benchmarks.py --baseline results.json  # fail on regressions
+
+Each stage (generate, ingest, filter, every page render, model fits) is run
+once for wall time and once more under tracemalloc for peak Python memory, so
+the tracing overhead never shows up in the timings. Pages are rendered with
+Streamlit's AppTest, with the ingested frame put into session state the way a
+finished upload would. Dashboard Home is also rendered once with cold caches
+and the app's profiler on, and each of its spans (filter, KPI cards, every
+chart's aggregation) is reported as its own 'home:' stage.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Home spans are timed without tracemalloc, which would slow every allocation
+os.environ.setdefault('CAMML_PROFILE_MEMORY', '0')
+
+from camml.synthetic import write_campaign_csv  # noqa: E402
+from camml.ingest import read_campaign_file  # noqa: E402
+from camml.filters import apply_filters  # noqa: E402
+from camml.scoring import fit_open_model  # noqa: E402
+from camml.training import DEFAULT_ROW_BUDGET  # noqa: E402
+from camml import models  # noqa: E402
+from camml.forecasting import daily_open_series, holt_winters_forecast, fit_prophet  # noqa: E402
+
+APP = os.path.join(ROOT, 'app.py')
+PAGES = ["🏠 Dashboard Home", "📊 Compare Quarters", "🤖 AI Predictions", "👑 Boss Dashboard"]
+JOB_TIMEOUT = 1800
+
+
+def measure(fn, memory=True):
+    """(seconds, peak MiB or None, result) for one call of fn."""
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    if not memory:
+        return seconds, None, result
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+def render_page(df, page, wait_for_jobs=False):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP, default_timeout=JOB_TIMEOUT)
+    at.session_state['df'] = df
+    at.run()
+    start = time.perf_counter()
+    [box for box in at.selectbox if page in box.options][0].set_value(page).run()
+    first_render = time.perf_counter() - start
+    # Background model jobs show a progress bar until they finish
+    while wait_for_jobs and at.get('progress') and time.perf_counter() - start < JOB_TIMEOUT:
+        time.sleep(0.5)
+        at.run()
+    if at.exception:
+        raise RuntimeError(f"{page} raised: {at.exception[0].value}")
+    return first_render, time.perf_counter() - start
+
+
+def home_spans(df):
+    """Seconds per profiler span of one cold Dashboard Home render."""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    at = AppTest.from_file(APP, default_timeout=JOB_TIMEOUT)
+    at.session_state['df'] = df
+    at.session_state['profile_hot_path'] = True
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"Dashboard Home raised: {at.exception[0].value}")
+    spans = {}
+    for span in at.session_state['profiler'].spans:
+        if not span['Background']:
+            spans[span['Section']] = spans.get(span['Section'], 0) + span['Seconds']
+    return spans
+
+
+def bench_size(n_rows, workdir, seed=0, skip_prophet=False):
+    results = {}
+
+    def record(stage, fn, memory=True):
+        seconds, peak, result = measure(fn, memory)
+        results[stage] = {'seconds': round(seconds, 4), 'peak_mib': None if peak is None else round(peak, 1)}
+        print(f"  {stage:<32} {seconds:9.3f}s" + ('' if peak is None else f" {peak:9.1f} MiB"), flush=True)
+        return result
+
+    path = os.path.join(workdir, f"campaigns_{n_rows}.csv")
+    record('generate', lambda: write_campaign_csv(path, n_rows, seed=seed))
+    df = record('ingest', lambda: read_campaign_file(path, 'csv'))
+    filtered = record('filter', lambda: apply_filters(
+        df, df['Sent_Year'].dropna().unique(), [1, 2, 3, 4], df['Campaign Name'].unique(),
+        df['Bot Check'].unique(), df['Opend Time Range'].unique()))
+
+    for name, seconds in home_spans(filtered).items():
+        results[f"home: {name}"] = {'seconds': round(seconds, 4), 'peak_mib': None}
+        print(f"  {'home: ' + name:<32} {seconds:9.3f}s", flush=True)
+
+    for page in PAGES:
+        # Page renders are timed only; tracemalloc would also trace the script runner
+        first, total = render_page(filtered, page, wait_for_jobs=page == "🤖 AI Predictions")
+        results[f"page: {page}"] = {'seconds': round(first, 4), 'peak_mib': None}
+        print(f"  {'page: ' + page:<32} {first:9.3f}s", flush=True)
+        if page == "🤖 AI Predictions":
+            results['page: AI Predictions (jobs done)'] = {'seconds': round(total, 4), 'peak_mib': None}
+            print(f"  {'page: AI Predictions (jobs done)':<32} {total:9.3f}s", flush=True)
+
+    record('fit: open model', lambda: fit_open_model(filtered, max_rows=DEFAULT_ROW_BUDGET))
+    record('fit: bot detector', lambda: models.bot_probabilities(filtered, 'Random Forest', DEFAULT_ROW_BUDGET))
+    geo = filtered.dropna(subset=['latitude', 'longitude'])
+    record('fit: geo clusters', lambda: models.geo_clusters(geo[['latitude', 'longitude']]))
+    # The same per-row features the AI Predictions page segments
+    behavior = filtered[['Open Count', 'Click Count', 'Response_Time']].fillna(0)
+    record('fit: behavior segments', lambda: models.behavior_segments(behavior))
+    series = daily_open_series(filtered)
+    record('forecast: holt-winters', lambda: holt_winters_forecast(series))
+    if not skip_prophet:
+        record('forecast: prophet', lambda: fit_prophet(series), memory=False)
+    os.remove(path)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Stages that got slower (or hungrier) than the baseline by more than tolerance."""
+    regressions = []
+    for size, stages in results.items():
+        for stage, now in stages.items():
+            before = baseline.get(size, {}).get(stage)
+            if before is None:
+                continue
+            for metric in ['seconds', 'peak_mib']:
+                if now[metric] is not None and before.get(metric) and now[metric] > before[metric] * (1 + tolerance):
+                    regressions.append(f"{size} rows, {stage}: {metric} {before[metric]} -> {now[metric]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='write results as JSON to this file')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown before failing (0.25 = 25%%)')
+    parser.add_argument('--skip-prophet', action='store_true')
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in args.rows:
+            print(f"{n_rows:,} rows", flush=True)
+            results[str(n_rows)] = bench_size(n_rows, workdir, args.seed, args.skip_prophet)
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Data and model helpers for the CamML Analytics Streamlit app (app.py)."""
@@ -0,0 +1,78 @@
+"""Account (Website) rollup and engagement score.
+
+Measures are summed per website and sidebar filter cell once per dataset, so a
+filter selection only adds up the selected cells per website with bincount.
+Unique leads are not additive across cells, so the distinct (website, lead)
+pairs of each cell are kept as integer keys and de-duplicated per query.
+"""
+import numpy as np
+import pandas as pd
+
+from camml.counting import event_flags, group_counts
+from camml.filters import FILTER_COLUMNS, validity_mask
+
+MEASURES = ['Sends', 'Opens', 'Clicks', 'HE', 'LE', 'NO', 'Replies', 'Positive Replies']
+# Weight of each per-send rate in the engagement score
+SCORE_WEIGHTS = {'Opens': 1.0, 'Clicks': 2.0, 'HE': 2.0, 'Replies': 4.0, 'Positive Replies': 6.0}
+# Rates are shrunk toward the overall rate as if each account had this many extra average sends
+PRIOR_SENDS = 20
+
+
+def engagement_score(accounts, weights=SCORE_WEIGHTS, prior_sends=PRIOR_SENDS):
+    """0-100 score per account: the weighted mean of its per-send rates, each
+    smoothed toward the rate over all accounts so small accounts do not top
+    the list on a handful of sends."""
+    sends = accounts['Sends'].to_numpy(dtype=np.float64)
+    total_sends = max(sends.sum(), 1.0)
+    score = np.zeros(len(accounts))
+    for measure, weight in weights.items():
+        counts = accounts[measure].to_numpy(dtype=np.float64)
+        overall = counts.sum() / total_sends
+        score += weight * (counts + prior_sends * overall) / (sends + prior_sends)
+    return 100 * score / sum(weights.values())
+
+
+class AccountRollup:
+    def __init__(self, df):
+        websites = df['Website'].astype('category')  # a no-op for the column interned at ingest
+        self.websites = websites.cat.categories
+        self.valid = validity_mask(pd.Series(self.websites))
+        website = websites.cat.codes.to_numpy().astype(np.int64)
+        cell = df.groupby(FILTER_COLUMNS, dropna=False, sort=False, observed=True).ngroup().to_numpy()
+        first = np.unique(cell, return_index=True)[1]
+        self.cells = df[FILTER_COLUMNS].iloc[first].reset_index(drop=True)
+
+        # Measures per (website, cell) pair that occurs in the data
+        n_cells = len(first)
+        pair_codes = np.full(len(df), -1, dtype=np.int64)
+        pair_codes[website >= 0], pairs = pd.factorize((website * n_cells + cell)[website >= 0])
+        self.cube = pd.DataFrame(group_counts(pair_codes, len(pairs), event_flags(df, MEASURES)), columns=MEASURES)
+        self.cube['website'], self.cube['cell'] = np.divmod(pairs, n_cells)
+
+        lead = df['Lead Email'].astype('category').cat.codes.to_numpy().astype(np.int64)
+        known = (website >= 0) & (lead >= 0)
+        pairs = pd.DataFrame({'pair': website[known] << 32 | lead[known], 'cell': cell[known]}).drop_duplicates()
+        self.pair_keys = pairs['pair'].to_numpy()
+        self.pair_cells = pairs['cell'].to_numpy()
+
+    def query(self, years=None, quarters=None, campaigns=None, bot_checks=None, time_ranges=None, exclude_invalid=False):
+        """One row per website with sends in the selection: its measures, unique
+        leads and engagement score. None leaves a filter column unrestricted."""
+        selected = np.ones(len(self.cells), dtype=bool)
+        for col, values in zip(FILTER_COLUMNS, [years, quarters, campaigns, bot_checks, time_ranges]):
+            if values is not None:
+                selected &= self.cells[col].isin(values).to_numpy()
+        n = len(self.websites)
+        cube = self.cube[selected[self.cube['cell'].to_numpy()]]
+        website = cube['website'].to_numpy()
+        accounts = pd.DataFrame({'Website': self.websites})
+        for measure in MEASURES:
+            accounts[measure] = np.bincount(website, weights=cube[measure].to_numpy(), minlength=n).astype(np.int64)
+        pairs = np.unique(self.pair_keys[selected[self.pair_cells]])
+        accounts['Unique Leads'] = np.bincount(pairs >> 32, minlength=n)
+        keep = accounts['Sends'].to_numpy() > 0
+        if exclude_invalid:
+            keep &= self.valid
+        accounts = accounts[keep].reset_index(drop=True)
+        accounts['Engagement Score'] = engagement_score(accounts).round(1)
+        return accounts[['Website', 'Engagement Score', 'Sends', 'Unique Leads'] + MEASURES[1:]]
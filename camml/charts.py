@@ -0,0 +1,85 @@
+"""The dashboard's Plotly theme, top-N grouping and a cache of built chart figures."""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import plotly.graph_objects as go
+
+THEME = 'camml_dark'
+# 'All' in the Top N selector shows this many groups, the rest go into Others
+MAX_CHART_GROUPS = 50
+OTHERS = 'Others'
+
+
+def use_theme():
+    """Register the dark dashboard template and layer it over the current default.
+
+    Streamlit sets its own template as the default when it is imported, so this
+    runs after that and composes the two ("streamlit+camml_dark").
+    """
+    if THEME not in pio.templates:
+        pio.templates[THEME] = go.layout.Template(layout=dict(
+            font=dict(color='white'),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            title=dict(font=dict(size=18), x=0.5),
+        ))
+    if THEME not in pio.templates.default.split('+'):
+        pio.templates.default = f"{pio.templates.default}+{THEME}"
+
+
+def top_n_with_others(totals, n, others=OTHERS):
+    """The n largest group totals of a Series plus one Others entry for the rest.
+
+    Picks the top n by partial selection (argpartition) rather than sorting every
+    group. Returns a frame of group, total and 'Share (%)' of the grand total,
+    largest first with Others last.
+    """
+    values = totals.to_numpy()
+    if len(values) > n:
+        top = np.argpartition(-values, n - 1)[:n]
+    else:
+        top = np.arange(len(values))
+    top = top[np.argsort(-values[top], kind='stable')]
+    shown = totals.iloc[top]
+    if len(values) > n:
+        shown = pd.concat([shown, pd.Series([values.sum() - values[top].sum()], index=[others])])
+    frame = shown.rename_axis(totals.index.name or 'Group').reset_index(name=totals.name or 'Count')
+    grand_total = values.sum()
+    frame['Share (%)'] = (100 * frame.iloc[:, 1] / grand_total).round(1) if grand_total else 0.0
+    return frame
+
+
+def ranked_groups(totals):
+    """Every group total, largest first, with its rank and share, for the tables behind top-N charts."""
+    frame = top_n_with_others(totals, len(totals))
+    frame.insert(0, 'Rank', np.arange(1, len(frame) + 1))
+    return frame
+
+
+class FigureCache:
+    """Built figures (and the aggregates behind them) keyed by (chart, filter
+    fingerprint), least-recently-used evicted beyond max_entries.
+
+    Figures are shared between reruns and sessions, so builders must return a
+    finished figure and callers must not modify it afterwards.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                return self._figures[key]
+        figure = build()
+        with self._lock:
+            self._figures[key] = figure
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return figure
@@ -0,0 +1,79 @@
+"""Lead cohorts by first-send month and how their engagement decays with each
+further send and with the weeks since their first send.
+
+Rows are sorted once by (lead, sent time). In that order each lead's sends are
+contiguous, so a send's sequence number is its offset from the start of the
+lead's run and its elapsed time is measured from the run's first send; no
+per-lead group-by is needed.
+"""
+import numpy as np
+import pandas as pd
+
+from camml.counting import event_flags, group_counts
+
+AXES = {'Send Number': 'sequence', 'Weeks Since First Send': 'weeks'}
+MAX_SEQUENCE = 20  # send numbers beyond this are pooled into the last column
+MAX_WEEKS = 52
+COHORT_MEASURES = ['Sends', 'Opens', 'Clicks', 'Replies']
+RATES = {'Open Rate (%)': 'Opens', 'Click Rate (%)': 'Clicks', 'Reply Rate (%)': 'Replies'}
+MIN_CELL_SENDS = 20
+WEEK = np.timedelta64(7, 'D')
+
+
+def cohort_counts(df, axis='Send Number'):
+    """(cohorts, sizes, counts): the first-send months, the leads in each, and
+    counts[cohort, step, measure] of COHORT_MEASURES, where step is the send
+    number (1-based) or the weeks since the lead's first send."""
+    leads = df['Lead Email'].astype('category').cat.codes.to_numpy()
+    sent = pd.to_datetime(df['Sent_Date']).to_numpy()
+    known = (leads >= 0) & ~np.isnat(sent)
+    leads, sent = leads[known], sent[known]
+    flags = event_flags(df, COHORT_MEASURES)[known]
+
+    steps = (MAX_SEQUENCE if AXES[axis] == 'sequence' else MAX_WEEKS) + 1
+    if len(leads) == 0:
+        return pd.Index([], dtype=object), np.zeros(0, dtype=np.int64), np.zeros((0, steps, flags.shape[1]), dtype=np.int64)
+
+    order = np.lexsort((sent, leads))
+    leads, sent, flags = leads[order], sent[order], flags[order]
+    starts = np.flatnonzero(np.r_[True, leads[1:] != leads[:-1]])
+    run = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(leads)]))
+    first_sent = sent[starts][run]
+
+    if AXES[axis] == 'sequence':
+        step = np.minimum(np.arange(len(leads)) - starts[run] + 1, MAX_SEQUENCE)
+    else:
+        step = np.minimum((sent - first_sent) // WEEK, MAX_WEEKS)
+
+    cohort_codes, cohorts = pd.factorize(pd.PeriodIndex(first_sent, freq='M'), sort=True)
+    counts = group_counts(cohort_codes * steps + step, len(cohorts) * steps, flags).reshape(len(cohorts), steps, -1)
+    sizes = np.bincount(cohort_codes[starts], minlength=len(cohorts))
+    return cohorts.astype(str), sizes, counts
+
+
+def cohort_rates(cohorts, counts, rate, axis='Send Number', min_sends=MIN_CELL_SENDS):
+    """Cohorts x steps frame of one RATES entry; cells with fewer than min_sends sends are blank."""
+    sends = counts[..., COHORT_MEASURES.index('Sends')]
+    events = counts[..., COHORT_MEASURES.index(RATES[rate])]
+    values = np.where(sends >= min_sends, 100 * events / np.maximum(sends, 1), np.nan)
+    if AXES[axis] == 'sequence':
+        columns = [str(step) for step in range(counts.shape[1])]
+        columns[-1] = f"{MAX_SEQUENCE}+"
+    else:
+        columns = [f"W{step}" for step in range(counts.shape[1])]
+        columns[-1] = f"W{MAX_WEEKS}+"
+    frame = pd.DataFrame(values, index=pd.Index(cohorts, name='Cohort'), columns=columns)
+    if AXES[axis] == 'sequence':
+        frame = frame.iloc[:, 1:]  # send numbers start at 1
+    return frame.dropna(axis=1, how='all')
+
+
+def decay_curve(counts, rate, axis='Send Number'):
+    """The rate per step over all cohorts together."""
+    totals = counts.sum(axis=0)
+    sends = totals[:, COHORT_MEASURES.index('Sends')]
+    values = np.where(sends > 0, 100 * totals[:, COHORT_MEASURES.index(RATES[rate])] / np.maximum(sends, 1), np.nan)
+    curve = pd.DataFrame({axis: np.arange(len(values)), rate: values, 'Sends': sends})
+    if AXES[axis] == 'sequence':
+        curve = curve.iloc[1:]
+    return curve[curve['Sends'] > 0].reset_index(drop=True)
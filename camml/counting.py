@@ -0,0 +1,41 @@
+"""Counting flagged events per group in one pass.
+
+Each row gets a flag per event (sent, opened, clicked, ...) and an integer
+group code; every (group, event) pair is one slot of a flat array, so all
+groups and events are counted by a single bincount.
+"""
+import numpy as np
+
+# Event -> row flag; 'Sends' flags every row
+EVENTS = {
+    'Sends': lambda df: np.ones(len(df), dtype=bool),
+    'Opens': lambda df: (df['Open Count'] > 0).to_numpy(),
+    'Clicks': lambda df: (df['Click Count'] > 0).to_numpy(),
+    'Replies': lambda df: df['Has_Reply'].to_numpy(dtype=bool),
+    'Positive Replies': lambda df: df['Positive_Reply'].to_numpy(dtype=bool),
+    'Unsubscribes': lambda df: df['Is_Unsubscribed'].to_numpy(dtype=bool),
+}
+ENGAGEMENT_LEVELS = ['HE', 'LE', 'NO']
+
+
+def event_flags(df, events):
+    """Rows x events boolean matrix of EVENTS entries or Engagement levels."""
+    columns = []
+    engagement = None
+    for event in events:
+        if event in ENGAGEMENT_LEVELS:
+            if engagement is None:
+                engagement = df['Engagement'].astype(str).str.strip().str.upper()
+            columns.append((engagement == event).to_numpy())
+        else:
+            columns.append(EVENTS[event](df))
+    return np.column_stack(columns) if columns else np.zeros((len(df), 0), dtype=bool)
+
+
+def group_counts(codes, n_groups, flags):
+    """counts[g, e]: the rows of group g (codes; -1 for none) with flag e set."""
+    codes = np.asarray(codes, dtype=np.int64)
+    known = codes >= 0
+    width = flags.shape[1]
+    slots = (codes[known, None] * width + np.arange(width))[flags[known]]
+    return np.bincount(slots, minlength=n_groups * width).reshape(n_groups, width)
@@ -0,0 +1,117 @@
+"""Parsing the export's date columns.
+
+A column's format is detected from a sample of its distinct values and
+remembered per source (the upload's fingerprint and the column), so reading
+the same export again skips detection. Only the distinct strings are parsed
+(exports repeat the same send timestamps across thousands of leads) before
+being mapped back to the rows. Values the format does not fit fall back to
+pandas' per-element parser, and whatever is still unparseable is reported.
+"""
+import os
+import hashlib
+from collections import OrderedDict
+
+import pandas as pd
+
+# Tried in order; month-first before day-first, as pandas assumes
+DATE_FORMATS = [
+    'ISO8601',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y %I:%M %p',
+    '%m/%d/%Y',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%d/%m/%Y',
+    '%d.%m.%Y %H:%M:%S',
+    '%d.%m.%Y %H:%M',
+    '%d.%m.%Y',
+    '%d-%b-%Y %H:%M:%S',
+    '%d-%b-%Y',
+    '%b %d, %Y %I:%M %p',
+    '%b %d, %Y',
+]
+SAMPLE_SIZE = 500
+MAX_EXAMPLES = 5
+MAX_REMEMBERED = 32
+FINGERPRINT_BYTES = 64 * 1024
+
+# (source fingerprint, column) -> detected format, least recently used first
+_formats = OrderedDict()
+
+
+def source_fingerprint(file):
+    """Cheap identity of an uploaded file or path: its name, size and a hash of
+    its first block, so the same export read again maps to the same key."""
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as handle:
+            head = handle.read(FINGERPRINT_BYTES)
+        size = os.path.getsize(file)
+    else:
+        position = file.tell()
+        head = file.read(FINGERPRINT_BYTES)
+        file.seek(position)
+        size = getattr(file, 'size', None)
+    digest = hashlib.blake2b(head, digest_size=16).hexdigest()
+    return (str(getattr(file, 'name', file)), size, digest)
+
+
+def remembered_format(key, detect):
+    """The format remembered for key, else detect() remembered under it."""
+    if key in _formats:
+        _formats.move_to_end(key)
+        return _formats[key]
+    fmt = _formats[key] = detect()
+    if len(_formats) > MAX_REMEMBERED:
+        _formats.popitem(last=False)
+    return fmt
+
+
+def detect_format(values, formats=DATE_FORMATS):
+    """The first format parsing every sampled value, else the one parsing the
+    most, or None when no format fits any of them."""
+    sample = pd.Series(values[:SAMPLE_SIZE], dtype=object)
+    best, best_parsed = None, 0
+    for fmt in formats:
+        parsed = int(pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum())
+        if parsed == len(sample):
+            return fmt
+        if parsed > best_parsed:
+            best, best_parsed = fmt, parsed
+    return best
+
+
+def parse_dates(values, source=None):
+    """(parsed, format, failures, examples): the values as datetimes, the format
+    used, the number of non-missing rows left unparsed and a few of their
+    distinct raw values. The format is remembered under (source, column) when a
+    source fingerprint is given.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values, None, 0, []
+    codes, uniques = pd.factorize(values)
+    if len(uniques) == 0:
+        return pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]'), None, 0, []
+    uniques = pd.Series(uniques, dtype=object)
+    stripped = uniques.str.strip() if uniques.map(type).eq(str).any() else uniques
+    uniques = stripped.where(stripped.notna(), uniques)  # non-string values stay as they are
+
+    if source is None:
+        fmt = detect_format(uniques)
+    else:
+        fmt = remembered_format((source, values.name), lambda: detect_format(uniques))
+
+    if fmt is not None:
+        parsed = pd.to_datetime(uniques, format=fmt, errors='coerce')
+    else:
+        parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+    # Values off the detected format (mixed inputs) go through the per-element parser
+    missed = parsed.isna()
+    if missed.any():
+        parsed[missed] = pd.to_datetime(uniques[missed], format='mixed', errors='coerce')
+    failed = parsed.isna().to_numpy()
+
+    rows = pd.Index(parsed).take(codes, allow_fill=True, fill_value=pd.NaT)
+    failures = int(failed[codes[codes >= 0]].sum())
+    examples = [str(value) for value in uniques[failed][:MAX_EXAMPLES]]
+    return pd.Series(rows, index=values.index, name=values.name), fmt, failures, examples
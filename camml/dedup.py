@@ -0,0 +1,78 @@
+"""Duplicate removal while an upload streams in, for exports merged from
+several ESP pulls.
+
+Rows are identified by a 64-bit hash of their key columns. Across chunks only
+one entry per distinct key is kept (its hash, the completeness of the best
+record so far and that record's row number, 20 bytes) in a few levels of
+arrays sorted by hash. Each chunk's new keys become a level of their own and a
+level is merged into the one before it once it has grown as large, so every
+key is re-sorted only a logarithmic number of times instead of the whole seen
+state being copied for every chunk.
+"""
+import numpy as np
+import pandas as pd
+
+DEDUP_KEY = ['Lead Email', 'Campaign Name', 'Sent_Date']
+# Columns offered as dedup key parts in the sidebar
+KEY_OPTIONS = ['Lead Email', 'Campaign Name', 'Sent_Date', 'Opened Time', 'Website', 'Status']
+
+
+class StreamingDeduplicator:
+    def __init__(self, key=DEDUP_KEY):
+        self.key = list(key)
+        # Levels of (hashes, scores, rows): sorted distinct key hashes, the
+        # non-missing fields of the record kept for each and its row number;
+        # no hash appears in more than one level
+        self.levels = []
+        self.losers = []  # row numbers of the duplicates to drop, per chunk
+
+    def add_chunk(self, chunk):
+        """Merge the keys of one chunk (indexed by row number) into the seen keys.
+
+        Rows missing part of the key are never treated as duplicates.
+        """
+        key = [col for col in self.key if col in chunk.columns]
+        if not key:
+            return chunk
+        positions = np.flatnonzero(chunk[key].notna().all(axis=1).to_numpy())
+        hashes = pd.util.hash_pandas_object(chunk[key], index=False, categorize=False).to_numpy()[positions]
+        rows = chunk.index.to_numpy(dtype=np.int64)[positions]
+        # Every keyed row is scored, since a key seen once here may repeat in a later chunk
+        scores = chunk.notna().sum(axis=1).to_numpy(dtype=np.int32)[positions]
+
+        # Best record per key within the chunk: most complete, then earliest
+        order = np.lexsort((rows, -scores, hashes))
+        hashes, rows, scores = hashes[order], rows[order], scores[order]
+        first = np.r_[True, hashes[1:] != hashes[:-1]]
+        losers = [rows[~first]]
+        hashes, rows, scores = hashes[first], rows[first], scores[first]
+
+        # Against the earlier chunks: a later record replaces the kept one only if it is more complete
+        seen = np.zeros(len(hashes), dtype=bool)
+        for level_hashes, level_scores, level_rows in self.levels:
+            pos = np.searchsorted(level_hashes, hashes)
+            found = pos < len(level_hashes)
+            found[found] = level_hashes[pos[found]] == hashes[found]
+            better = found.copy()
+            better[found] = scores[found] > level_scores[pos[found]]
+            losers += [level_rows[pos[better]], rows[found & ~better]]
+            level_scores[pos[better]] = scores[better]
+            level_rows[pos[better]] = rows[better]
+            seen |= found
+        new = ~seen
+        self.levels.append((hashes[new], scores[new], rows[new]))
+        while len(self.levels) > 1 and len(self.levels[-1][0]) >= len(self.levels[-2][0]):
+            merged = [np.concatenate(parts) for parts in zip(self.levels.pop(-2), self.levels.pop())]
+            order = np.argsort(merged[0], kind='stable')
+            self.levels.append(tuple(part[order] for part in merged))
+        self.losers.append(np.concatenate(losers))
+        return chunk
+
+    @property
+    def dropped(self):
+        return sum(len(losers) for losers in self.losers)
+
+    def keep(self, chunks):
+        """The chunks without the duplicates that lost to a more complete or earlier record."""
+        losers = np.concatenate(self.losers) if self.losers else np.empty(0, dtype=np.int64)
+        return [chunk[~chunk.index.isin(losers)] for chunk in chunks]
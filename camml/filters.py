@@ -0,0 +1,38 @@
+"""The sidebar slicers applied to the loaded campaign data."""
+import hashlib
+
+import pandas as pd
+
+# Placeholder values hidden by "Exclude Invalid Entries"
+INVALID_TOKENS = ['', '0', '--', 'Unknown']
+# Columns flagged at ingest with a Valid_<column> mask of the rows holding a real value
+VALIDITY_COLUMNS = ['City', 'State', 'Traffic', 'Website']
+# Columns the sidebar slicers select on, in apply_filters' argument order
+FILTER_COLUMNS = ['Sent_Year', 'Quarter', 'Campaign Name', 'Bot Check', 'Opend Time Range']
+
+
+def apply_filters(df, years, quarters, campaigns, bot_checks, time_ranges):
+    """Rows matching every sidebar selection (quarters as numbers 1-4)."""
+    return df[
+        (df['Sent_Year'].isin(years)) &
+        (df['Quarter'].isin(quarters)) &
+        (df['Campaign Name'].isin(campaigns)) &
+        (df['Bot Check'].isin(bot_checks)) &
+        (df['Opend Time Range'].isin(time_ranges))
+    ].copy()
+
+
+def validity_mask(values, invalid_tokens=INVALID_TOKENS):
+    """True where a value is neither missing nor one of the invalid tokens.
+
+    Each distinct value is compared once (as text, so a numeric 0 counts as '0')
+    and the result is spread back to the rows.
+    """
+    codes, uniques = pd.factorize(values)
+    valid = ~pd.Index(uniques).astype(str).isin(invalid_tokens)
+    return (codes >= 0) & valid[codes]
+
+
+def filter_fingerprint(dataset_fingerprint, *selections):
+    """Short stable key for a dataset and the selections applied to it."""
+    return hashlib.blake2b(repr((dataset_fingerprint, selections)).encode(), digest_size=16).hexdigest()
@@ -0,0 +1,247 @@
+"""Forecasts of daily opens: a fast Holt-Winters forecaster, and Prophet fits
+cached per series and fitted in parallel per campaign."""
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+MIN_FORECAST_POINTS = 10
+FORECAST_DAYS = 30
+SEASON_DAYS = 7
+BACKTEST_DAYS = 14
+# z for an 80% interval, the width Prophet uses by default
+INTERVAL_Z = 1.2816
+# Smoothing parameter grid searched by the fast forecaster (alpha, beta, gamma)
+HW_ALPHAS = np.array([0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9])
+HW_BETAS = np.array([0.0, 0.01, 0.05, 0.1, 0.2])
+HW_GAMMAS = np.array([0.01, 0.05, 0.1, 0.3, 0.5])
+
+
+def daily_open_series(df, by=None):
+    """Opens (rows with Open Count > 0) per sent day, as a ds/y frame.
+
+    With ``by`` set, returns a dict of such frames keyed by that column's values.
+    """
+    opened = df[df['Open Count'] > 0]
+    days = pd.to_datetime(opened['Sent_Date']).dt.normalize().rename('ds')
+    if by is None:
+        return opened.groupby(days).size().reset_index(name='y')
+    counts = opened.groupby([opened[by], days], observed=True).size().rename('y').reset_index()
+    return {name: group[['ds', 'y']].reset_index(drop=True) for name, group in counts.groupby(by, observed=True)}
+
+
+def series_fingerprint(series):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(series['ds'].to_numpy('datetime64[ns]').tobytes())
+    digest.update(series['y'].to_numpy('float64').tobytes())
+    return digest.hexdigest()
+
+
+def series_set_fingerprint(series_by_name):
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(series_by_name, key=str):
+        digest.update(f"{name}:{series_fingerprint(series_by_name[name])};".encode())
+    return digest.hexdigest()
+
+
+def holt_winters_forecast(series, horizon=FORECAST_DAYS, season=SEASON_DAYS):
+    """Additive Holt-Winters forecast with weekly seasonality, in the same
+    ds/yhat/yhat_lower/yhat_upper shape as the Prophet forecast.
+
+    Days without sends are filled with zero opens. Every (alpha, beta, gamma)
+    in the grid is run in a single pass over the series as one vector, and the
+    combination with the lowest one-step-ahead squared error is kept.
+    Returns None for series shorter than the forecasting minimum.
+    """
+    if len(series) < MIN_FORECAST_POINTS:
+        return None
+    days = pd.date_range(series['ds'].min(), series['ds'].max(), freq='D')
+    y = series.set_index('ds')['y'].reindex(days, fill_value=0).to_numpy(dtype=float)
+    n = len(y)
+
+    alpha, beta, gamma = (grid.ravel() for grid in np.meshgrid(HW_ALPHAS, HW_BETAS, HW_GAMMAS, indexing='ij'))
+    level = np.full(alpha.shape, y[:season].mean())
+    trend = np.full(alpha.shape, (y[season:2 * season].mean() - y[:season].mean()) / season if n >= 2 * season else 0.0)
+    seasonal = np.tile(y[:season] - y[:season].mean(), (len(alpha), 1))
+    fitted = np.empty((len(alpha), n))
+    for t in range(n):
+        s = t % season
+        fitted[:, t] = level + trend + seasonal[:, s]
+        new_level = alpha * (y[t] - seasonal[:, s]) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        seasonal[:, s] = gamma * (y[t] - new_level) + (1 - gamma) * seasonal[:, s]
+        level = new_level
+
+    errors = y - fitted
+    best = np.argmin((errors ** 2).sum(axis=1))
+    a, b, g = alpha[best], beta[best], gamma[best]
+    steps = np.arange(1, horizon + 1)
+    future = level[best] + steps * trend[best] + seasonal[best, (n + steps - 1) % season]
+    # Forecast variance grows with the horizon: sigma^2 * (1 + sum of squared smoothing weights)
+    sigma = errors[best].std()
+    weights = a * (1 + np.arange(1, horizon) * b) + g * (np.arange(1, horizon) % season == 0)
+    spread = INTERVAL_Z * sigma * np.sqrt(1 + np.concatenate([[0.0], np.cumsum(weights ** 2)]))
+
+    yhat = np.concatenate([fitted[best], future])
+    band = np.concatenate([np.full(n, INTERVAL_Z * sigma), spread])
+    return pd.DataFrame({
+        'ds': pd.date_range(days[0], periods=n + horizon, freq='D'),
+        'yhat': yhat,
+        'yhat_lower': np.maximum(yhat - band, 0),
+        'yhat_upper': yhat + band,
+    })
+
+
+def backtest_forecasters(series, holdout=BACKTEST_DAYS, job=None):
+    """Hold out the last days of the series, fit both forecasters on the rest
+    and compare their errors on the held-out days."""
+    cutoff = series['ds'].max() - pd.Timedelta(days=holdout)
+    train, test = series[series['ds'] <= cutoff], series[series['ds'] > cutoff]
+    if len(train) < MIN_FORECAST_POINTS or test.empty:
+        return None
+    rows = []
+    for name in ['Holt-Winters (fast)', 'Prophet']:
+        if job is not None:
+            job.report(0.1 if name == 'Prophet' else 0.0, f'Backtesting {name}')
+        start = time.perf_counter()
+        forecast = holt_winters_forecast(train, horizon=holdout) if name != 'Prophet' else fit_prophet(train, periods=holdout)[0]
+        fit_seconds = time.perf_counter() - start
+        predicted = test.merge(forecast, on='ds', how='left')['yhat'].fillna(0).to_numpy()
+        actual = test['y'].to_numpy(dtype=float)
+        denominator = np.abs(actual) + np.abs(predicted)
+        rows.append({
+            'Forecaster': name,
+            'MAE': np.abs(actual - predicted).mean(),
+            'sMAPE (%)': 200 * np.mean(np.divide(np.abs(actual - predicted), denominator,
+                                                 out=np.zeros_like(actual), where=denominator > 0)),
+            'Fit Seconds': fit_seconds,
+        })
+    return pd.DataFrame(rows)
+
+
+def _warm_start_params(model):
+    # Prophet's documented warm start: reuse the previous fit's parameters as
+    # initial values for the optimizer
+    params = {name: model.params[name][0][0] for name in ['k', 'm', 'sigma_obs']}
+    params.update({name: model.params[name][0] for name in ['delta', 'beta']})
+    return params
+
+
+def fit_prophet(series, init=None, periods=FORECAST_DAYS):
+    """Fit Prophet on a ds/y series and forecast 30 days ahead.
+
+    Returns (forecast, warm start params for the next fit). A warm start whose
+    shapes no longer match the model is dropped in favour of a cold fit.
+    """
+    from prophet import Prophet
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+
+    def new_model():
+        return Prophet(yearly_seasonality=True, weekly_seasonality=True, daily_seasonality=False)
+
+    model_prophet = new_model()
+    try:
+        model_prophet.fit(series, init=init) if init is not None else model_prophet.fit(series)
+    except Exception:
+        if init is None:
+            raise
+        model_prophet = new_model()
+        model_prophet.fit(series)
+    future = model_prophet.make_future_dataframe(periods=periods)
+    forecast = model_prophet.predict(future)[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+    return forecast, _warm_start_params(model_prophet)
+
+
+def _fit_named_series(name, series, init):
+    forecast, params = fit_prophet(series, init)
+    return name, forecast, params
+
+
+class ForecastCache:
+    """Forecasts keyed by a fingerprint of the daily series they were fitted on.
+
+    Alongside the LRU of forecasts it keeps the last fit for each named series
+    (the combined series or a campaign). When a new series only appends days to
+    that fit's series, the refit is warm-started from its parameters.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._forecasts = OrderedDict()
+        self._last_fit = {}
+        self._lock = threading.Lock()
+
+    def cached(self, series):
+        with self._lock:
+            key = series_fingerprint(series)
+            if key in self._forecasts:
+                self._forecasts.move_to_end(key)
+                return self._forecasts[key]
+        return None
+
+    def warm_start(self, name, series):
+        with self._lock:
+            last = self._last_fit.get(name)
+        if last is None:
+            return None
+        last_series, params = last
+        n = len(last_series)
+        if len(series) > n and series['ds'].iloc[:n].equals(last_series['ds']) and np.array_equal(
+                series['y'].iloc[:n].to_numpy(), last_series['y'].to_numpy()):
+            return params
+        return None
+
+    def store(self, name, series, forecast, params):
+        with self._lock:
+            self._forecasts[series_fingerprint(series)] = forecast
+            while len(self._forecasts) > self.max_entries:
+                self._forecasts.popitem(last=False)
+            self._last_fit[name] = (series, params)
+
+    def forecast(self, series, name='All campaigns', job=None):
+        """Cached 30-day forecast for one series, or None if it is too short."""
+        if len(series) < MIN_FORECAST_POINTS:
+            return None
+        forecast = self.cached(series)
+        if forecast is not None:
+            return forecast
+        init = self.warm_start(name, series)
+        if job is not None:
+            job.report(0.1, 'Warm-starting Prophet' if init is not None else 'Fitting Prophet')
+        forecast, params = fit_prophet(series, init)
+        self.store(name, series, forecast, params)
+        return forecast
+
+    def forecast_many(self, series_by_name, max_workers=-1, job=None):
+        """Forecast several named series, fitting the uncached ones in parallel processes.
+
+        Series shorter than the minimum are skipped. Returns {name: forecast}.
+        """
+        results, to_fit = {}, {}
+        for name, series in series_by_name.items():
+            if len(series) < MIN_FORECAST_POINTS:
+                continue
+            forecast = self.cached(series)
+            if forecast is not None:
+                results[name] = forecast
+            else:
+                to_fit[name] = series
+        if not to_fit:
+            return results
+        # loky worker processes neither fork the server's threads nor re-run
+        # the Streamlit script as __main__, and stay warm between calls
+        fits = Parallel(n_jobs=max_workers, backend='loky', return_as='generator_unordered')(
+            delayed(_fit_named_series)(name, series, self.warm_start(name, series))
+            for name, series in to_fit.items()
+        )
+        for done, (name, forecast, params) in enumerate(fits, start=1):
+            self.store(name, to_fit[name], forecast, params)
+            results[name] = forecast
+            if job is not None:
+                job.report(done / len(to_fit), f"Fitted {done} of {len(to_fit)} campaigns")
+        return results
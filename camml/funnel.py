@@ -0,0 +1,35 @@
+"""Per-campaign conversion funnel: sent, opened, clicked, replied and positive
+reply, with unsubscribes as the leak."""
+import numpy as np
+import pandas as pd
+
+from camml.counting import event_flags, group_counts
+
+STAGES = ['Sent', 'Opened', 'Clicked', 'Replied', 'Positive Reply']
+LEAK = 'Unsubscribed'
+# The camml.counting event behind each stage and the leak
+STAGE_EVENTS = ['Sends', 'Opens', 'Clicks', 'Replies', 'Positive Replies', 'Unsubscribes']
+
+
+def campaign_funnels(df):
+    """Stage counts for every campaign from a single bincount.
+
+    Campaign names are factorized to integer IDs and each row's stage flags to
+    one (campaign, stage) slot, so all campaigns and stages are counted in one
+    pass. A stage counts the rows with that event, so a reply without a click
+    still counts as a reply; percentages are of the campaign's sends.
+    """
+    codes, campaigns = pd.factorize(df['Campaign Name'], sort=True)
+    counts = group_counts(codes, len(campaigns), event_flags(df, STAGE_EVENTS))
+
+    funnels = pd.DataFrame(counts, columns=STAGES + [LEAK])
+    funnels.insert(0, 'Campaign Name', campaigns)
+    sent = funnels['Sent'].to_numpy(dtype=np.float64)
+    for stage in STAGES[1:] + [LEAK]:
+        funnels[f'{stage} (%)'] = np.round(100 * funnels[stage] / np.maximum(sent, 1), 1)
+    return funnels
+
+
+def funnel_stages(funnels):
+    """Funnels in long form (Campaign Name, Stage, Count) for a funnel chart."""
+    return funnels.melt(id_vars='Campaign Name', value_vars=STAGES, var_name='Stage', value_name='Count')
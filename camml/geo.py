@@ -0,0 +1,131 @@
+"""Grid aggregation of opens and clicks for the map charts.
+
+Locations are snapped to a grid of square cells at several resolutions. Each
+level's cell is 2x2 cells of the level below, so coarser levels are rolled up
+from the finest one by integer-dividing cell coordinates. The maps then draw
+one marker per cell instead of one per city or row, keeping the marker count
+bounded however large the data grows.
+"""
+import numpy as np
+import pandas as pd
+
+from camml.filters import FILTER_COLUMNS, validity_mask
+
+FINEST_CELL_DEGREES = 0.05
+LEVELS = 8  # cell edges of 0.05, 0.1, 0.2 ... 6.4 degrees
+MAX_MARKERS = 400
+# Sidebar map detail choices; None picks the finest level within the marker budget
+DETAIL_LEVELS = {'Auto': None, 'Coarse': 6, 'Medium': 3, 'Fine': 0}
+
+
+def cell_degrees(level):
+    return FINEST_CELL_DEGREES * 2 ** level
+
+
+def finest_cells(latitude, longitude):
+    """(ix, iy) of the finest cell holding each point."""
+    ix = np.floor((np.asarray(longitude, dtype=float) + 180) / FINEST_CELL_DEGREES).astype(np.int32)
+    iy = np.floor((np.asarray(latitude, dtype=float) + 90) / FINEST_CELL_DEGREES).astype(np.int32)
+    return ix, iy
+
+
+def _cell_codes(ix, iy, level):
+    return (np.asarray(ix, dtype=np.int64) >> level) << 32 | (np.asarray(iy, dtype=np.int64) >> level)
+
+
+def auto_level(ix, iy, max_markers=MAX_MARKERS):
+    """The finest level at which the points fall into at most max_markers cells."""
+    for level in range(LEVELS):
+        if len(np.unique(_cell_codes(ix, iy, level))) <= max_markers:
+            return level
+    return LEVELS - 1
+
+
+def bin_points(points, level=None, by=None, max_markers=MAX_MARKERS):
+    """Aggregate a frame of latitude/longitude/Open Count points into grid cells.
+
+    Returns one row per cell (and per ``by`` value) with the mean position, the
+    summed Open Count and the number of points, plus the level used.
+    """
+    ix, iy = finest_cells(points['latitude'], points['longitude'])
+    if level is None:
+        level = auto_level(ix, iy, max_markers)
+    keys = [pd.Series(_cell_codes(ix, iy, level), index=points.index, name='cell')]
+    if by is not None:
+        keys.append(points[by])
+    cells = points.groupby(keys, observed=True).agg(
+        latitude=('latitude', 'mean'),
+        longitude=('longitude', 'mean'),
+        **{'Open Count': ('Open Count', 'sum')},
+        Points=('latitude', 'size'),
+    ).reset_index()
+    return cells.drop(columns='cell'), level
+
+
+class GeoCube:
+    """Opens and clicks of opened rows summed per finest cell, city and sidebar
+    filter combination. Built once per dataset; each filter change only scans
+    this cube, which is far smaller than the rows it summarizes.
+    """
+
+    def __init__(self, df):
+        opened = df[df['Open Count'] > 0]
+        latitude = pd.to_numeric(opened['latitude'], errors='coerce')
+        longitude = pd.to_numeric(opened['longitude'], errors='coerce')
+        located = latitude.notna() & longitude.notna()
+        opened, latitude, longitude = opened[located], latitude[located], longitude[located]
+        ix, iy = finest_cells(latitude, longitude)
+        # Exports with coordinates but no City column name every marker 'Unknown'
+        city = opened['City'] if 'City' in opened.columns else pd.Series('Unknown', index=opened.index)
+        # Valid_City is set at ingest; fall back to checking the names here
+        valid_city = opened['Valid_City'] if 'Valid_City' in opened.columns else validity_mask(city)
+        frame = pd.DataFrame({
+            'ix': ix, 'iy': iy,
+            'City': city.to_numpy(),
+            'valid_city': np.asarray(valid_city),
+            **{col: opened[col].to_numpy() for col in FILTER_COLUMNS},
+            'opens': opened['Open Count'].to_numpy(),
+            'clicks': opened['Click Count'].to_numpy(),
+            'lat_sum': latitude.to_numpy(),
+            'lon_sum': longitude.to_numpy(),
+        })
+        self.cube = frame.groupby(['ix', 'iy', 'City', 'valid_city'] + FILTER_COLUMNS, dropna=False, sort=False).agg(
+            opens=('opens', 'sum'), clicks=('clicks', 'sum'),
+            lat_sum=('lat_sum', 'sum'), lon_sum=('lon_sum', 'sum'), rows=('opens', 'size'),
+        ).reset_index()
+
+    def query(self, years, quarters, campaigns, bot_checks, time_ranges, exclude_invalid=True, top_n=None,
+              level=None, max_markers=MAX_MARKERS):
+        """Markers for the selected rows: one per cell with summed opens and clicks,
+        the cell's busiest city as its name and the number of cities in it.
+
+        Returns (markers, level); at most min(top_n, max_markers) markers, busiest first.
+        """
+        cube = self.cube
+        mask = (cube['Sent_Year'].isin(years) & cube['Quarter'].isin(quarters) & cube['Campaign Name'].isin(campaigns)
+                & cube['Bot Check'].isin(bot_checks) & cube['Opend Time Range'].isin(time_ranges))
+        if exclude_invalid:
+            mask &= cube['valid_city']
+        selected = cube[mask]
+        if level is None:
+            level = auto_level(selected['ix'], selected['iy'], max_markers)
+        cell = pd.Series(_cell_codes(selected['ix'], selected['iy'], level), index=selected.index, name='cell')
+        by_city = selected.groupby([cell, selected['City']], dropna=False).agg(
+            opens=('opens', 'sum'), clicks=('clicks', 'sum'),
+            lat_sum=('lat_sum', 'sum'), lon_sum=('lon_sum', 'sum'), rows=('rows', 'sum'),
+        ).reset_index()
+        busiest = by_city.sort_values('opens', ascending=False).drop_duplicates('cell').set_index('cell')['City']
+        markers = by_city.groupby('cell').agg(
+            opens=('opens', 'sum'), clicks=('clicks', 'sum'),
+            lat_sum=('lat_sum', 'sum'), lon_sum=('lon_sum', 'sum'), rows=('rows', 'sum'), Cities=('City', 'size'),
+        )
+        markers = pd.DataFrame({
+            'City': busiest.reindex(markers.index).fillna('Unknown'),
+            'latitude': markers['lat_sum'] / markers['rows'],
+            'longitude': markers['lon_sum'] / markers['rows'],
+            'Open Count': markers['opens'],
+            'Click Count': markers['clicks'],
+            'Cities': markers['Cities'],
+        }).reset_index(drop=True)
+        limit = max_markers if top_n is None else min(top_n, max_markers)
+        return markers.nlargest(limit, 'Open Count'), level
@@ -0,0 +1,103 @@
+"""Reading and cleaning uploaded campaign files."""
+import pandas as pd
+
+from camml.filters import INVALID_TOKENS, VALIDITY_COLUMNS, validity_mask
+from camml.quality import QualityProfile
+from camml.dedup import DEDUP_KEY, StreamingDeduplicator
+from camml.dates import parse_dates, source_fingerprint
+
+CSV_CHUNK_SIZE = 100000
+DATE_COLUMNS = ['Sent_Date', 'Opened Time']
+# High-cardinality identifiers kept as integer codes plus one copy of each distinct string
+INTERNED_COLUMNS = ['Lead Email', 'Website']
+
+
+def read_campaign_file(file, file_type, invalid_tokens=INVALID_TOKENS, dedup_key=DEDUP_KEY):
+    """Read a CSV or Excel export and derive the columns the dashboard uses.
+
+    invalid_tokens are the placeholder values (besides missing ones) that the
+    Valid_<column> flags treat as invalid. Rows repeating another row's
+    dedup_key columns are dropped, keeping the most complete one (see
+    camml.dedup); an empty dedup_key keeps every row, though rows repeating
+    the default key are still counted. The data quality profile of the upload
+    is left in df.attrs['quality'] (see camml.quality).
+    """
+    profile = QualityProfile(invalid_tokens)
+    source = source_fingerprint(file)
+    dedup = StreamingDeduplicator(dedup_key or DEDUP_KEY)
+    if file_type == "csv":
+        chunks = pd.read_csv(file, chunksize=CSV_CHUNK_SIZE, low_memory=False)
+    else:
+        chunks = [pd.read_excel(file, engine='openpyxl')]
+
+    # Row-wise cleaning as each chunk streams in
+    kept = []
+    for chunk in chunks:
+        profile.add_chunk(chunk)
+        rows = len(chunk)
+        chunk = chunk.dropna(how='all')  # Remove completely empty rows
+        profile.count('Empty rows removed', rows - len(chunk))
+
+        # Check if 'Status' column exists; if not, skip bounce/failure filtering
+        if 'Status' in chunk.columns:
+            rows = len(chunk)
+            chunk = chunk[~chunk['Status'].str.contains('bounced|failed', case=False, na=False)]  # Remove bounced/failed emails
+            profile.count('Bounced/failed rows removed', rows - len(chunk))
+
+        dedup.add_chunk(chunk)
+        kept.append(chunk)
+    profile.duplicate_rows = dedup.dropped
+    if dedup_key:
+        kept = dedup.keep(kept)
+        profile.count('Duplicate rows removed', dedup.dropped)
+    df = pd.concat(kept, ignore_index=True)
+
+    # Data cleaning
+    for col in DATE_COLUMNS:
+        df[col], fmt, failures, examples = parse_dates(df[col], source)
+        profile.count(f'Unparseable {col}', failures)
+        profile.date_format(col, fmt, examples)
+    profile.count('Opened before sent', (df['Opened Time'] < df['Sent_Date']).sum())
+    df['Sent_Year'] = df['Sent_Date'].dt.year
+    df['Sent_Month'] = df['Sent_Date'].dt.month
+    df['Quarter'] = df['Sent_Date'].dt.quarter
+    df['Sent_DayOfWeek'] = df['Sent_Date'].dt.dayofweek
+    df['Response_Time'] = (df['Opened Time'] - df['Sent_Date']).dt.total_seconds().fillna(0)
+    df['Is_Unsubscribed'] = df['Is Unsubscribed'].astype(bool) if 'Is Unsubscribed' in df.columns else False
+
+    # Clean Reply Message and Positive Reply columns
+    if 'Reply Message' in df.columns:
+        df['Reply Message'] = df['Reply Message'].fillna('').astype(str)
+        df['Has_Reply'] = df['Reply Message'].str.strip().ne('')  # Boolean for non-empty replies
+    else:
+        df['Reply Message'] = ''
+        df['Has_Reply'] = False
+
+    if 'Positive Reply(Yes/No)' in df.columns:
+        df['Positive_Reply'] = df['Positive Reply(Yes/No)'].str.lower().eq('yes')
+    else:
+        df['Positive_Reply'] = False
+
+    df = intern_identifiers(df)
+
+    # Validity flags for the "Exclude Invalid Entries" toggle, so it never re-scans strings
+    for col in VALIDITY_COLUMNS:
+        if col in df.columns:
+            df[f'Valid_{col}'] = validity_mask(df[col], invalid_tokens)
+
+    df.attrs['quality'] = profile.summary(len(df))
+    return df
+
+
+def intern_identifiers(df, columns=INTERNED_COLUMNS):
+    """Store identifier columns as categoricals: a dense integer code per row and
+    a dictionary of the distinct strings, which are only looked up for display.
+
+    Missing websites become 'Unknown' first, since a categorical cannot be
+    filled with a value outside its categories later on.
+    """
+    for col in columns:
+        if col in df.columns:
+            values = df[col].fillna('Unknown') if col == 'Website' else df[col]
+            df[col] = values.astype('category')
+    return df
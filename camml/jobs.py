@@ -0,0 +1,104 @@
+"""Background job runner for model fits, keyed by a fingerprint of the input data."""
+import time
+import hashlib
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+def frame_fingerprint(df, columns=None):
+    """Stable content hash of a DataFrame (or the given columns of it)."""
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(col, str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(np.ascontiguousarray(pd.util.hash_pandas_object(df, index=False).to_numpy()).tobytes())
+    return digest.hexdigest()
+
+
+class Job:
+    def __init__(self, name, key):
+        self.name = name
+        self.key = key
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = 'Queued'
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def report(self, progress, message=None):
+        # Called from inside the job to publish progress to the page
+        self.progress = min(max(progress, 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class JobRunner:
+    """Thread pool that runs each (name, key) job once and keeps its result.
+
+    Jobs outlive the script run that submitted them, so a rerun (or another
+    session with the same data) picks up the running or finished job instead of
+    starting over. Finished jobs are evicted least-recently-used beyond max_jobs.
+    """
+
+    def __init__(self, max_workers=4, max_jobs=64):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='camml-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_jobs = max_jobs
+
+    def submit(self, name, key, fn, *args, **kwargs):
+        """Start fn(*args, job=job, **kwargs) unless (name, key) is already known."""
+        with self._lock:
+            job = self._jobs.get((name, key))
+            if job is not None and job.status != FAILED:
+                self._jobs.move_to_end((name, key))
+                return job
+            job = Job(name, key)
+            self._jobs[(name, key)] = job
+            self._evict()
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, name, key):
+        with self._lock:
+            return self._jobs.get((name, key))
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _run(self, job, fn, args, kwargs):
+        job.status, job.started_at, job.message = RUNNING, time.time(), 'Running'
+        try:
+            job.result = fn(*args, job=job, **kwargs)
+            job.status, job.progress, job.message = DONE, 1.0, 'Done'
+        except Exception as e:
+            job.error = f"{e}\n{traceback.format_exc()}"
+            job.status, job.message = FAILED, f"Failed: {e}"
+        finally:
+            job.finished_at = time.time()
+
+    def _evict(self):
+        finished = [key for key, job in self._jobs.items() if job.finished]
+        while len(self._jobs) > self.max_jobs and finished:
+            del self._jobs[finished.pop(0)]
@@ -0,0 +1,81 @@
+"""Per-lead profiles with an email index, prefix search and each lead's rows.
+
+Lead Email is interned at ingest, so a lead's category code is its position in
+every array here: the profile columns are filled with bincounts over the codes,
+an exact email is found through the category index (a hash lookup) and a
+lead's raw rows are one contiguous slice of a row order sorted by lead.
+"""
+import numpy as np
+import pandas as pd
+
+MAX_MATCHES = 50
+
+
+class LeadProfiles:
+    def __init__(self, df):
+        emails = df['Lead Email'].astype('category')  # a no-op for the column interned at ingest
+        self.emails = emails.cat.categories
+        n = len(self.emails)
+        codes = emails.cat.codes.to_numpy()
+        present = codes >= 0
+        rows, codes = np.flatnonzero(present), codes[present]
+
+        def per_lead(values):
+            return np.bincount(codes, weights=np.asarray(values, dtype=np.float64)[present], minlength=n)
+
+        opened = (df['Open Count'] > 0).to_numpy()
+        sends = np.bincount(codes, minlength=n)
+        opens = per_lead(opened).astype(np.int64)
+        response = per_lead(np.where(opened, df['Response_Time'].to_numpy(dtype=np.float64), 0.0))
+        open_times = pd.Series(pd.to_datetime(df['Opened Time']).to_numpy()[present][opened[present]])
+        open_span = open_times.groupby(codes[opened[present]]).agg(['min', 'max']).reindex(np.arange(n))
+        campaign_pairs = pd.DataFrame({'lead': codes, 'campaign': df['Campaign Name'].to_numpy()[present]}).drop_duplicates()
+
+        self.table = pd.DataFrame({
+            'Lead Email': self.emails,
+            'Sends': sends,
+            'Opens': opens,
+            'Clicks': per_lead(df['Click Count'] > 0).astype(np.int64),
+            'First Open': open_span['min'].to_numpy(),
+            'Last Open': open_span['max'].to_numpy(),
+            'Mean Response (h)': np.divide(response, opens, out=np.full(n, np.nan), where=opens > 0) / 3600,
+            'Campaigns': np.bincount(campaign_pairs['lead'].to_numpy(), minlength=n),
+            'Replied': per_lead(df['Has_Reply']) > 0,
+            'Positive Reply': per_lead(df['Positive_Reply']) > 0,
+            'Bot Flagged': per_lead(df['Bot Check'] == 'Bot') > 0,
+        })
+
+        # Rows of lead i are row_order[offsets[i]:offsets[i + 1]]
+        self.row_order = rows[np.argsort(codes, kind='stable')]
+        self.offsets = np.concatenate([[0], np.cumsum(sends)])
+
+        # Case-insensitive prefix search over the sorted, lowercased emails
+        lowered = self.emails.astype(str).str.lower().to_numpy(dtype=object)
+        self.sorted_codes = np.argsort(lowered, kind='stable')
+        self.sorted_emails = lowered[self.sorted_codes]
+
+    def __len__(self):
+        return len(self.emails)
+
+    def lookup(self, email):
+        """Code of an exact email, or None."""
+        try:
+            return self.emails.get_loc(email)
+        except KeyError:
+            return None
+
+    def search(self, prefix, limit=MAX_MATCHES):
+        """Codes of up to limit leads whose email starts with prefix (any case),
+        alphabetically, and the total number of matches."""
+        prefix = prefix.strip().lower()
+        start = np.searchsorted(self.sorted_emails, prefix, side='left')
+        stop = np.searchsorted(self.sorted_emails, prefix + '\U0010ffff', side='left')
+        return self.sorted_codes[start:min(stop, start + limit)], stop - start
+
+    def profiles(self, codes):
+        return self.table.iloc[codes].reset_index(drop=True)
+
+    def activity(self, df, code):
+        """The lead's rows of df (the frame the profiles were built from), oldest send first."""
+        rows = self.row_order[self.offsets[code]:self.offsets[code + 1]]
+        return df.iloc[rows].sort_values('Sent_Date', kind='stable')
@@ -0,0 +1,55 @@
+"""Model fits for the AI Predictions page, written to run as background jobs.
+
+Each function takes plain data plus an optional ``job`` (camml.jobs.Job) to
+report progress on, and never touches Streamlit.
+"""
+import numpy as np
+from sklearn.cluster import KMeans
+
+from camml.scoring import fit_open_model, add_calendar_features, iter_chunks
+from camml.training import train_classifier
+
+BOT_FEATURES = ['Open Count', 'Click Count', 'Response_Time']
+
+
+def _report(job, progress, message):
+    if job is not None:
+        job.report(progress, message)
+
+
+def geo_clusters(geo_df, n_clusters=3, job=None):
+    geo_df = geo_df.copy()
+    _report(job, 0.1, 'Clustering coordinates')
+    kmeans = KMeans(n_clusters=min(n_clusters, len(geo_df)), random_state=42, n_init=10)
+    geo_df['Cluster'] = kmeans.fit_predict(geo_df[['latitude', 'longitude']])
+    return geo_df
+
+
+def behavior_segments(features, n_clusters=4, job=None):
+    _report(job, 0.1, 'Segmenting leads')
+    kmeans = KMeans(n_clusters=min(n_clusters, len(features)), random_state=42, n_init=10)
+    return kmeans.fit_predict(features)
+
+
+def open_probabilities(df, learner, max_rows, chunk_size=100000, job=None):
+    """Fit the open model, then score every row of df in order, chunk by chunk."""
+    _report(job, 0.05, 'Training open model')
+    open_model = fit_open_model(df, learner=learner, max_rows=max_rows)
+    if open_model is None:
+        return None, None
+    probabilities = []
+    for chunk in iter_chunks(df, chunk_size=chunk_size):
+        probabilities.append(open_model.predict_proba(add_calendar_features(chunk.copy())).astype(np.float32))
+        _report(job, 0.5 + 0.5 * sum(map(len, probabilities)) / len(df), 'Scoring rows')
+    return open_model, np.concatenate(probabilities)
+
+
+def bot_probabilities(df, learner, max_rows, job=None):
+    X = df[BOT_FEATURES].fillna(0)
+    y = df['Bot Check'].map({'Bot': 1, 'Human': 0}).fillna(0).astype(int)
+    if len(X) <= 100 or len(y.unique()) <= 1:
+        return None, None, None
+    _report(job, 0.1, 'Training bot detector')
+    model, report = train_classifier(X, y, learner, max_rows)
+    _report(job, 0.7, 'Scoring rows')
+    return model, report, model.predict_proba(X)[:, 1].astype(np.float32)
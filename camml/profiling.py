@@ -0,0 +1,121 @@
+"""Opt-in timing and memory profile of one script run, split into named spans.
+
+Spans are flat: ``mark(name)`` closes the running span and opens the next one,
+which fits the top-to-bottom layout of app.py without re-indenting its
+sections, and ``section(name)`` times a single block. When the profiler is
+disabled every call is a no-op.
+"""
+import os
+import json
+import time
+import uuid
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+TRACE_FILE = os.environ.get('CAMML_TRACE_FILE', 'camml_trace.jsonl')
+# Set to 0 to time sections without tracemalloc's overhead (e.g. under load tests)
+TRACE_MEMORY = os.environ.get('CAMML_PROFILE_MEMORY', '1') != '0'
+
+# tracemalloc is process-wide, so concurrent profiled sessions share one trace
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+
+
+def _start_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+class Profiler:
+    def __init__(self, enabled=False, trace_memory=TRACE_MEMORY):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = time.time()
+        self.spans = []
+        self._open = None
+        self._run_start = time.perf_counter()
+        if self.trace_memory:
+            _start_tracing()
+
+    def _begin(self, name):
+        if self.trace_memory:
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        else:
+            current = None
+        return name, time.perf_counter(), current
+
+    def _end(self, opened):
+        name, start, current = opened
+        seconds = time.perf_counter() - start
+        peak = None
+        if current is not None:
+            peak = max(tracemalloc.get_traced_memory()[1] - current, 0) / 2 ** 20
+        self.add(name, seconds, peak)
+
+    def add(self, name, seconds, peak_mib=None, background=False):
+        """Record a span; background spans (e.g. a job's run time) ran outside this rerun."""
+        if self.enabled:
+            self.spans.append({'Section': name, 'Seconds': seconds, 'Peak MiB': peak_mib, 'Background': background})
+
+    def mark(self, name):
+        if not self.enabled:
+            return
+        if self._open is not None:
+            self._end(self._open)
+        self._open = self._begin(name)
+
+    @contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        self.mark(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def end(self):
+        """Close the running span, if any."""
+        if self._open is not None:
+            self._end(self._open)
+            self._open = None
+
+    def finish(self):
+        """Close the run: end the last span and stop tracing memory."""
+        self.end()
+        if self.trace_memory:
+            _stop_tracing()
+            self.trace_memory = False
+        return time.perf_counter() - self._run_start
+
+    def summary(self):
+        """Spans slowest first, with their share of the rerun's wall time."""
+        spans = pd.DataFrame(self.spans, columns=['Section', 'Seconds', 'Peak MiB', 'Background'])
+        total = time.perf_counter() - self._run_start
+        spans['% of Run'] = (100 * spans['Seconds'] / total).where(~spans['Background'].astype(bool)) if total > 0 else None
+        return spans.drop(columns='Background').sort_values('Seconds', ascending=False, ignore_index=True)
+
+    def write_trace(self, path=TRACE_FILE, **context):
+        """Append one JSON line per span to the trace file."""
+        if not self.enabled or not self.spans:
+            return
+        with open(path, 'a') as f:
+            for span in self.spans:
+                f.write(json.dumps({'run_id': self.run_id, 'started_at': self.started_at, **context, **span}) + '\n')
@@ -0,0 +1,69 @@
+"""Data quality profile gathered while an upload is read and cleaned.
+
+Each chunk is profiled as it streams in (missing and placeholder values per
+column), and the cleaning steps record how many rows they remove or fail to
+parse, so the report costs no extra pass over the finished frame.
+"""
+import numpy as np
+import pandas as pd
+
+from camml.filters import INVALID_TOKENS
+
+# Columns whose raw value counts are kept for the report
+VALUE_COUNT_COLUMNS = ['Engagement']
+
+
+class QualityProfile:
+    def __init__(self, invalid_tokens=INVALID_TOKENS):
+        self.invalid_tokens = invalid_tokens
+        self.rows_read = 0
+        self.missing = {}
+        self.invalid = {}
+        self.values = {}
+        self.counts = {}
+        self.date_formats = {}
+        self.duplicate_rows = 0  # rows repeating an earlier row's key, removed or not
+
+    def add_chunk(self, chunk):
+        """Profile one chunk of raw rows and hand it back unchanged."""
+        self.rows_read += len(chunk)
+        for col, missing in chunk.isna().sum().items():
+            self.missing[col] = self.missing.get(col, 0) + int(missing)
+        for col in chunk.columns[chunk.dtypes == object]:
+            invalid = int(chunk[col].isin(self.invalid_tokens).sum())
+            self.invalid[col] = self.invalid.get(col, 0) + invalid
+        for col in VALUE_COUNT_COLUMNS:
+            if col in chunk.columns:
+                counts = chunk[col].value_counts(dropna=False)
+                self.values[col] = counts if col not in self.values else self.values[col].add(counts, fill_value=0)
+        return chunk
+
+    def count(self, issue, rows):
+        self.counts[issue] = self.counts.get(issue, 0) + int(rows)
+
+    def date_format(self, col, fmt, unparsed_examples):
+        self.date_formats[col] = (fmt, list(unparsed_examples))
+
+    def summary(self, rows_kept):
+        """Plain dict of the profile (small enough to ride along in df.attrs)."""
+        return {
+            'rows_read': self.rows_read,
+            'rows_kept': int(rows_kept),
+            'duplicate_rows': int(self.duplicate_rows),
+            'issues': dict(self.counts),
+            'dates': dict(self.date_formats),
+            'columns': {col: (self.missing[col], self.invalid.get(col, 0)) for col in self.missing},
+            'values': {col: {str(value): int(n) for value, n in counts.items()} for col, counts in self.values.items()},
+        }
+
+
+def column_table(summary):
+    """Missing and invalid-token counts and rates per raw column, worst first."""
+    rows_read = max(summary['rows_read'], 1)
+    table = pd.DataFrame(
+        [(col, missing, invalid) for col, (missing, invalid) in summary['columns'].items()],
+        columns=['Column', 'Missing', 'Invalid'],
+    )
+    table['Missing (%)'] = np.round(100 * table['Missing'] / rows_read, 2)
+    table['Invalid (%)'] = np.round(100 * table['Invalid'] / rows_read, 2)
+    return table.sort_values(['Missing (%)', 'Invalid (%)'], ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,207 @@
+"""Open-probability model: training bundle and chunked batch scoring of lead files."""
+import os
+import copy
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+import pandas as pd
+
+from camml.training import train_classifier, DEFAULT_ROW_BUDGET
+
+BASE_FEATURES = ['Sent_Year', 'Sent_Month', 'Sent_DayOfWeek', 'Quarter']
+OPTIONAL_CATEGORICALS = ['ESP Type', 'Traffic']
+MAX_CITY_CARDINALITY = 50
+MIN_TRAINING_ROWS = 100
+# Columns carried from a lead file into the ranked output (when present)
+ID_COLUMNS = ['Lead Email', 'Campaign Name', 'Website', 'City']
+DEFAULT_CHUNK_SIZE = 100000
+MERGE_BLOCK_ROWS = 50000
+UNSEEN = -1
+
+
+class CategoryEncoder:
+    """LabelEncoder replacement: unseen or missing categories map to -1 instead of raising."""
+
+    def fit(self, values):
+        self.classes_ = pd.Index(np.sort(pd.unique(values.dropna().astype(str))))
+        return self
+
+    def transform(self, values):
+        # astype(str) would turn missing values into a 'nan' class
+        codes = self.classes_.get_indexer(values.astype(str))
+        codes[values.isna().to_numpy()] = UNSEEN
+        return codes
+
+    def fit_transform(self, values):
+        return self.fit(values).transform(values)
+
+
+class OpenModel:
+    """A fitted open-probability classifier with the encoders it was trained with."""
+
+    def __init__(self, model, features, encoders, report):
+        self.model = model
+        self.features = features
+        self.encoders = encoders
+        self.report = report
+        self.accuracy = report['Held-out Accuracy']
+
+    def transform(self, df):
+        X = df.reindex(columns=self.features).copy()
+        for col, encoder in self.encoders.items():
+            X[col] = encoder.transform(X[col])
+        X[BASE_FEATURES] = X[BASE_FEATURES].fillna(0)
+        return X
+
+    def predict_proba(self, df):
+        return self.model.predict_proba(self.transform(df))[:, 1]
+
+    def unseen_counts(self, df):
+        # Rows per categorical column whose value was never seen in training
+        return {col: int((encoder.transform(df[col]) == UNSEEN).sum()) if col in df.columns else len(df)
+                for col, encoder in self.encoders.items()}
+
+
+def add_calendar_features(df, send_date=None):
+    # Derive the date features the model was trained on; lead lists without a
+    # Sent_Date column are scored as if sent on the planned send date
+    if 'Sent_Date' in df.columns:
+        sent = pd.to_datetime(df['Sent_Date'], errors='coerce')
+        if send_date is not None:
+            sent = sent.fillna(pd.Timestamp(send_date))
+    else:
+        sent = pd.Series(pd.Timestamp(send_date if send_date is not None else 'today'), index=df.index)
+    df['Sent_Year'] = sent.dt.year
+    df['Sent_Month'] = sent.dt.month
+    df['Quarter'] = sent.dt.quarter
+    df['Sent_DayOfWeek'] = sent.dt.dayofweek
+    return df
+
+
+def fit_open_model(df, learner='Random Forest', max_rows=DEFAULT_ROW_BUDGET, random_state=42):
+    features = list(BASE_FEATURES)
+    categorical_cols = [col for col in OPTIONAL_CATEGORICALS if col in df.columns]
+    if 'City' in df.columns and df['City'].nunique(dropna=False) <= MAX_CITY_CARDINALITY:
+        categorical_cols.append('City')
+    features += categorical_cols
+
+    if len(df) <= MIN_TRAINING_ROWS:
+        return None
+
+    X = df[features].copy()
+    encoders = {}
+    for col in categorical_cols:
+        encoders[col] = CategoryEncoder()
+        X[col] = encoders[col].fit_transform(X[col])
+    X[BASE_FEATURES] = X[BASE_FEATURES].fillna(0)
+    y = (df['Open Count'] > 0).astype(int)
+
+    model, report = train_classifier(X, y, learner, max_rows, random_state)
+    return OpenModel(model, features, encoders, report)
+
+
+def iter_chunks(source, file_type='csv', chunk_size=DEFAULT_CHUNK_SIZE):
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunk_size):
+            yield source.iloc[start:start + chunk_size]
+    elif file_type == 'csv':
+        yield from pd.read_csv(source, chunksize=chunk_size, low_memory=False)
+    else:
+        # Excel cannot be streamed by pandas; read once and score in slices
+        yield from iter_chunks(pd.read_excel(source, engine='openpyxl'), chunk_size=chunk_size)
+
+
+def _score_chunk(open_model, chunk, send_date):
+    chunk = add_calendar_features(chunk.copy(), send_date)
+    scored = chunk[[col for col in ID_COLUMNS if col in chunk.columns]].copy()
+    scored['Open_Probability'] = open_model.predict_proba(chunk).astype(np.float32)
+    return scored, open_model.unseen_counts(chunk)
+
+
+def score_chunks(source, open_model, file_type='csv', chunk_size=DEFAULT_CHUNK_SIZE, n_jobs=None, send_date=None):
+    """Yield (scored_chunk, unseen_counts) as chunks finish, in completion order.
+
+    Chunks are scored on a thread pool (tree prediction releases the GIL) with at
+    most two chunks per worker in flight, so memory stays bounded by chunk size.
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    # Each worker predicts single-threaded so the pool is the only parallelism
+    worker_model = copy.copy(open_model)
+    worker_model.model = copy.copy(open_model.model)
+    if hasattr(worker_model.model, 'n_jobs'):
+        worker_model.model.n_jobs = 1
+
+    chunks = iter_chunks(source, file_type, chunk_size)
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(_score_chunk, worker_model, chunk, send_date))
+            if len(pending) >= 2 * n_jobs:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+
+def rank_leads(scored_chunks, top_k):
+    """Merge scored chunks into the top_k rows ranked by Open_Probability.
+
+    Only the running top_k rows are kept (via partial selection), so memory
+    does not grow with the size of the lead file.
+    """
+    best = None
+    for chunk in scored_chunks:
+        best = chunk if best is None else pd.concat([best, chunk], ignore_index=True)
+        if len(best) > top_k:
+            keep = np.argpartition(-best['Open_Probability'].to_numpy(), top_k - 1)[:top_k]
+            best = best.iloc[keep]
+    if best is None:
+        return pd.DataFrame(columns=['Rank', 'Open_Probability'])
+    ranked = best.sort_values('Open_Probability', ascending=False, kind='stable').reset_index(drop=True)
+    ranked.insert(0, 'Rank', np.arange(1, len(ranked) + 1))
+    return ranked
+
+
+def rank_leads_to_csv(scored_chunks, path, block_rows=MERGE_BLOCK_ROWS):
+    """Rank every scored row into a CSV at path by external merge; returns the row count.
+
+    Each chunk is sorted and spilled to its own run file, then the runs are
+    merged a block at a time: rows at or above the highest last-buffered
+    probability of any run cannot be outranked by unread rows, so they are
+    written out and the drained runs refilled.
+    """
+    run_dir = tempfile.mkdtemp(prefix='camml-rank-')
+    readers = []
+    try:
+        runs = []
+        for chunk in scored_chunks:
+            if len(chunk):
+                runs.append(os.path.join(run_dir, f"run{len(runs)}.csv"))
+                chunk.sort_values('Open_Probability', ascending=False, kind='stable').to_csv(runs[-1], index=False)
+        readers += [pd.read_csv(run, chunksize=block_rows, low_memory=False) for run in runs]
+        buffers = [next(reader, None) for reader in readers]
+        ranked = 0
+        with open(path, 'w', newline='') as out:
+            if not runs:
+                out.write('Rank,Open_Probability\n')
+            while any(buffer is not None for buffer in buffers):
+                floor = max(buffer['Open_Probability'].iat[-1] for buffer in buffers if buffer is not None)
+                taken = []
+                for i, buffer in enumerate(buffers):
+                    if buffer is None:
+                        continue
+                    take = buffer['Open_Probability'].to_numpy() >= floor
+                    taken.append(buffer[take])
+                    buffers[i] = buffer[~take] if not take.all() else next(readers[i], None)
+                block = pd.concat(taken, ignore_index=True).sort_values('Open_Probability', ascending=False, kind='stable')
+                block.insert(0, 'Rank', np.arange(ranked + 1, ranked + len(block) + 1))
+                block.to_csv(out, header=ranked == 0, index=False)
+                ranked += len(block)
+        return ranked
+    finally:
+        for reader in readers:
+            reader.close()
+        shutil.rmtree(run_dir, ignore_errors=True)
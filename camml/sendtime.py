@@ -0,0 +1,91 @@
+"""Day-of-week x hour-of-day grids of sends, opens and clicks for send-time
+optimization, and the best send window per campaign or segment.
+
+Sends, opens and clicks are binned by the hour the email was sent (Sent_Date),
+and opens also by the hour they happened (Opened Time). Every group, slot and
+measure is counted by one bincount over the rows.
+"""
+import numpy as np
+import pandas as pd
+
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+HOURS = 24
+SLOTS = len(DAYS) * HOURS
+# Measures in the last axis of the grid
+GRID_MEASURES = ['Sends', 'Opens', 'Clicks', 'Opens by Open Time']
+HEATMAP_METRICS = {
+    'Open Rate by Send Time (%)': ('Opens', 'Sends'),
+    'Click Rate by Send Time (%)': ('Clicks', 'Sends'),
+    'Opens by Open Time': ('Opens by Open Time', None),
+}
+WINDOW_HOURS = 3
+MIN_WINDOW_SENDS = 20
+
+
+def _slots(times):
+    times = pd.to_datetime(times)
+    slot = (times.dt.dayofweek * HOURS + times.dt.hour).to_numpy()
+    return np.where(np.isnan(slot), -1, slot).astype(np.int64)
+
+
+def send_time_grid(df, by='Campaign Name'):
+    """(groups, counts): counts[g, day, hour, m] for each value g of ``by`` and
+    each of GRID_MEASURES."""
+    codes, groups = pd.factorize(df[by], sort=True)
+    send_slot = _slots(df['Sent_Date'])
+    open_slot = _slots(df['Opened Time'])
+    opened = (df['Open Count'] > 0).to_numpy()
+    measures = [
+        (send_slot, np.ones(len(df), dtype=bool)),
+        (send_slot, opened),
+        (send_slot, (df['Click Count'] > 0).to_numpy()),
+        (open_slot, opened),
+    ]
+    width = len(measures)
+    index = [((codes * SLOTS + slot) * width + m)[(codes >= 0) & (slot >= 0) & flags]
+             for m, (slot, flags) in enumerate(measures)]
+    counts = np.bincount(np.concatenate(index), minlength=len(groups) * SLOTS * width)
+    return pd.Index(groups, name=by), counts.reshape(len(groups), len(DAYS), HOURS, width)
+
+
+def heatmap(counts, metric):
+    """A days x hours frame of one HEATMAP_METRICS entry from a (day, hour, measure) grid."""
+    numerator, denominator = HEATMAP_METRICS[metric]
+    values = counts[..., GRID_MEASURES.index(numerator)].astype(np.float64)
+    if denominator is not None:
+        sends = counts[..., GRID_MEASURES.index(denominator)]
+        values = np.where(sends > 0, 100 * values / np.maximum(sends, 1), np.nan)
+    return pd.DataFrame(values, index=DAYS, columns=[f"{hour:02d}:00" for hour in range(HOURS)])
+
+
+def recommended_windows(groups, counts, window_hours=WINDOW_HOURS, min_sends=MIN_WINDOW_SENDS):
+    """Per group, the run of window_hours consecutive send hours within a day
+    with the highest open rate among windows with at least min_sends sends."""
+    columns = [groups.name, 'Send Window', 'Window Open Rate (%)', 'Window Sends', 'Overall Open Rate (%)', 'Lift (pts)']
+    if len(groups) == 0:
+        return pd.DataFrame(columns=columns)
+    sends = counts[..., GRID_MEASURES.index('Sends')]
+    opens = counts[..., GRID_MEASURES.index('Opens')]
+    # Window sums along the hour axis from cumulative sums
+    def window_sum(values):
+        cumulative = np.concatenate([np.zeros(values.shape[:-1] + (1,), dtype=np.int64), values.cumsum(axis=-1)], axis=-1)
+        return cumulative[..., window_hours:] - cumulative[..., :-window_hours]
+    window_sends, window_opens = window_sum(sends), window_sum(opens)
+    rate = np.where(window_sends >= min_sends, window_opens / np.maximum(window_sends, 1), -1.0)
+    flat = rate.reshape(len(groups), -1)
+    best = flat.argmax(axis=1)
+    day, start = np.divmod(best, rate.shape[-1])
+    found = flat[np.arange(len(groups)), best] >= 0
+    total_sends, total_opens = sends.sum(axis=(1, 2)), opens.sum(axis=(1, 2))
+    overall = 100 * total_opens / np.maximum(total_sends, 1)
+    best_rate = 100 * flat[np.arange(len(groups)), best]
+    windows = pd.DataFrame({
+        groups.name: groups,
+        'Send Window': [f"{DAYS[d]} {h:02d}:00-{h + window_hours:02d}:00" if ok else "Not enough sends"
+                        for d, h, ok in zip(day, start, found)],
+        'Window Open Rate (%)': np.where(found, best_rate, np.nan).round(1),
+        'Window Sends': np.where(found, window_sends.reshape(len(groups), -1)[np.arange(len(groups)), best], 0),
+        'Overall Open Rate (%)': overall.round(1),
+    })
+    windows['Lift (pts)'] = (windows['Window Open Rate (%)'] - windows['Overall Open Rate (%)']).round(1)
+    return windows[columns]
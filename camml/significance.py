@@ -0,0 +1,99 @@
+"""Confidence intervals for per-group open, click and reply rates and
+two-proportion z-tests across every pair of groups, with multiple-comparison
+correction.
+
+Everything works from the aggregate counts per group (one bincount over the
+rows), and all pairs are tested at once from the upper-triangle indices, so
+300 campaigns (44,850 pairs) take a few milliseconds.
+"""
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+from camml.counting import event_flags, group_counts
+
+# Rate -> event counted per send (per send, unlike the per-open click rate and
+# per-brand reply rate of the Compare Quarters metric table)
+RATES = {'Open Rate (%)': 'Opens', 'Click-per-Send Rate (%)': 'Clicks', 'Reply-per-Send Rate (%)': 'Replies'}
+CORRECTIONS = ['Holm', 'Benjamini-Hochberg', 'None']
+ALPHA = 0.05
+# Groups with fewer sends are left out of the pairwise tests
+MIN_SENDS = 30
+
+
+def rate_counts(df, by='Campaign Name'):
+    """Sends, Opens, Clicks and Replies for each value of ``by``."""
+    codes, groups = pd.factorize(df[by], sort=True)
+    events = ['Sends'] + list(RATES.values())
+    counts = group_counts(codes, len(groups), event_flags(df, events))
+    return pd.DataFrame(counts, index=pd.Index(groups, name=by), columns=events)
+
+
+def wilson_interval(successes, trials, alpha=ALPHA):
+    """Wilson score interval (low, high) for each proportion, as fractions."""
+    successes = np.asarray(successes, dtype=np.float64)
+    trials = np.maximum(np.asarray(trials, dtype=np.float64), 1)
+    z = ndtri(1 - alpha / 2)
+    p = successes / trials
+    center = (p + z * z / (2 * trials)) / (1 + z * z / trials)
+    half = z * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / (1 + z * z / trials)
+    return center - half, center + half
+
+
+def rate_intervals(counts, rate, alpha=ALPHA):
+    """Per group: sends, the rate and its confidence interval, in percent."""
+    sends = counts['Sends'].to_numpy()
+    events = counts[RATES[rate]].to_numpy()
+    low, high = wilson_interval(events, sends, alpha)
+    return pd.DataFrame({
+        counts.index.name: counts.index,
+        'Sends': sends,
+        rate: np.round(100 * events / np.maximum(sends, 1), 2),
+        'CI Low (%)': np.round(100 * low, 2),
+        'CI High (%)': np.round(100 * high, 2),
+    })
+
+
+def adjust_pvalues(pvalues, method='Holm'):
+    """Holm (family-wise error) or Benjamini-Hochberg (false discovery rate) adjusted p-values."""
+    pvalues = np.asarray(pvalues, dtype=np.float64)
+    m = len(pvalues)
+    if method == 'None' or m == 0:
+        return pvalues
+    order = np.argsort(pvalues, kind='stable')
+    ranked = pvalues[order]
+    if method == 'Holm':
+        adjusted = np.maximum.accumulate((m - np.arange(m)) * ranked)
+    else:
+        adjusted = np.minimum.accumulate((m / np.arange(m, 0, -1) * ranked[::-1]))[::-1]
+    result = np.empty(m)
+    result[order] = np.minimum(adjusted, 1.0)
+    return result
+
+
+def pairwise_tests(counts, rate, method='Holm', alpha=ALPHA, min_sends=MIN_SENDS):
+    """Two-sided pooled two-proportion z-test of ``rate`` for every pair of
+    groups with at least min_sends sends, most significant first."""
+    counts = counts[counts['Sends'] >= max(min_sends, 1)]
+    groups = counts.index
+    sends = counts['Sends'].to_numpy(dtype=np.float64)
+    events = counts[RATES[rate]].to_numpy(dtype=np.float64)
+    a, b = np.triu_indices(len(groups), k=1)
+    rate_a, rate_b = events[a] / sends[a], events[b] / sends[b]
+    pooled = (events[a] + events[b]) / (sends[a] + sends[b])
+    se = np.sqrt(pooled * (1 - pooled) * (1 / sends[a] + 1 / sends[b]))
+    z = np.divide(rate_a - rate_b, se, out=np.zeros(len(a)), where=se > 0)
+    pvalues = 2 * ndtr(-np.abs(z))
+    adjusted = adjust_pvalues(pvalues, method)
+    pairs = pd.DataFrame({
+        'A': groups[a],
+        'B': groups[b],
+        f'A {rate}': np.round(100 * rate_a, 2),
+        f'B {rate}': np.round(100 * rate_b, 2),
+        'Difference (pts)': np.round(100 * (rate_a - rate_b), 2),
+        'z': np.round(z, 2),
+        'p-value': pvalues,
+        'Adjusted p': adjusted,
+        'Significant': adjusted < alpha,
+    })
+    return pairs.sort_values(['Adjusted p', 'p-value'], kind='stable').reset_index(drop=True)
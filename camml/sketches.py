@@ -0,0 +1,110 @@
+"""HyperLogLog distinct-count sketches per sidebar filter cell.
+
+Unique prospects and brands cannot be summed across cells the way opens can,
+but HyperLogLog registers can be merged by taking their maximum. Each column's
+sketch is kept sparse, as the highest rank seen per (filter cell, register),
+so a filter selection is answered by merging the registers of the selected
+cells instead of re-counting the distinct values of the filtered rows.
+"""
+import numpy as np
+import pandas as pd
+
+from camml.filters import FILTER_COLUMNS, validity_mask
+
+PRECISION = 12  # 4096 registers per sketch
+SKETCH_COLUMNS = ['Lead Email', 'Website']
+
+
+def relative_error(precision=PRECISION):
+    """Standard error of a HyperLogLog estimate with 2**precision registers."""
+    return 1.04 / np.sqrt(2 ** precision)
+
+
+def _bit_length(values):
+    # Bit length of each uint64, exactly, by splitting into 32-bit halves
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1])
+
+
+def hll_registers(values, precision=PRECISION):
+    """(register, rank) of each value: the register picked by the top bits of
+    its 64-bit hash and the position of the first set bit in the rest."""
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    rest_bits = 64 - precision
+    register = (hashes >> np.uint64(rest_bits)).astype(np.int32)
+    rest = hashes & np.uint64((1 << rest_bits) - 1)
+    rank = (rest_bits - _bit_length(rest) + 1).astype(np.uint8)
+    return register, rank
+
+
+def hll_estimate(registers):
+    """Distinct count from merged registers, with linear counting for small sets."""
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.exp2(-registers.astype(np.float64)))
+    zeros = np.count_nonzero(registers == 0)
+    if raw <= 2.5 * m and zeros:
+        return m * np.log(m / zeros)
+    return raw
+
+
+class DistinctSketches:
+    """Sparse HyperLogLog sketches of Lead Email and Website per combination of
+    the sidebar filter columns, built once per dataset.
+
+    Missing emails are not counted, like ``nunique``; missing websites count as
+    'Unknown', like the brand counts in app.py, and each website register
+    remembers whether it came from a valid one so "Exclude Invalid Entries"
+    can be answered from the same sketch.
+    """
+
+    def __init__(self, df, precision=PRECISION):
+        self.precision = precision
+        cell = df.groupby(FILTER_COLUMNS, dropna=False, sort=False, observed=True).ngroup().to_numpy()
+        first = np.unique(cell, return_index=True)[1]
+        self.cells = df[FILTER_COLUMNS].iloc[first].reset_index(drop=True)
+        self.sketches = {}
+        for column in SKETCH_COLUMNS:
+            if column not in df.columns:
+                continue
+            values = df[column]
+            if column == 'Website' and values.hasnans:
+                values = values.astype(object).fillna('Unknown')
+            # Hash each distinct value once and spread it to the rows by their codes
+            values = values.astype('category')  # a no-op for columns interned at ingest
+            codes = values.cat.codes.to_numpy()
+            present = codes >= 0
+            codes = codes[present]
+            categories = values.cat.categories.to_series()
+            register, rank = hll_registers(categories, precision)
+            if column == 'Website':
+                # Valid_Website is set at ingest; fall back to checking the names here
+                valid = df['Valid_Website'].to_numpy() if 'Valid_Website' in df.columns else validity_mask(df[column])
+                valid = valid[present]
+            else:
+                valid = np.ones(len(codes), dtype=bool)
+            entries = pd.DataFrame({
+                'cell': cell[present], 'register': register[codes], 'valid': valid, 'rank': rank[codes],
+            })
+            self.sketches[column] = entries.groupby(['cell', 'register', 'valid'], sort=False)['rank'].max().reset_index()
+
+    def estimate(self, column, years=None, quarters=None, campaigns=None, bot_checks=None, time_ranges=None,
+                 exclude_invalid=False):
+        """Approximate distinct count of ``column`` over the selected rows; a
+        selection of None leaves that filter column unrestricted."""
+        if column not in self.sketches:
+            return 0
+        selected = np.ones(len(self.cells), dtype=bool)
+        for col, values in zip(FILTER_COLUMNS, [years, quarters, campaigns, bot_checks, time_ranges]):
+            if values is not None:
+                selected &= self.cells[col].isin(values).to_numpy()
+        entries = self.sketches[column]
+        keep = selected[entries['cell'].to_numpy()]
+        if exclude_invalid:
+            keep &= entries['valid'].to_numpy()
+        if not keep.any():
+            return 0
+        registers = np.zeros(2 ** self.precision, dtype=np.uint8)
+        np.maximum.at(registers, entries['register'].to_numpy()[keep], entries['rank'].to_numpy()[keep])
+        return int(round(hll_estimate(registers)))
@@ -0,0 +1,163 @@
+"""Synthetic campaign exports with the app's exact upload schema.
+
+    python -m camml.synthetic --rows 1000000 --out campaigns_1m.csv
+
+Rows are generated in fixed-size chunks and appended to the CSV, so even the
+10M-row files are written with bounded memory.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 1000000
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+CITIES = [
+    ('New York', 'NY', 40.7128, -74.0060), ('Los Angeles', 'CA', 34.0522, -118.2437),
+    ('Chicago', 'IL', 41.8781, -87.6298), ('Houston', 'TX', 29.7604, -95.3698),
+    ('Phoenix', 'AZ', 33.4484, -112.0740), ('Philadelphia', 'PA', 39.9526, -75.1652),
+    ('San Antonio', 'TX', 29.4241, -98.4936), ('San Diego', 'CA', 32.7157, -117.1611),
+    ('Dallas', 'TX', 32.7767, -96.7970), ('San Jose', 'CA', 37.3382, -121.8863),
+    ('Austin', 'TX', 30.2672, -97.7431), ('Jacksonville', 'FL', 30.3322, -81.6557),
+    ('Columbus', 'OH', 39.9612, -82.9988), ('Charlotte', 'NC', 35.2271, -80.8431),
+    ('Indianapolis', 'IN', 39.7684, -86.1581), ('San Francisco', 'CA', 37.7749, -122.4194),
+    ('Seattle', 'WA', 47.6062, -122.3321), ('Denver', 'CO', 39.7392, -104.9903),
+    ('Boston', 'MA', 42.3601, -71.0589), ('Nashville', 'TN', 36.1627, -86.7816),
+    ('Atlanta', 'GA', 33.7490, -84.3880), ('Miami', 'FL', 25.7617, -80.1918),
+    ('Minneapolis', 'MN', 44.9778, -93.2650), ('Portland', 'OR', 45.5152, -122.6784),
+    ('Las Vegas', 'NV', 36.1699, -115.1398), ('Detroit', 'MI', 42.3314, -83.0458),
+    ('Salt Lake City', 'UT', 40.7608, -111.8910), ('Raleigh', 'NC', 35.7796, -78.6382),
+    ('Kansas City', 'MO', 39.0997, -94.5786), ('Pittsburgh', 'PA', 40.4406, -79.9959),
+]
+INVALID_TOKENS = ['--', '', 'Unknown', '0']
+ESP_TYPES = ['Gmail', 'Outlook', 'Yahoo', 'Zoho', 'Other']
+ESP_WEIGHTS = [0.45, 0.35, 0.1, 0.04, 0.06]
+TRAFFIC = ['Organic', 'Paid', 'Referral', 'Direct', 'Social']
+TIME_RANGES = ['12AM-3AM', '3AM-6AM', '6AM-9AM', '9AM-12PM', '12PM-3PM', '3PM-6PM', '6PM-9PM', '9PM-12AM']
+REPLIES = ['Thanks, interested!', 'Please send more details.', 'Not interested.', 'Remove me from this list.',
+           'Can we set up a call next week?', 'Out of office until Monday.']
+POSITIVE_REPLIES = {0, 1, 4}
+
+
+def _invalidate(rng, values, rate):
+    # Sprinkle the blank/--/Unknown/0 tokens the exclude-invalid toggle filters
+    mask = rng.random(len(values)) < rate
+    values = values.astype(object)
+    values[mask] = rng.choice(INVALID_TOKENS, mask.sum())
+    return values, mask
+
+
+def generate_chunk(n_rows, seed=0, n_campaigns=50, n_leads=None, start='2023-01-01', days=730, row_offset=0):
+    """One chunk of synthetic export rows.
+
+    Campaigns, leads and companies are derived from ``seed`` alone, so chunks
+    generated with the same seed and different ``row_offset`` belong to one dataset.
+    """
+    n_leads = n_leads or max(n_rows // 5, 100)
+    world = np.random.default_rng(seed)
+    campaign_launch = pd.Timestamp(start) + pd.to_timedelta(world.integers(0, days - 30, n_campaigns), unit='D')
+    campaign_open_rate = world.beta(3, 6, n_campaigns)
+    campaign_click_rate = world.beta(2, 10, n_campaigns)
+    lead_company = world.integers(0, max(n_leads // 8, 1), n_leads)
+    lead_city = world.integers(0, len(CITIES), n_leads)
+
+    rng = np.random.default_rng([seed, row_offset])
+    campaign = rng.integers(0, n_campaigns, n_rows)
+    lead = rng.integers(0, n_leads, n_rows)
+    is_bot = rng.random(n_rows) < 0.15
+
+    # Sends go out on weekday business hours within 30 days of the campaign launch
+    sent = (campaign_launch[campaign].to_numpy()
+            + pd.to_timedelta(rng.integers(0, 30, n_rows), unit='D').to_numpy()
+            + pd.to_timedelta(rng.integers(8 * 60, 18 * 60, n_rows), unit='m').to_numpy())
+    sent = pd.DatetimeIndex(sent)
+    weekend = sent.dayofweek >= 5
+    sent = sent + pd.to_timedelta(np.where(weekend, 7 - sent.dayofweek, 0), unit='D')
+
+    opened = np.where(is_bot, rng.random(n_rows) < 0.9, rng.random(n_rows) < campaign_open_rate[campaign])
+    open_count = np.where(opened, 1 + rng.poisson(np.where(is_bot, 3.0, 0.8)), 0)
+    clicked = opened & (rng.random(n_rows) < np.where(is_bot, 0.6, campaign_click_rate[campaign] * 2))
+    click_count = np.where(clicked, 1 + rng.poisson(0.4, n_rows), 0)
+    # Bots open within seconds of delivery, people within hours
+    delay_minutes = np.where(is_bot, rng.exponential(0.5, n_rows), rng.lognormal(5.0, 1.3, n_rows))
+    opened_time = pd.Series(sent + pd.to_timedelta(delay_minutes, unit='m')).where(opened)
+
+    engagement = np.where(clicked | (open_count >= 3), 'HE', np.where(opened, 'LE', 'NO')).astype(object)
+    messy = rng.random(n_rows) < 0.01
+    engagement[messy] = np.char.lower(engagement[messy].astype(str))
+    time_range = np.array(TIME_RANGES, dtype=object)[(opened_time.dt.hour.fillna(0).to_numpy() // 3).astype(int)]
+    time_range[~opened] = '--'
+
+    city_idx = lead_city[lead]
+    city = np.array([c[0] for c in CITIES], dtype=object)[city_idx]
+    state = np.array([c[1] for c in CITIES], dtype=object)[city_idx]
+    latitude = np.array([c[2] for c in CITIES])[city_idx] + rng.normal(0, 0.05, n_rows)
+    longitude = np.array([c[3] for c in CITIES])[city_idx] + rng.normal(0, 0.05, n_rows)
+    city, invalid_city = _invalidate(rng, city, 0.03)
+    latitude[invalid_city] = np.nan
+    longitude[invalid_city] = np.nan
+    state, _ = _invalidate(rng, state, 0.03)
+    traffic, _ = _invalidate(rng, rng.choice(TRAFFIC, n_rows), 0.05)
+
+    company = lead_company[lead]
+    website = pd.Series('company' + pd.Series(company).astype(str) + '.com', dtype=object)
+    website[rng.random(n_rows) < 0.02] = np.nan
+    lead_email = 'lead' + pd.Series(lead).astype(str) + '@company' + pd.Series(company).astype(str) + '.com'
+
+    replied = opened & ~is_bot & (rng.random(n_rows) < 0.04)
+    reply_idx = rng.integers(0, len(REPLIES), n_rows)
+    reply_message = np.where(replied, np.array(REPLIES, dtype=object)[reply_idx], None)
+    positive = np.where(replied, np.where(np.isin(reply_idx, list(POSITIVE_REPLIES)), 'Yes', 'No'), None)
+
+    status = rng.choice(['Delivered', 'Bounced', 'Failed'], n_rows, p=[0.975, 0.02, 0.005])
+
+    return pd.DataFrame({
+        'Lead Email': lead_email,
+        'Campaign Name': pd.Series(campaign).map(lambda c: f"Campaign {c:03d}"),
+        'Sent_Date': sent.strftime(DATE_FORMAT),
+        'Opened Time': opened_time.dt.strftime(DATE_FORMAT),
+        'Open Count': open_count,
+        'Click Count': click_count,
+        'Engagement': engagement,
+        'Bot Check': np.where(is_bot, 'Bot', 'Human'),
+        'Opend Time Range': time_range,
+        'City': city,
+        'State': state,
+        'latitude': latitude.round(5),
+        'longitude': longitude.round(5),
+        'ESP Type': rng.choice(ESP_TYPES, n_rows, p=ESP_WEIGHTS),
+        'Traffic': traffic,
+        'Website': website,
+        'Status': status,
+        'Is Unsubscribed': ~is_bot & (rng.random(n_rows) < 0.005),
+        'Reply Message': reply_message,
+        'Positive Reply(Yes/No)': positive,
+    })
+
+
+def generate_campaign_data(n_rows, seed=0, chunk_rows=CHUNK_ROWS, **kwargs):
+    """A synthetic export of n_rows rows as one DataFrame."""
+    kwargs.setdefault('n_leads', max(n_rows // 5, 100))
+    return pd.concat([generate_chunk(min(chunk_rows, n_rows - offset), seed=seed, row_offset=offset, **kwargs)
+                      for offset in range(0, n_rows, chunk_rows)], ignore_index=True)
+
+
+def write_campaign_csv(path, n_rows, seed=0, chunk_rows=CHUNK_ROWS, **kwargs):
+    """Stream a synthetic export of n_rows rows to a CSV file, chunk by chunk."""
+    kwargs.setdefault('n_leads', max(n_rows // 5, 100))
+    for offset in range(0, n_rows, chunk_rows):
+        chunk = generate_chunk(min(chunk_rows, n_rows - offset), seed=seed, row_offset=offset, **kwargs)
+        chunk.to_csv(path, mode='w' if offset == 0 else 'a', header=offset == 0, index=False)
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--out', default='campaigns.csv')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--campaigns', type=int, default=50)
+    args = parser.parse_args()
+    write_campaign_csv(args.out, args.rows, seed=args.seed, n_campaigns=args.campaigns)
+    print(f"Wrote {args.rows:,} rows to {args.out}")
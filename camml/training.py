@@ -0,0 +1,59 @@
+"""Classifier training with a row budget and a choice of tree ensemble."""
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.model_selection import train_test_split
+
+LEARNERS = ['Random Forest', 'Hist Gradient Boosting']
+DEFAULT_ROW_BUDGET = 200000
+
+
+def make_classifier(learner='Random Forest', random_state=42):
+    if learner == 'Hist Gradient Boosting':
+        return HistGradientBoostingClassifier(max_iter=100, random_state=random_state)
+    return RandomForestClassifier(n_estimators=50, random_state=random_state, n_jobs=-1)
+
+
+def stratified_subsample(y, max_rows, random_state=42):
+    """Positions of at most max_rows rows of y, keeping each class's share.
+
+    Every class present keeps at least one row so rare labels are not dropped.
+    """
+    y = np.asarray(y)
+    if not max_rows or len(y) <= max_rows:
+        return np.arange(len(y))
+    rng = np.random.default_rng(random_state)
+    classes, inverse, counts = np.unique(y, return_inverse=True, return_counts=True)
+    quotas = np.maximum((counts * (max_rows / len(y))).astype(int), 1)
+    order = np.argsort(inverse, kind='stable')
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    picked = [rng.choice(order[start:start + count], size=quota, replace=False)
+              for start, count, quota in zip(starts, counts, quotas)]
+    return np.sort(np.concatenate(picked))
+
+
+def train_classifier(X, y, learner='Random Forest', max_rows=DEFAULT_ROW_BUDGET, random_state=42):
+    """Fit on a stratified subsample of the 80% training split and score on the held-out 20%.
+
+    Returns the model and a report with rows used, fit time and held-out accuracy.
+    The held-out set is capped at a quarter of the row budget to keep scoring fast.
+    """
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
+    train_idx = stratified_subsample(y_train, max_rows, random_state)
+    test_idx = stratified_subsample(y_test, max(max_rows // 4, 1) if max_rows else None, random_state)
+    X_train, y_train = X_train.iloc[train_idx], y_train.iloc[train_idx]
+    X_test, y_test = X_test.iloc[test_idx], y_test.iloc[test_idx]
+
+    model = make_classifier(learner, random_state)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    report = {
+        'Learner': learner,
+        'Rows Available': len(X),
+        'Training Rows': len(X_train),
+        'Fit Seconds': round(fit_seconds, 3),
+        'Held-out Accuracy': model.score(X_test, y_test),
+    }
+    return model, report
@@ -0,0 +1,33 @@
+"""First-send cohorts and engagement decay (camml.cohorts)."""
+import pandas as pd
+
+from camml.cohorts import AXES, COHORT_MEASURES, MAX_SEQUENCE, MAX_WEEKS, cohort_counts, cohort_rates, decay_curve
+
+
+def sends(*rows):
+    return pd.DataFrame(rows, columns=['Lead Email', 'Sent_Date', 'Open Count', 'Click Count', 'Has_Reply'])
+
+
+def test_empty_input_gives_empty_grid():
+    for axis, steps in zip(AXES, [MAX_SEQUENCE + 1, MAX_WEEKS + 1]):
+        cohorts, sizes, counts = cohort_counts(sends(), axis)
+        assert len(cohorts) == 0 and len(sizes) == 0
+        assert counts.shape == (0, steps, len(COHORT_MEASURES))
+        assert cohort_rates(cohorts, counts, 'Open Rate (%)', axis).empty
+        assert decay_curve(counts, 'Open Rate (%)', axis).empty
+
+
+def test_single_lead_by_send_number_and_week():
+    frame = sends(
+        ['a@x.com', '2024-01-30', 1, 0, False],
+        ['a@x.com', '2024-02-14', 0, 0, True],  # second send, two weeks later
+        ['a@x.com', '2024-01-03', 2, 1, False],  # first send, out of order
+    )
+    cohorts, sizes, counts = cohort_counts(frame, 'Send Number')
+    assert list(cohorts) == ['2024-01'] and list(sizes) == [1]
+    assert counts[0, 1].tolist() == [1, 1, 1, 0]
+    assert counts[0, 2].tolist() == [1, 1, 0, 0]
+    assert counts[0, 3].tolist() == [1, 0, 0, 1]
+
+    _, _, counts = cohort_counts(frame, 'Weeks Since First Send')
+    assert counts[0, :, 0].nonzero()[0].tolist() == [0, 3, 6]
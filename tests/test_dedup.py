@@ -0,0 +1,41 @@
+"""Duplicate removal across streamed chunks (camml.dedup)."""
+import numpy as np
+import pandas as pd
+
+from camml.dedup import StreamingDeduplicator
+
+
+def row(city=None, website=None):
+    return {'Lead Email': 'a@x.com', 'Campaign Name': 'C1', 'Sent_Date': '2024-01-01 09:00:00',
+            'City': city, 'Website': website}
+
+
+def stream(*chunks):
+    """Chunks indexed by row number across the stream, as read_csv chunks are."""
+    start, indexed = 0, []
+    for rows in chunks:
+        indexed.append(pd.DataFrame(rows, index=np.arange(start, start + len(rows))))
+        start += len(rows)
+    dedup = StreamingDeduplicator()
+    for chunk in indexed:
+        dedup.add_chunk(chunk)
+    return dedup, pd.concat(dedup.keep(indexed))
+
+
+def test_complete_record_in_earlier_chunk_is_kept():
+    dedup, kept = stream([row('Boston', 'x.com')], [row()])
+    assert dedup.dropped == 1
+    assert kept.index.tolist() == [0]
+
+
+def test_more_complete_record_in_later_chunk_replaces_earlier():
+    dedup, kept = stream([row()], [row('Boston', 'x.com')])
+    assert dedup.dropped == 1
+    assert kept.index.tolist() == [1]
+
+
+def test_tie_keeps_earliest_and_partial_keys_are_never_duplicates():
+    partial = dict(row(), **{'Lead Email': None})
+    dedup, kept = stream([row('Boston'), partial], [row('Boston'), partial])
+    assert dedup.dropped == 1
+    assert kept.index.tolist() == [0, 1, 3]
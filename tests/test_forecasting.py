@@ -0,0 +1,35 @@
+"""Holt-Winters forecasting of daily opens (camml.forecasting)."""
+import numpy as np
+import pandas as pd
+
+from camml.forecasting import FORECAST_DAYS, MIN_FORECAST_POINTS, holt_winters_forecast
+
+WEEK = np.array([10, 20, 30, 40, 50, 5, 0], dtype=float)
+
+
+def daily(y, start='2024-01-01', step=1):
+    return pd.DataFrame({'ds': pd.date_range(start, periods=len(y), freq=f'{step}D'), 'y': y})
+
+
+def test_short_series_is_not_forecast():
+    assert holt_winters_forecast(daily(np.ones(MIN_FORECAST_POINTS - 1))) is None
+
+
+def test_exact_weekly_pattern_is_continued():
+    forecast = holt_winters_forecast(daily(np.tile(WEEK, 8)))
+    assert list(forecast.columns) == ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+    assert len(forecast) == 56 + FORECAST_DAYS
+    assert forecast['ds'].iloc[56] == pd.Timestamp('2024-02-26')
+    np.testing.assert_allclose(forecast['yhat'].to_numpy()[56:], np.tile(WEEK, 5)[:FORECAST_DAYS], atol=1e-6)
+    assert (forecast['yhat_lower'] <= forecast['yhat']).all() and (forecast['yhat'] <= forecast['yhat_upper']).all()
+
+
+def test_days_without_opens_are_filled_and_bands_widen():
+    rng = np.random.default_rng(0)
+    series = daily(np.tile(WEEK, 8)[::2] + rng.normal(0, 3, 28), step=2)
+    forecast = holt_winters_forecast(series)
+    # 55 calendar days from the first to the last point, then the horizon
+    assert len(forecast) == 55 + FORECAST_DAYS
+    assert forecast['ds'].is_monotonic_increasing and forecast['ds'].diff().dropna().eq(pd.Timedelta('1D')).all()
+    width = (forecast['yhat_upper'] - forecast['yhat'])[55:].to_numpy()
+    assert (np.diff(width) >= -1e-9).all() and width[-1] > width[0]
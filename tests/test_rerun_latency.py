@@ -0,0 +1,161 @@
+"""Rerun-latency and memory budgets for app.py, driven headlessly with AppTest.
+
+Every test uploads a synthetic export (AppTest cannot drive file_uploader, so
+the frame read by camml.ingest is put into session state the way load_data
+leaves it), performs one interaction and asserts that the rerun it triggers
+stays within its budget.
+
+    CAMML_TEST_ROWS=200000 CAMML_BUDGET_SCALE=4 python -m pytest -q tests
+
+CAMML_TEST_ROWS sets the synthetic upload size (default 20K rows) and
+CAMML_BUDGET_SCALE multiplies every budget, for slower machines or larger
+uploads.
+"""
+import os
+import time
+import tracemalloc
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from camml.synthetic import write_campaign_csv
+from camml.ingest import read_campaign_file
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+TEST_ROWS = int(os.environ.get('CAMML_TEST_ROWS', 20000))
+BUDGET_SCALE = float(os.environ.get('CAMML_BUDGET_SCALE', 1))
+
+PAGES = ["🏠 Dashboard Home", "📊 Compare Quarters", "🤖 AI Predictions", "👑 Boss Dashboard", "🔎 Lead Lookup",
+         "🏢 Accounts"]
+# Seconds for the rerun after switching to a page with cold caches
+PAGE_BUDGETS = {
+    "🏠 Dashboard Home": 3.0,
+    "📊 Compare Quarters": 2.0,
+    "🤖 AI Predictions": 3.0,  # model fits run as background jobs, not in the rerun
+    "👑 Boss Dashboard": 2.0,
+    "🔎 Lead Lookup": 2.0,  # includes building the lead profiles
+    "🏢 Accounts": 2.0,  # includes building the account rollup
+}
+FILTER_BUDGET = 3.0
+INSIGHT_BUDGET = 1.5
+AI_JOBS_BUDGET = 120.0
+# Peak Python allocations (MiB) during one page render
+MEMORY_BUDGET_MIB = 400.0
+HOME_INSIGHTS = ['trend_insight', 'time_insight', 'send_time_insight', 'cohort_insight', 'city_insight', 'campaign_insight',
+                 'esp_insight', 'clicks_insight', 'unsub_insight', 'funnel_insight', 'reply_vs_positive_insight', 'reply_insight']
+
+
+def budget(seconds):
+    return seconds * BUDGET_SCALE
+
+
+@pytest.fixture(scope='module')
+def campaign_df(tmp_path_factory):
+    path = tmp_path_factory.mktemp('uploads') / 'campaigns.csv'
+    write_campaign_csv(path, TEST_ROWS, seed=7)
+    return read_campaign_file(path, 'csv')
+
+
+def open_app(df, page=None):
+    at = AppTest.from_file(APP, default_timeout=600)
+    at.session_state['df'] = df.copy()
+    at.run()
+    if page is not None:
+        select_page(at, page)
+    return at
+
+
+def select_page(at, page):
+    [box for box in at.selectbox if page in box.options][0].set_value(page)
+
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    seconds = time.perf_counter() - start
+    assert not at.exception, at.exception[0].value
+    return seconds
+
+
+def sidebar_multiselect(at, label):
+    return [box for box in at.sidebar.multiselect if box.label == label][0]
+
+
+@pytest.mark.parametrize('page', PAGES)
+def test_page_switch_latency(campaign_df, page):
+    st.cache_data.clear()
+    at = open_app(campaign_df)
+    select_page(at, page)
+    assert timed_run(at) < budget(PAGE_BUDGETS[page])
+
+
+@pytest.mark.parametrize('page', PAGES)
+def test_page_peak_memory(campaign_df, page):
+    st.cache_data.clear()
+    at = open_app(campaign_df)
+    select_page(at, page)
+    tracemalloc.start()
+    try:
+        timed_run(at)
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+    assert peak < budget(MEMORY_BUDGET_MIB)
+
+
+@pytest.mark.parametrize('page', ["🏠 Dashboard Home", "👑 Boss Dashboard"])
+def test_sidebar_filter_latency(campaign_df, page):
+    at = open_app(campaign_df, page)
+    timed_run(at)
+
+    campaigns = sidebar_multiselect(at, "🎯 Select Campaign")
+    campaigns.set_value(campaigns.options[:5])
+    assert timed_run(at) < budget(FILTER_BUDGET)
+
+    sidebar_multiselect(at, "🤖 Bot/Human Filter").set_value(['Human'])
+    assert timed_run(at) < budget(FILTER_BUDGET)
+
+    sidebar_multiselect(at, "🗓️ Select Quarter").set_value(['Q1', 'Q2'])
+    assert timed_run(at) < budget(FILTER_BUDGET)
+
+    [box for box in at.sidebar.selectbox if box.label == "📊 Top N for Charts"][0].set_value(20)
+    assert timed_run(at) < budget(FILTER_BUDGET)
+
+    at.sidebar.checkbox[0].uncheck()
+    assert timed_run(at) < budget(FILTER_BUDGET)
+
+
+def test_compare_quarters_selection_latency(campaign_df):
+    at = open_app(campaign_df, "📊 Compare Quarters")
+    timed_run(at)
+    at.multiselect[-1].set_value(at.multiselect[-1].options[:2])
+    assert timed_run(at) < budget(FILTER_BUDGET)
+
+
+def test_lead_lookup_latency(campaign_df):
+    at = open_app(campaign_df, "🔎 Lead Lookup")
+    timed_run(at)
+    at.text_input(key='lead_query').input(campaign_df['Lead Email'].iloc[0][:4])
+    assert timed_run(at) < budget(FILTER_BUDGET)
+    assert at.selectbox(key='lead_email').options
+
+
+def test_insight_button_latency(campaign_df):
+    at = open_app(campaign_df, "🏠 Dashboard Home")
+    timed_run(at)
+    for key in HOME_INSIGHTS:
+        at.button(key=key).click()
+        assert timed_run(at) < budget(INSIGHT_BUDGET), key
+        assert at.info, key
+
+
+def test_ai_prediction_jobs_finish(campaign_df):
+    at = open_app(campaign_df, "🤖 AI Predictions")
+    timed_run(at)
+    start = time.perf_counter()
+    while at.get('progress') and time.perf_counter() - start < budget(AI_JOBS_BUDGET):
+        time.sleep(0.5)
+        at.run()
+    assert not at.get('progress'), 'AI Predictions jobs did not finish within budget'
+    assert not at.exception and not at.error
@@ -0,0 +1,69 @@
+"""Batch scoring and ranking of lead files (camml.scoring)."""
+import numpy as np
+import pandas as pd
+
+from camml.scoring import UNSEEN, CategoryEncoder, fit_open_model, rank_leads, rank_leads_to_csv, score_chunks
+
+
+def history(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    sent = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D')
+    esp = rng.choice(['Gmail', 'Outlook', None], n)
+    return pd.DataFrame({
+        'Lead Email': [f"lead{i}@x.com" for i in range(n)],
+        'Campaign Name': rng.choice(['A', 'B'], n),
+        'Sent_Date': sent,
+        'Sent_Year': sent.year, 'Sent_Month': sent.month, 'Sent_DayOfWeek': sent.dayofweek, 'Quarter': sent.quarter,
+        'ESP Type': esp,
+        'Open Count': (rng.random(n) < np.where(esp == 'Gmail', 0.7, 0.2)).astype(int),
+    })
+
+
+def scored(probabilities, first=0):
+    return pd.DataFrame({'Lead Email': [f"lead{first + i}" for i in range(len(probabilities))],
+                         'Open_Probability': np.asarray(probabilities, dtype=np.float32)})
+
+
+def test_missing_and_unseen_categories_encode_as_unseen():
+    encoder = CategoryEncoder().fit(pd.Series(['b', None, 'a', np.nan]))
+    assert list(encoder.classes_) == ['a', 'b']
+    assert encoder.transform(pd.Series(['a', 'b', None, 'z', np.nan])).tolist() == [0, 1, UNSEEN, UNSEEN, UNSEEN]
+
+
+def test_score_chunks_matches_scoring_the_whole_file():
+    model = fit_open_model(history())
+    leads = history(1000, seed=1).drop(columns=['Open Count'])
+    chunks = list(score_chunks(leads, model, chunk_size=128, n_jobs=3))
+    assert len(chunks) == 8
+    scores = pd.concat([chunk for chunk, _ in chunks]).sort_index()
+    expected = model.predict_proba(leads).astype(np.float32)
+    np.testing.assert_array_equal(scores['Open_Probability'].to_numpy(), expected)
+    assert list(scores.columns) == ['Lead Email', 'Campaign Name', 'Open_Probability']
+    assert sum(unseen['ESP Type'] for _, unseen in chunks) == leads['ESP Type'].isna().sum()
+
+
+def test_rank_leads_keeps_the_top_k_in_order():
+    rng = np.random.default_rng(2)
+    chunks = [scored(rng.random(n)) for n in [50, 0, 70, 30]]
+    everything = pd.concat(chunks, ignore_index=True)
+    ranked = rank_leads(iter(chunks), top_k=10)
+    assert ranked['Rank'].tolist() == list(range(1, 11))
+    assert ranked['Lead Email'].tolist() == everything.nlargest(10, 'Open_Probability')['Lead Email'].tolist()
+    assert rank_leads(iter([]), top_k=10).empty
+
+
+def test_rank_leads_to_csv_ranks_every_row_by_external_merge(tmp_path):
+    rng = np.random.default_rng(3)
+    sizes = [400, 0, 250, 7, 333]  # rounded, so many probabilities tie across runs
+    chunks = [scored(np.round(rng.random(n), 2), first) for n, first in zip(sizes, np.cumsum([0] + sizes))]
+    path = tmp_path / 'ranked.csv'
+    assert rank_leads_to_csv(iter(chunks), path, block_rows=64) == 990
+    ranked = pd.read_csv(path)
+    assert ranked['Rank'].tolist() == list(range(1, 991))
+    assert ranked['Open_Probability'].is_monotonic_decreasing
+    everything = pd.concat(chunks, ignore_index=True)
+    assert sorted(ranked['Lead Email']) == sorted(everything['Lead Email'])
+    np.testing.assert_allclose(ranked['Open_Probability'], np.sort(everything['Open_Probability'])[::-1], atol=1e-6)
+
+    assert rank_leads_to_csv(iter([]), tmp_path / 'empty.csv') == 0
+    assert pd.read_csv(tmp_path / 'empty.csv').columns.tolist() == ['Rank', 'Open_Probability']
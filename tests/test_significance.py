@@ -0,0 +1,59 @@
+"""Confidence intervals and all-pairs rate tests (camml.significance)."""
+import math
+
+import numpy as np
+import pandas as pd
+
+from camml.significance import adjust_pvalues, pairwise_tests, rate_counts, rate_intervals, wilson_interval
+
+OPEN_RATE = 'Open Rate (%)'
+
+
+def counts(sends, opens):
+    return pd.DataFrame({'Sends': sends, 'Opens': opens, 'Clicks': 0, 'Replies': 0},
+                        index=pd.Index(list('ABCD')[:len(sends)], name='Campaign Name'))
+
+
+def test_wilson_interval_matches_reference_values():
+    low, high = wilson_interval([5, 0], [10, 20])
+    np.testing.assert_allclose(low, [0.236593, 0.0], atol=1e-6)
+    np.testing.assert_allclose(high, [0.763407, 0.161125], atol=1e-6)
+    table = rate_intervals(counts([10, 20], [5, 0]), OPEN_RATE)
+    assert table['CI Low (%)'].tolist() == [23.66, 0.0] and table[OPEN_RATE].tolist() == [50.0, 0.0]
+
+
+def test_holm_and_benjamini_hochberg_adjustments():
+    pvalues = [0.01, 0.04, 0.03, 0.005]
+    np.testing.assert_allclose(adjust_pvalues(pvalues, 'Holm'), [0.03, 0.06, 0.06, 0.02])
+    np.testing.assert_allclose(adjust_pvalues(pvalues, 'Benjamini-Hochberg'), [0.02, 0.04, 0.04, 0.02])
+    np.testing.assert_allclose(adjust_pvalues(pvalues, 'None'), pvalues)
+    assert adjust_pvalues([0.5, 0.9], 'Holm').max() == 1.0
+
+
+def test_pairwise_tests_match_a_per_pair_z_test():
+    table = counts([1000, 800, 1200, 10], [200, 200, 180, 9])  # D is below MIN_SENDS
+    pairs = pairwise_tests(table, OPEN_RATE, method='None')
+    assert len(pairs) == 3 and 'D' not in set(pairs['A']) | set(pairs['B'])
+    for pair in pairs.to_dict('records'):
+        (n_a, x_a), (n_b, x_b) = table.loc[pair['A'], ['Sends', 'Opens']], table.loc[pair['B'], ['Sends', 'Opens']]
+        pooled = (x_a + x_b) / (n_a + n_b)
+        z = (x_a / n_a - x_b / n_b) / math.sqrt(pooled * (1 - pooled) * (1 / n_a + 1 / n_b))
+        assert pair['z'] == round(z, 2)
+        assert math.isclose(pair['p-value'], math.erfc(abs(z) / math.sqrt(2)), rel_tol=1e-9)
+    assert pairs['p-value'].is_monotonic_increasing
+
+    holm = pairwise_tests(table, OPEN_RATE, method='Holm')
+    np.testing.assert_allclose(holm['Adjusted p'], adjust_pvalues(holm['p-value'], 'Holm'))
+    assert holm['Significant'].tolist() == (holm['Adjusted p'] < 0.05).tolist()
+
+
+def test_rate_counts_counts_events_per_group():
+    df = pd.DataFrame({
+        'Campaign Name': ['B', 'A', 'B', 'A', 'A'],
+        'Open Count': [1, 0, 2, 3, 0],
+        'Click Count': [0, 0, 1, 1, 0],
+        'Has_Reply': [False, False, True, False, False],
+    })
+    table = rate_counts(df)
+    assert table.index.tolist() == ['A', 'B']
+    assert table.to_numpy().tolist() == [[3, 1, 1, 0], [2, 2, 1, 1]]
@@ -0,0 +1,56 @@
+"""HyperLogLog distinct counts per filter cell (camml.sketches)."""
+import numpy as np
+import pandas as pd
+
+from camml.sketches import PRECISION, DistinctSketches, hll_estimate, hll_registers, relative_error
+
+# Three standard errors: a deterministic seed that fails this is a real regression
+TOLERANCE = 3 * relative_error()
+
+
+def registers_of(values, precision=PRECISION):
+    registers = np.zeros(2 ** precision, dtype=np.uint8)
+    np.maximum.at(registers, *hll_registers(pd.Series(values), precision))
+    return registers
+
+
+def sends(n=60000, seed=0):
+    rng = np.random.default_rng(seed)
+    websites = np.array([f"brand{i}.com" for i in range(3000)] + ['Unknown', '--'], dtype=object)
+    return pd.DataFrame({
+        'Sent_Year': rng.choice([2023, 2024], n),
+        'Quarter': rng.integers(1, 5, n),
+        'Campaign Name': rng.choice(['A', 'B', 'C'], n),
+        'Bot Check': rng.choice(['Human', 'Bot'], n),
+        'Opend Time Range': rng.choice(['Morning', 'Evening'], n),
+        'Lead Email': [f"lead{i}@x.com" for i in rng.integers(0, 40000, n)],
+        'Website': websites[rng.integers(0, len(websites), n)],
+    })
+
+
+def test_empty_and_small_sets_are_counted_exactly():
+    assert hll_estimate(np.zeros(2 ** PRECISION, dtype=np.uint8)) == 0
+    assert round(hll_estimate(registers_of([f"v{i}" for i in range(50)]))) == 50
+
+
+def test_estimate_is_within_relative_error_of_nunique():
+    for distinct in [5000, 100000]:
+        values = [f"lead{i}@x.com" for i in range(distinct)] * 2
+        estimate = hll_estimate(registers_of(values))
+        assert abs(estimate - distinct) / distinct < TOLERANCE
+
+
+def test_filtered_estimates_match_nunique_of_the_filtered_rows():
+    df = sends()
+    df.loc[df.index[::50], 'Lead Email'] = None  # missing emails are not counted
+    sketches = DistinctSketches(df)
+    selection = dict(years=[2024], quarters=[1, 2], campaigns=['A', 'C'])
+    rows = df[df['Sent_Year'].isin([2024]) & df['Quarter'].isin([1, 2]) & df['Campaign Name'].isin(['A', 'C'])]
+
+    for column in ['Lead Email', 'Website']:
+        exact = rows[column].nunique()
+        assert abs(sketches.estimate(column, **selection) - exact) / exact < TOLERANCE
+    valid = rows.loc[~rows['Website'].isin(['Unknown', '--']), 'Website'].nunique()
+    estimate = sketches.estimate('Website', exclude_invalid=True, **selection)
+    assert abs(estimate - valid) / valid < TOLERANCE
+    assert sketches.estimate('Lead Email', campaigns=['Z']) == 0